@@ -1,6 +1,7 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
 from .models import Archive
+from .services import restore_records
 
 
 @admin.register(Archive)
@@ -10,3 +11,12 @@ class ArchiveAdmin(admin.ModelAdmin):
     search_fields = ["module", "record_id", "reason"]
     readonly_fields = ["created_at", "restored_at"]
     date_hierarchy = "created_at"
+    actions = ["restore_selected"]
+
+    @admin.action(description="Restore selected archives")
+    def restore_selected(self, request, queryset):
+        result = restore_records(queryset, actor=request.user)
+        if result.restored:
+            self.message_user(request, f"Restored {len(result.restored)} archived record(s).", messages.SUCCESS)
+        for archive, reason in result.skipped:
+            self.message_user(request, f"Skipped {archive}: {reason}", messages.WARNING)
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ArchiveConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "motofinai.apps.archive"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
+        from .services import warm_restorers
+
+        warm_restorers()
+
+        return super().ready()
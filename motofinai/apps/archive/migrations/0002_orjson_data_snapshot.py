@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:29
+
+import motofinai.apps.core.encoders
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("archive", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="archive",
+            name="data_snapshot",
+            field=models.JSONField(
+                decoder=motofinai.apps.core.encoders.OrjsonDecoder,
+                encoder=motofinai.apps.core.encoders.OrjsonEncoder,
+                help_text="Snapshot of the record at archive time",
+            ),
+        ),
+    ]
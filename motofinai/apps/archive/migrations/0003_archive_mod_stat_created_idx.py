@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("archive", "0002_orjson_data_snapshot"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="archive",
+            index=models.Index(
+                fields=["module", "status", "-created_at"],
+                name="archive_mod_stat_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations, models
+
+from motofinai.apps.core import encoders
+
+
+def encode_snapshots(apps, schema_editor):
+    Archive = apps.get_model("archive", "Archive")
+    batch = []
+    for archive in Archive.objects.only("pk", "data_snapshot").iterator(chunk_size=1000):
+        archive.data_snapshot_raw = encoders.dumps(archive.data_snapshot)
+        batch.append(archive)
+        if len(batch) >= 1000:
+            Archive.objects.bulk_update(batch, ["data_snapshot_raw"])
+            batch = []
+    if batch:
+        Archive.objects.bulk_update(batch, ["data_snapshot_raw"])
+
+
+def decode_snapshots(apps, schema_editor):
+    Archive = apps.get_model("archive", "Archive")
+    batch = []
+    for archive in Archive.objects.only("pk", "data_snapshot_raw").iterator(chunk_size=1000):
+        archive.data_snapshot = encoders.loads(bytes(archive.data_snapshot_raw))
+        batch.append(archive)
+        if len(batch) >= 1000:
+            Archive.objects.bulk_update(batch, ["data_snapshot"])
+            batch = []
+    if batch:
+        Archive.objects.bulk_update(batch, ["data_snapshot"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("archive", "0003_archive_mod_stat_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archive",
+            name="data_snapshot_raw",
+            field=models.BinaryField(
+                default=b"{}",
+                help_text="JSON-encoded snapshot of the record at archive time",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="archive",
+            name="data_snapshot",
+            field=models.JSONField(
+                null=True,
+                decoder=encoders.OrjsonDecoder,
+                encoder=encoders.OrjsonEncoder,
+                help_text="Snapshot of the record at archive time",
+            ),
+        ),
+        migrations.RunPython(encode_snapshots, decode_snapshots),
+        migrations.RemoveField(
+            model_name="archive",
+            name="data_snapshot",
+        ),
+    ]
@@ -1,9 +1,21 @@
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 
+from motofinai.apps.core import encoders
+
+MODULE_STATS_CACHE_KEY = "archive:module_stats"
+MODULE_STATS_CACHE_TIMEOUT = 60
+# Paginated list counts per (module, status) filter; "" means unfiltered
+LIST_COUNT_CACHE_KEY = "archive:count:{module}:{status}"
+
 
 class Archive(models.Model):
-    """Centralized archive for all modules with JSON snapshots."""
+    """Centralized archive for all modules with JSON snapshots.
+
+    Snapshots are stored pre-serialized (orjson bytes) and only decoded when
+    ``data_snapshot`` is accessed.
+    """
 
     class Status(models.TextChoices):
         ARCHIVED = "archived", "Archived"
@@ -21,7 +33,9 @@ class Archive(models.Model):
         related_name="archived_records",
     )
     reason = models.TextField(blank=True, help_text="Optional reason for archiving")
-    data_snapshot = models.JSONField(help_text="Snapshot of the record at archive time")
+    data_snapshot_raw = models.BinaryField(
+        help_text="JSON-encoded snapshot of the record at archive time",
+    )
     status = models.CharField(
         max_length=20,
         choices=Status.choices,
@@ -35,26 +49,92 @@ class Archive(models.Model):
         indexes = [
             models.Index(fields=["module", "record_id"]),
             models.Index(fields=["status"]),
+            models.Index(
+                fields=["module", "status", "-created_at"],
+                name="archive_mod_stat_created_idx",
+            ),
         ]
 
     def __str__(self) -> str:
         return f"{self.module} #{self.record_id} - {self.status}"
 
+    @property
+    def data_snapshot(self) -> dict:
+        """Decoded snapshot, cached on the instance after first access."""
+        if "_data_snapshot" not in self.__dict__:
+            self._data_snapshot = encoders.loads(bytes(self.data_snapshot_raw))
+        return self._data_snapshot
+
+    @data_snapshot.setter
+    def data_snapshot(self, value: dict) -> None:
+        self.data_snapshot_raw = encoders.dumps(value)
+        self.__dict__.pop("_data_snapshot", None)
+
     @classmethod
     def archive_record(cls, *, module: str, record_id: int, data_snapshot: dict, archived_by, reason: str = ""):
         """Archive a record with its data snapshot."""
         return cls.objects.create(
             module=module,
             record_id=record_id,
-            data_snapshot=data_snapshot,
+            data_snapshot_raw=encoders.dumps(data_snapshot),
             archived_by=archived_by,
             reason=reason,
             status=cls.Status.ARCHIVED,
         )
 
-    def restore(self):
-        """Mark the archive as restored."""
+    @classmethod
+    def module_stats(cls) -> list[dict]:
+        """Return per-module archive counts, cached until the next archive change."""
+        return cache.get_or_set(
+            MODULE_STATS_CACHE_KEY,
+            lambda: list(
+                cls.objects.values("module").annotate(count=models.Count("id")).order_by("-count")
+            ),
+            MODULE_STATS_CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    def list_count_cache_key(cls, module: str, status: str) -> str:
+        return LIST_COUNT_CACHE_KEY.format(module=module, status=status)
+
+    @classmethod
+    def invalidate_list_counts(cls, modules) -> None:
+        """Drop every cached list count that includes archives of ``modules``."""
+        cache.delete_many([
+            cls.list_count_cache_key(module, status)
+            for module in {"", *modules}
+            for status in ("", *cls.Status.values)
+        ])
+
+    def restore(self, actor=None) -> bool:
+        """Mark the archive as restored and audit it; return False if it already was."""
         from django.utils import timezone
+
+        restored_at = timezone.now()
+        updated = (
+            type(self)
+            .objects.filter(pk=self.pk)
+            .exclude(status=self.Status.RESTORED)
+            .update(status=self.Status.RESTORED, restored_at=restored_at)
+        )
+        if not updated:
+            return False
         self.status = self.Status.RESTORED
-        self.restored_at = timezone.now()
-        self.save(update_fields=["status", "restored_at"])
+        self.restored_at = restored_at
+        # The update bypasses post_save, so clear the counts by hand
+        self.invalidate_list_counts([self.module])
+        self.record_restore(actor)
+        return True
+
+    def record_restore(self, actor=None) -> None:
+        """Write the RESTORE audit entry for this archive."""
+        from motofinai.apps.audit.models import AuditLogEntry
+
+        AuditLogEntry.record(
+            action=AuditLogEntry.ActionType.RESTORE,
+            actor=actor,
+            description=f"Restored {self.module} record #{self.record_id} from archive",
+            object_model=self.__class__.__name__,
+            object_id=self.pk,
+            metadata={"module": self.module, "record_id": self.record_id},
+        )
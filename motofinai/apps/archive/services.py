@@ -1,23 +1,29 @@
 """Services for archive restoration."""
 from __future__ import annotations
 
-from typing import Any, Dict
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Dict, NamedTuple
+
 from django.apps import apps
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import IntegrityError, connection, transaction
+from django.db.models import ForeignKey, ManyToManyField, ManyToManyRel, ManyToOneRel
+from django.utils import timezone
+
+from motofinai.apps.dashboard import metrics as dashboard_metrics
+from motofinai.apps.dashboard.kpi import DashboardKPI
 
-from motofinai.apps.inventory.models import Motor, Stock
-from motofinai.apps.loans.models import LoanApplication, FinancingTerm
-from motofinai.apps.payments.models import Payment
+from .models import Archive
 
 
-# Map module names to model classes
-MODULE_MODEL_MAP = {
-    "motors": Motor,
-    "stocks": Stock,
-    "loan_applications": LoanApplication,
-    "financing_terms": FinancingTerm,
-    "payments": Payment,
+# Map module names to (app_label, model_name); resolved lazily via the app registry
+MODULE_MODEL_LABELS = {
+    "motors": ("inventory", "Motor"),
+    "stocks": ("inventory", "Stock"),
+    "loan_applications": ("loans", "LoanApplication"),
+    "financing_terms": ("loans", "FinancingTerm"),
+    "payments": ("payments", "Payment"),
 }
 
 
@@ -26,14 +32,32 @@ class ArchiveRestoreError(Exception):
     pass
 
 
-def restore_record(module: str, data_snapshot: Dict[str, Any], original_record_id: int) -> Any:
+@lru_cache(maxsize=None)
+def get_model_for_module(module: str):
+    """Return the model class for an archive module, or None if unsupported."""
+    labels = MODULE_MODEL_LABELS.get(module)
+    return apps.get_model(*labels) if labels else None
+
+
+def restore_record(
+    module: str,
+    data_snapshot: Dict[str, Any],
+    original_record_id: int,
+    *,
+    validate: bool = False,
+) -> Any:
     """
     Restore an archived record from its data snapshot.
 
+    Snapshots are produced by ``Archive.archive_record`` from saved rows, so
+    model validation is skipped by default and database constraints are
+    relied upon instead.
+
     Args:
         module: Module name (e.g., 'motors', 'loan_applications')
         data_snapshot: JSON snapshot of the original record
         original_record_id: The original record ID
+        validate: Run ``full_clean`` before inserting
 
     Returns:
         The restored model instance
@@ -41,36 +65,38 @@ def restore_record(module: str, data_snapshot: Dict[str, Any], original_record_i
     Raises:
         ArchiveRestoreError: If restoration fails
     """
-    # Get the model class for this module
-    model_class = MODULE_MODEL_MAP.get(module)
+    # Get the model class and instance factory for this module
+    model_class = get_model_for_module(module)
+    restorer = get_restorer(module)
 
     if not model_class:
         raise ArchiveRestoreError(
             f"Unsupported module: {module}. "
-            f"Supported modules are: {', '.join(MODULE_MODEL_MAP.keys())}"
-        )
-
-    # Check if a record with this ID already exists
-    if model_class.objects.filter(pk=original_record_id).exists():
-        raise ArchiveRestoreError(
-            f"Cannot restore: A {module} record with ID {original_record_id} already exists. "
-            "Delete the existing record first or restore to a new ID."
+            f"Supported modules are: {', '.join(MODULE_MODEL_LABELS.keys())}"
         )
 
     try:
         with transaction.atomic():
-            # Prepare data for restoration
-            restore_data = prepare_restore_data(model_class, data_snapshot, original_record_id)
-
             # Create the restored record
-            restored_instance = model_class(**restore_data)
+            restored_instance = restorer(data_snapshot, original_record_id)
+
+            if validate:
+                restored_instance.full_clean(exclude=["id"])
 
-            # Validate before saving
-            restored_instance.full_clean()
-            restored_instance.save()
+            # Primary key clashes are detected by the INSERT itself rather
+            # than a separate existence query.
+            restored_instance.save(force_insert=True)
+            _check_deferred_constraints(model_class)
 
             return restored_instance
 
+    except IntegrityError as e:
+        if model_class.objects.filter(pk=original_record_id).exists():
+            raise ArchiveRestoreError(
+                f"Cannot restore: A {module} record with ID {original_record_id} already exists. "
+                "Delete the existing record first or restore to a new ID."
+            ) from e
+        raise ArchiveRestoreError(f"Integrity error during restoration: {str(e)}") from e
     except ValidationError as e:
         error_messages = []
         if hasattr(e, 'message_dict'):
@@ -85,6 +111,184 @@ def restore_record(module: str, data_snapshot: Dict[str, Any], original_record_i
         raise ArchiveRestoreError(f"Unexpected error during restoration: {str(e)}")
 
 
+def _check_deferred_constraints(model_class) -> None:
+    """Raise IntegrityError now for deferred foreign keys broken by a restore.
+
+    Foreign keys are checked at commit by default, which would fail the
+    caller's whole transaction instead of the savepoint around the insert.
+    """
+    connection.check_constraints(table_names=[model_class._meta.db_table])
+
+
+class BulkRestoreResult(NamedTuple):
+    """Outcome of :func:`restore_records`."""
+
+    restored: list
+    skipped: list
+
+
+def _refresh_dashboard(model_class) -> None:
+    """Catch the dashboard up with rows written by ``bulk_create``, which sends no signals."""
+    if model_class._meta.label in dashboard_metrics.METRIC_SOURCES:
+        dashboard_metrics.rebuild(model_class)
+    DashboardKPI.invalidate()
+
+
+def restore_records(
+    archives, *, actor=None, validate: bool = False, batch_size: int = 1000
+) -> BulkRestoreResult:
+    """
+    Restore many archives with one INSERT batch per module.
+
+    Archives that are already restored, belong to an unsupported module or
+    whose original ID is taken are skipped and returned with a reason. If a
+    module's batch breaks any other constraint (a unique VIN, a missing
+    foreign key) that module falls back to restoring record by record, so
+    only the offending archives are skipped.
+
+    Args:
+        archives: Iterable of Archive instances
+        actor: User credited with the restore in the audit log
+        validate: Run ``full_clean`` on each instance before inserting
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        BulkRestoreResult with the restored archives and ``(archive, reason)`` pairs
+    """
+    restored, skipped = [], []
+    by_module = defaultdict(list)
+    for archive in archives:
+        if archive.status == Archive.Status.RESTORED:
+            skipped.append((archive, "already restored"))
+        elif archive.module not in MODULE_MODEL_LABELS:
+            skipped.append((archive, f"unsupported module: {archive.module}"))
+        else:
+            by_module[archive.module].append(archive)
+
+    with transaction.atomic():
+        for module, module_archives in by_module.items():
+            model_class = get_model_for_module(module)
+            restorer = get_restorer(module)
+            existing = set(
+                model_class.objects.filter(
+                    pk__in=[archive.record_id for archive in module_archives]
+                ).values_list("pk", flat=True)
+            )
+            instances, pending = [], []
+            for archive in module_archives:
+                if archive.record_id in existing:
+                    skipped.append((archive, f"record #{archive.record_id} already exists"))
+                    continue
+                instance = restorer(archive.data_snapshot, archive.record_id)
+                if validate:
+                    try:
+                        instance.full_clean(exclude=["id"])
+                    except ValidationError as e:
+                        skipped.append((archive, "; ".join(e.messages)))
+                        continue
+                existing.add(archive.record_id)
+                instances.append(instance)
+                pending.append(archive)
+
+            if not instances:
+                continue
+            try:
+                with transaction.atomic():
+                    model_class.objects.bulk_create(instances, batch_size=batch_size)
+                    _check_deferred_constraints(model_class)
+            except IntegrityError:
+                for archive in pending:
+                    try:
+                        restore_record(module, archive.data_snapshot, archive.record_id)
+                    except ArchiveRestoreError as e:
+                        skipped.append((archive, str(e)))
+                    else:
+                        restored.append(archive)
+            else:
+                restored.extend(pending)
+                _refresh_dashboard(model_class)
+
+        now = timezone.now()
+        for archive in restored:
+            archive.status = Archive.Status.RESTORED
+            archive.restored_at = now
+        Archive.objects.bulk_update(restored, ["status", "restored_at"], batch_size=batch_size)
+        Archive.invalidate_list_counts({archive.module for archive in restored})
+        for archive in restored:
+            archive.record_restore(actor)
+
+    return BulkRestoreResult(restored=restored, skipped=skipped)
+
+
+class _FieldClassification(NamedTuple):
+    """Static field layout of a model, as needed for snapshot restoration."""
+
+    allowed: frozenset[str]
+    fk_attnames: dict[str, str]
+    m2m_fields: frozenset[str]
+    reverse_fields: frozenset[str]
+
+
+@lru_cache(maxsize=None)
+def _classify_fields(model_class) -> _FieldClassification:
+    """Classify a model's fields once per process; the layout never changes at runtime.
+
+    ``auto_now``/``auto_now_add`` timestamps are ordinary allowed fields, so
+    their snapshot values are passed through unchanged. ForeignKeys are mapped
+    to their ``attname`` (``stock`` -> ``stock_id``) so raw IDs can be assigned.
+    """
+    allowed, m2m_fields, reverse_fields = set(), set(), set()
+    fk_attnames = {}
+    for field in model_class._meta.get_fields():
+        if isinstance(field, (ManyToManyField, ManyToManyRel)):
+            m2m_fields.add(field.name)
+        elif isinstance(field, ManyToOneRel):
+            reverse_fields.add(field.name)
+        else:
+            allowed.add(field.name)
+            if isinstance(field, ForeignKey):
+                fk_attnames[field.name] = field.attname
+                allowed.add(field.attname)
+    return _FieldClassification(
+        allowed=frozenset(allowed),
+        fk_attnames=fk_attnames,
+        m2m_fields=frozenset(m2m_fields),
+        reverse_fields=frozenset(reverse_fields),
+    )
+
+
+def _coerce_fk(value: Any) -> Any:
+    """Return the raw ID for a ForeignKey snapshot value (nested objects carry an 'id')."""
+    return value.get('id') if isinstance(value, dict) else value
+
+
+@lru_cache(maxsize=None)
+def _restore_kwargs_builder(model_class) -> Callable[[Dict[str, Any], int], Dict[str, Any]]:
+    """Build a snapshot cleaner specialised for one model.
+
+    All field reflection happens here, once; the returned function is a
+    dict comprehension plus one lookup per ForeignKey.
+    """
+    fields = _classify_fields(model_class)
+    # Keep only concrete/forward fields; ManyToMany and reverse relations
+    # are skipped (they can be re-linked post-restore if needed).
+    plain_fields = fields.allowed.difference(fields.fk_attnames)
+    fk_items = tuple(fields.fk_attnames.items())
+
+    def build(data_snapshot: Dict[str, Any], original_record_id: int) -> Dict[str, Any]:
+        restore_data = {
+            name: value for name, value in data_snapshot.items() if name in plain_fields
+        }
+        # Store ForeignKeys as raw IDs under the column attribute
+        for name, attname in fk_items:
+            if name in data_snapshot:
+                restore_data[attname] = _coerce_fk(data_snapshot[name])
+        restore_data['id'] = original_record_id
+        return restore_data
+
+    return build
+
+
 def prepare_restore_data(model_class, data_snapshot: Dict[str, Any], original_record_id: int) -> Dict[str, Any]:
     """
     Prepare data snapshot for restoration by handling special fields.
@@ -97,49 +301,24 @@ def prepare_restore_data(model_class, data_snapshot: Dict[str, Any], original_re
     Returns:
         Cleaned data ready for model instantiation
     """
-    restore_data = data_snapshot.copy()
+    return _restore_kwargs_builder(model_class)(data_snapshot, original_record_id)
 
-    # Set the original ID
-    restore_data['id'] = original_record_id
 
-    # Get model fields
-    model_fields = {f.name: f for f in model_class._meta.get_fields()}
+@lru_cache(maxsize=None)
+def get_restorer(module: str) -> Callable[[Dict[str, Any], int], Any] | None:
+    """Return a factory building an unsaved instance for ``module``, or None if unsupported."""
+    model_class = get_model_for_module(module)
+    if model_class is None:
+        return None
+    build = _restore_kwargs_builder(model_class)
 
-    # Handle special field types
-    for field_name, value in list(restore_data.items()):
-        if field_name not in model_fields:
-            # Remove fields that don't exist in the model
-            del restore_data[field_name]
-            continue
+    def restorer(data_snapshot: Dict[str, Any], original_record_id: int):
+        return model_class(**build(data_snapshot, original_record_id))
 
-        field = model_fields[field_name]
+    return restorer
 
-        # Handle auto-created fields that shouldn't be set manually
-        if field_name in ['created_at', 'updated_at'] and getattr(field, 'auto_now_add', False) or getattr(field, 'auto_now', False):
-            # For auto fields, let Django handle them unless explicitly preserving timestamps
-            # We'll keep them to maintain historical accuracy
-            pass
 
-        # Handle ForeignKey fields - ensure we're storing the ID
-        if hasattr(field, 'related_model') and field.many_to_one:
-            # If value is None, keep it as None
-            if value is None:
-                continue
-            # If value is a dict (nested object), extract the ID
-            if isinstance(value, dict) and 'id' in value:
-                restore_data[field_name] = value['id']
-            # Otherwise assume it's already an ID
-            elif isinstance(value, (int, str)):
-                restore_data[field_name] = value
-
-        # Handle ManyToMany fields (skip them for now, can be added post-restore if needed)
-        if hasattr(field, 'related_model') and field.many_to_many:
-            del restore_data[field_name]
-
-    # Remove reverse relations
-    for field_name in list(restore_data.keys()):
-        field = model_fields.get(field_name)
-        if field and hasattr(field, 'related_model') and field.one_to_many:
-            del restore_data[field_name]
-
-    return restore_data
+def warm_restorers() -> None:
+    """Precompute restorers for every supported module (called once the app registry is ready)."""
+    for module in MODULE_MODEL_LABELS:
+        get_restorer(module)
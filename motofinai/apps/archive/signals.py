@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import MODULE_STATS_CACHE_KEY, Archive
+
+
+@receiver(post_save, sender=Archive)
+@receiver(post_delete, sender=Archive)
+def invalidate_archive_caches(sender, instance, **kwargs):
+    cache.delete(MODULE_STATS_CACHE_KEY)
+    Archive.invalidate_list_counts([instance.module])
@@ -0,0 +1,185 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase
+
+from motofinai.apps.dashboard import metrics
+from motofinai.apps.dashboard.kpi import AdminDashboardKPI
+
+from motofinai.apps.archive.models import Archive
+from motofinai.apps.archive.services import (
+    ArchiveRestoreError,
+    prepare_restore_data,
+    restore_record,
+    restore_records,
+)
+from motofinai.apps.audit.models import AuditLogEntry
+from motofinai.apps.inventory.models import Motor, Stock
+from motofinai.apps.loans.models import FinancingTerm, LoanApplication
+from motofinai.apps.users.models import User
+
+
+class PrepareRestoreDataTests(SimpleTestCase):
+    def test_drops_unknown_and_reverse_fields(self):
+        data = prepare_restore_data(
+            Motor,
+            {"brand": "Honda", "loan_applications": [1, 2], "legacy_column": "x"},
+            7,
+        )
+        self.assertEqual(data, {"brand": "Honda", "id": 7})
+
+    def test_unwraps_nested_foreign_key(self):
+        data = prepare_restore_data(Motor, {"brand": "Honda", "stock": {"id": 3}}, 7)
+        self.assertEqual(data, {"brand": "Honda", "stock_id": 3, "id": 7})
+
+    def test_foreign_key_id_is_assignable(self):
+        data = prepare_restore_data(Motor, {"brand": "Honda", "stock": 3, "approved_by_id": 1}, 7)
+        motor = Motor(**data)
+        self.assertEqual((motor.stock_id, motor.approved_by_id), (3, 1))
+
+    def test_does_not_mutate_snapshot(self):
+        snapshot = {"brand": "Honda", "stock": {"id": 3}}
+        prepare_restore_data(Motor, snapshot, 7)
+        self.assertEqual(snapshot, {"brand": "Honda", "stock": {"id": 3}})
+
+    def test_keeps_auto_timestamp_values(self):
+        snapshot = {
+            "brand": "Honda",
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-02-01T00:00:00Z",
+        }
+        data = prepare_restore_data(Motor, snapshot, 7)
+        self.assertEqual(data["created_at"], "2024-01-01T00:00:00Z")
+        self.assertEqual(data["updated_at"], "2024-02-01T00:00:00Z")
+
+
+class RestoreRecordTests(TestCase):
+    snapshot = {"brand": "Honda", "model_name": "Click 125i", "year": 2024, "color": "Red"}
+
+    def test_restores_record_with_original_id(self):
+        restored = restore_record("stocks", self.snapshot, 42)
+        self.assertEqual(restored.pk, 42)
+        self.assertTrue(Stock.objects.filter(pk=42, brand="Honda").exists())
+
+    def test_existing_primary_key_is_reported(self):
+        Stock.objects.create(pk=42, brand="Yamaha", model_name="Mio", year=2023)
+        with self.assertRaisesMessage(ArchiveRestoreError, "already exists"):
+            restore_record("stocks", self.snapshot, 42)
+        self.assertEqual(Stock.objects.get(pk=42).brand, "Yamaha")
+
+    def test_validate_runs_model_validation(self):
+        snapshot = dict(self.snapshot, year=1800)
+        with self.assertRaisesMessage(ArchiveRestoreError, "Validation error"):
+            restore_record("stocks", snapshot, 42, validate=True)
+        self.assertFalse(Stock.objects.filter(pk=42).exists())
+
+    def test_unsupported_module(self):
+        with self.assertRaisesMessage(ArchiveRestoreError, "Unsupported module"):
+            restore_record("unknown", self.snapshot, 1)
+
+
+class RestoreRecordsTests(TestCase):
+    def _archive(self, module, record_id, **snapshot):
+        return Archive.archive_record(
+            module=module,
+            record_id=record_id,
+            data_snapshot=snapshot,
+            archived_by=None,
+        )
+
+    def test_bulk_restore_groups_by_module(self):
+        archives = [
+            self._archive("stocks", 10, brand="Honda", model_name="Click", year=2024),
+            self._archive("stocks", 11, brand="Yamaha", model_name="Mio", year=2024),
+            self._archive("unknown", 1),
+        ]
+        Stock.objects.create(pk=12, brand="Suzuki", model_name="Raider", year=2022)
+        archives.append(self._archive("stocks", 12, brand="Suzuki", model_name="Raider", year=2022))
+
+        # One existence check, INSERT, constraint check and archive UPDATE for
+        # the module, plus an audit entry per restored archive and savepoints
+        with self.assertNumQueries(10):
+            result = restore_records(archives)
+
+        self.assertEqual({a.record_id for a in result.restored}, {10, 11})
+        self.assertEqual(len(result.skipped), 2)
+        self.assertEqual(Stock.objects.filter(pk__in=[10, 11]).count(), 2)
+        self.assertEqual(
+            Archive.objects.filter(status=Archive.Status.RESTORED).count(),
+            2,
+        )
+
+
+    def test_constraint_violation_skips_only_the_offending_archive(self):
+        price = {"purchase_price": "75000.00"}
+        Motor.objects.create(pk=1, brand="Honda", model_name="Click", year=2024, chassis_number="VIN-1", **price)
+        clash = self._archive("motors", 5, brand="Yamaha", model_name="Mio", year=2024, chassis_number="VIN-1", **price)
+        dangling = self._archive("motors", 6, brand="Suzuki", model_name="Raider", year=2024, stock=999, **price)
+        fine = self._archive(
+            "motors", 7, brand="Kawasaki", model_name="Barako", year=2024, chassis_number="VIN-7", **price
+        )
+
+        result = restore_records([clash, dangling, fine])
+
+        self.assertEqual([a.record_id for a in result.restored], [7])
+        self.assertEqual({a.record_id for a, _ in result.skipped}, {5, 6})
+        self.assertEqual(set(Motor.objects.values_list("pk", flat=True)), {1, 7})
+        self.assertEqual(
+            set(Archive.objects.filter(status=Archive.Status.RESTORED).values_list("record_id", flat=True)),
+            {7},
+        )
+
+    def test_bulk_restore_is_audited_with_the_actor(self):
+        actor = User.objects.create_user(username="archivist", password="password")
+        archive = self._archive("stocks", 10, brand="Honda", model_name="Click", year=2024)
+
+        restore_records([archive], actor=actor)
+
+        entry = AuditLogEntry.objects.get(action=AuditLogEntry.ActionType.RESTORE)
+        self.assertEqual(entry.actor, actor)
+        self.assertEqual(entry.object_id, str(archive.pk))
+
+    def test_bulk_restore_updates_dashboard_loan_counters(self):
+        user = User.objects.create_user(username="officer", password="password", role="finance")
+        term = FinancingTerm.objects.create(term_years=2, interest_rate=Decimal("12.00"))
+        motor = Motor.objects.create(brand="Honda", model_name="Click", year=2024, purchase_price=Decimal("75000.00"))
+        metrics.rebuild(LoanApplication)
+        self.assertEqual(AdminDashboardKPI.get_loan_kpis()["total_loans"], 0)
+        archive = self._archive(
+            "loan_applications",
+            30,
+            applicant_first_name="Ana",
+            applicant_last_name="Cruz",
+            applicant_email="ana@example.com",
+            applicant_phone="09123456789",
+            employment_status="employed",
+            monthly_income="30000.00",
+            motor=motor.pk,
+            financing_term=term.pk,
+            loan_amount="60000.00",
+            down_payment="0.00",
+            principal_amount="60000.00",
+            interest_rate="12.00",
+            monthly_payment="2500.00",
+            submitted_by=user.pk,
+            status="active",
+        )
+
+        result = restore_records([archive])
+
+        self.assertEqual([a.record_id for a in result.restored], [30])
+        kpis = AdminDashboardKPI.get_loan_kpis()
+        self.assertEqual(kpis["total_loans"], 1)
+        self.assertEqual(kpis["active_loans"], 1)
+        self.assertEqual(kpis["total_loan_value"], Decimal("60000.00"))
+
+
+class ArchiveSnapshotEncodingTests(TestCase):
+    def test_snapshot_round_trips_decimal_and_unicode(self):
+        archive = Archive.archive_record(
+            module="payments",
+            record_id=1,
+            data_snapshot={"amount": Decimal("1500.50"), "notes": "Bayad ni Peña"},
+            archived_by=None,
+        )
+        archive.refresh_from_db()
+        self.assertEqual(archive.data_snapshot, {"amount": "1500.50", "notes": "Bayad ni Peña"})
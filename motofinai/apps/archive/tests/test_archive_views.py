@@ -0,0 +1,154 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from motofinai.apps.archive.models import Archive
+from motofinai.apps.audit.models import AuditLogEntry
+from motofinai.apps.inventory.models import Stock
+from motofinai.apps.users.models import User
+
+
+class ArchiveListViewTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.admin = get_user_model().objects.create_user(
+            username="archive_admin",
+            password="password123",
+            role=User.Roles.ADMIN,
+        )
+        for record_id in (1, 2, 3):
+            Archive.archive_record(
+                module="motors",
+                record_id=record_id,
+                data_snapshot={"brand": "Honda"},
+                archived_by=self.admin,
+            )
+        Archive.archive_record(
+            module="payments",
+            record_id=10,
+            data_snapshot={"amount": "1500.00"},
+            archived_by=self.admin,
+        )
+
+    def test_list_defers_snapshot_columns(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("archive:list"))
+        self.assertEqual(response.status_code, 200)
+        archive = response.context["archives"][0]
+        self.assertIn("data_snapshot_raw", archive.get_deferred_fields())
+
+    def test_paginator_count_is_cached_per_filter(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("archive:list"), {"module": "motors"})
+        self.assertEqual(response.context["paginator"].count, 3)
+        self.assertEqual(cache.get("archive:count:motors:"), 3)
+
+        response = self.client.get(reverse("archive:list"), {"module": "payments"})
+        self.assertEqual(response.context["paginator"].count, 1)
+
+    def test_paginator_count_refreshes_after_archive_and_restore(self):
+        self.client.force_login(self.admin)
+        url = reverse("archive:list")
+        self.assertEqual(self.client.get(url, {"module": "motors"}).context["paginator"].count, 3)
+        self.assertEqual(self.client.get(url, {"status": "archived"}).context["paginator"].count, 4)
+
+        archive = Archive.archive_record(
+            module="motors", record_id=4, data_snapshot={"brand": "Honda"}, archived_by=self.admin
+        )
+        self.assertEqual(self.client.get(url, {"module": "motors"}).context["paginator"].count, 4)
+        self.assertEqual(self.client.get(url, {"status": "archived"}).context["paginator"].count, 5)
+
+        archive.restore()
+        response = self.client.get(url, {"status": "archived"})
+        self.assertEqual(response.context["paginator"].count, 4)
+
+    def test_unknown_module_count_is_not_cached(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("archive:list"), {"module": "no-such-module"})
+        self.assertEqual(response.context["paginator"].count, 0)
+        self.assertIsNone(cache.get("archive:count:no-such-module:"))
+
+    def test_module_stats_refresh_after_new_archive(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("archive:list"))
+        stats = {row["module"]: row["count"] for row in response.context["module_stats"]}
+        self.assertEqual(stats, {"motors": 3, "payments": 1})
+
+        Archive.archive_record(
+            module="payments",
+            record_id=11,
+            data_snapshot={"amount": "500.00"},
+            archived_by=self.admin,
+        )
+        response = self.client.get(reverse("archive:list"))
+        stats = {row["module"]: row["count"] for row in response.context["module_stats"]}
+        self.assertEqual(stats["payments"], 2)
+
+
+class ArchiveRestoreViewTests(TestCase):
+    def setUp(self) -> None:
+        self.admin = get_user_model().objects.create_user(
+            username="restore_admin",
+            password="password123",
+            role=User.Roles.ADMIN,
+        )
+        self.archive = Archive.archive_record(
+            module="stocks",
+            record_id=55,
+            data_snapshot={"brand": "Honda", "model_name": "Click", "year": 2024},
+            archived_by=self.admin,
+        )
+
+    def test_restore_marks_archive_and_records_audit_entry(self):
+        self.client.force_login(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("archive:restore", args=[self.archive.pk]))
+        self.assertRedirects(
+            response,
+            reverse("archive:detail", args=[self.archive.pk]),
+            fetch_redirect_response=False,
+        )
+
+        self.archive.refresh_from_db()
+        self.assertEqual(self.archive.status, Archive.Status.RESTORED)
+        self.assertIsNotNone(self.archive.restored_at)
+        self.assertTrue(Stock.objects.filter(pk=55).exists())
+        entry = AuditLogEntry.objects.get(action=AuditLogEntry.ActionType.RESTORE)
+        self.assertEqual(entry.actor, self.admin)
+        self.assertEqual(entry.object_id, str(self.archive.pk))
+
+    def test_restore_is_idempotent(self):
+        self.assertTrue(self.archive.restore())
+        self.assertFalse(self.archive.restore())
+        self.assertEqual(AuditLogEntry.objects.filter(action=AuditLogEntry.ActionType.RESTORE).count(), 1)
+
+
+class ArchiveDetailViewTests(TestCase):
+    def setUp(self) -> None:
+        self.admin = get_user_model().objects.create_user(
+            username="detail_admin",
+            password="password123",
+            role=User.Roles.ADMIN,
+        )
+        self.archive = Archive.archive_record(
+            module="stocks",
+            record_id=77,
+            data_snapshot={"brand": "Honda", "model_name": "Click", "year": 2024},
+            archived_by=self.admin,
+        )
+
+    def test_repeat_request_returns_not_modified(self):
+        self.client.force_login(self.admin)
+        url = reverse("archive:detail", args=[self.archive.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Honda")
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.archive.restore()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
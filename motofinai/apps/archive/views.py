@@ -1,16 +1,69 @@
+import hashlib
 from typing import Any, Dict
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.http import HttpRequest, HttpResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.views import View
+from django.views.decorators.http import etag
 from django.views.generic import DetailView, ListView
 
 from .models import Archive
 from .services import restore_record, ArchiveRestoreError
 
+_STATUS_VALUES = frozenset(Archive.Status.values)
+_ARCHIVE_LIST_URL = reverse_lazy("archive:list")
+
+
+def _archive_detail_etag(request: HttpRequest, pk: int) -> str | None:
+    """ETag for the detail page from the archive's mutable columns only.
+
+    The snapshot never changes after archiving, so status/restored_at plus
+    the viewer (restore button, CSRF token) identify the rendered page.
+    Pending flash messages disable the ETag so they are always shown.
+    """
+    user = request.user
+    if not user.is_authenticated or len(messages.get_messages(request)):
+        return None
+    state = Archive.objects.filter(pk=pk).values_list("status", "restored_at").first()
+    if state is None:
+        return None
+    get_token(request)  # ensures the (unmasked) CSRF secret is in META
+    csrf_secret = request.META["CSRF_COOKIE"]
+    key = f"{pk}:{state[0]}:{state[1]}:{user.pk}:{user.is_admin}:{csrf_secret}"
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that caches the total row count for a short period.
+
+    The cache key must encode the active filters so different filter
+    combinations never share a count.
+    """
+
+    count_cache_timeout = 30
+
+    def __init__(self, *args: Any, count_cache_key: str = "", **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    @cached_property
+    def count(self) -> int:
+        if not self.count_cache_key:
+            return super().count
+        return cache.get_or_set(
+            self.count_cache_key,
+            lambda: Paginator.count.func(self),
+            self.count_cache_timeout,
+        )
+
 
 class ArchiveListView(LoginRequiredMixin, ListView):
     """List all archived records across all modules."""
@@ -19,10 +72,17 @@ class ArchiveListView(LoginRequiredMixin, ListView):
     template_name = "pages/archive/archive_list.html"
     context_object_name = "archives"
     paginate_by = 50
+    paginator_class = CachedCountPaginator
     required_roles = ("admin", "finance")
 
     def get_queryset(self):
-        queryset = super().get_queryset().select_related("archived_by")
+        # The list never renders the snapshot or reason, so skip decoding them.
+        queryset = (
+            super()
+            .get_queryset()
+            .select_related("archived_by")
+            .defer("data_snapshot_raw", "reason")
+        )
 
         # Filter by module if provided
         module = self.request.GET.get("module")
@@ -31,27 +91,40 @@ class ArchiveListView(LoginRequiredMixin, ListView):
 
         # Filter by status if provided
         status = self.request.GET.get("status")
-        if status in dict(Archive.Status.choices):
+        if status in _STATUS_VALUES:
             queryset = queryset.filter(status=status)
 
         return queryset
 
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        module = self.request.GET.get("module", "")
+        status = self.request.GET.get("status", "")
+        if status not in _STATUS_VALUES:
+            status = ""
+        # Only cache counts for modules that have archives, so arbitrary
+        # query strings cannot create cache entries
+        if not module or module in {row["module"] for row in Archive.module_stats()}:
+            kwargs.setdefault("count_cache_key", Archive.list_count_cache_key(module, status))
+        return super().get_paginator(
+            queryset,
+            per_page,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            **kwargs,
+        )
+
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         context = super().get_context_data(**kwargs)
 
-        # Get module statistics
-        module_stats = Archive.objects.values("module").annotate(
-            count=Count("id")
-        ).order_by("-count")
-
         context.update({
-            "module_stats": module_stats,
+            "module_stats": Archive.module_stats(),
             "status_choices": Archive.Status.choices,
             "user_can_restore": self.request.user.is_admin,
         })
         return context
 
 
+@method_decorator(etag(_archive_detail_etag), name="dispatch")
 class ArchiveDetailView(LoginRequiredMixin, DetailView):
     """View details of an archived record."""
 
@@ -64,8 +137,8 @@ class ArchiveDetailView(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         context["user_can_restore"] = self.request.user.is_admin
         context["breadcrumbs"] = [
-            {"label": "Archive", "url": reverse("archive:list")},
-            {"label": "Archives", "url": reverse("archive:list")},
+            {"label": "Archive", "url": _ARCHIVE_LIST_URL},
+            {"label": "Archives", "url": _ARCHIVE_LIST_URL},
             {"label": f"{self.object.module.title()} #{self.object.record_id}"},
         ]
         return context
@@ -92,7 +165,7 @@ class ArchiveRestoreView(LoginRequiredMixin, View):
             )
 
             # Mark the archive as restored
-            archive.restore()
+            archive.restore(actor=request.user)
 
             messages.success(
                 request,
@@ -0,0 +1,36 @@
+from typing import Any, Dict, List
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+User = get_user_model()
+
+USER_CHOICES_CACHE_KEY = "audit:user_choices:v2"
+USER_CHOICES_CACHE_TIMEOUT = 300
+# Users preloaded into the filter dropdown; the rest are found through the
+# user autocomplete endpoint as the filter's search box is typed into.
+USER_CHOICES_LIMIT = 200
+
+
+def user_choices(queryset) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": pk,
+            "username": username,
+            "label": f"{first_name} {last_name}".strip() or email,
+        }
+        for pk, username, first_name, last_name, email in queryset.values_list(
+            "pk", "username", "first_name", "last_name", "email"
+        )
+    ]
+
+
+def get_cached_user_choices() -> List[Dict[str, Any]]:
+    """First active users for the filter dropdown, cached until a user is saved or deleted."""
+    return cache.get_or_set(
+        USER_CHOICES_CACHE_KEY,
+        lambda: user_choices(
+            User.objects.filter(is_active=True).order_by("username")[:USER_CHOICES_LIMIT]
+        ),
+        USER_CHOICES_CACHE_TIMEOUT,
+    )
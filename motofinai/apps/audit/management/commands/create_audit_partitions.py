@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from motofinai.apps.audit import partitions
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly partitions for the audit log table (PostgreSQL only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=3,
+            help="Number of months to prepare, starting with the current one (default: 3)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not partitions.is_partitioned(connection):
+            self.stdout.write(self.style.WARNING("Audit log table is not partitioned; nothing to do."))
+            return
+
+        with transaction.atomic():
+            created = partitions.ensure_monthly_partitions(
+                connection, timezone.now().date(), options["months"]
+            )
+
+        if created:
+            for name in created:
+                self.stdout.write(self.style.SUCCESS(f"Created partition {name}"))
+        else:
+            self.stdout.write("All partitions already exist.")
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:29
+
+import motofinai.apps.core.encoders
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0002_enhance_audit_logging_system"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="auditlogentry",
+            name="metadata",
+            field=models.JSONField(
+                blank=True,
+                decoder=motofinai.apps.core.encoders.OrjsonDecoder,
+                default=dict,
+                encoder=motofinai.apps.core.encoders.OrjsonEncoder,
+                help_text="Additional structured data about the event",
+            ),
+        ),
+    ]
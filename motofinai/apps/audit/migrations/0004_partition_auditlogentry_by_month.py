@@ -0,0 +1,41 @@
+from django.db import migrations
+from django.db.migrations.exceptions import IrreversibleError
+from django.utils import timezone
+
+from motofinai.apps.audit import partitions
+
+
+def partition_audit_log(apps, schema_editor):
+    connection = schema_editor.connection
+    if not partitions.is_supported(connection):
+        return
+    partitions.convert_to_partitioned(connection)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(created_at) FROM {partitions.TABLE}")
+        oldest = cursor.fetchone()[0]
+    today = timezone.now().date()
+    start = oldest.date() if oldest else today
+    months = (today.year - start.year) * 12 + (today.month - start.month) + 3
+    partitions.ensure_monthly_partitions(connection, start, months)
+
+
+def refuse_to_unpartition(apps, schema_editor):
+    # Nothing to undo where the forward step was skipped; a partitioned table
+    # is not turned back into a plain one, since 0001-0003 do not expect it.
+    if partitions.is_partitioned(schema_editor.connection):
+        raise IrreversibleError(
+            f"{partitions.TABLE} is partitioned and cannot be migrated back before "
+            "audit.0004; restore it from a backup instead."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0003_orjson_metadata"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_audit_log, refuse_to_unpartition),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def create_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS audit_created_brin ON audit_auditlogentry "
+        "USING BRIN (created_at) WITH (pages_per_range = 32)"
+    )
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS audit_created_brin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0004_partition_auditlogentry_by_month"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_index, drop_brin_index),
+    ]
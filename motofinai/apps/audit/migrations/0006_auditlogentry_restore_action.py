@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0005_auditlogentry_created_at_brin"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="auditlogentry",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("login", "User Login"),
+                    ("logout", "User Logout"),
+                    ("login_failed", "Failed Login Attempt"),
+                    ("password_changed", "Password Changed"),
+                    ("account_locked", "Account Locked"),
+                    ("create", "Record Created"),
+                    ("update", "Record Updated"),
+                    ("delete", "Record Deleted"),
+                    ("restore", "Record Restored"),
+                    ("view", "Record Viewed"),
+                    ("export", "Data Exported"),
+                    ("import", "Data Imported"),
+                    ("loan_created", "Loan Application Created"),
+                    ("loan_approved", "Loan Approved"),
+                    ("loan_rejected", "Loan Rejected"),
+                    ("loan_disbursed", "Loan Disbursed"),
+                    ("loan_completed", "Loan Completed"),
+                    ("payment_recorded", "Payment Recorded"),
+                    ("payment_reversed", "Payment Reversed"),
+                    ("motor_received", "Motor Received"),
+                    ("motor_inspected", "Motor Inspected"),
+                    ("motor_approved", "Motor Approved"),
+                    ("user_created", "User Created"),
+                    ("user_modified", "User Modified"),
+                    ("user_deactivated", "User Deactivated"),
+                    ("user_role_changed", "User Role Changed"),
+                    ("system_config_changed", "System Configuration Changed"),
+                    ("backup_created", "Backup Created"),
+                    ("security_alert", "Security Alert"),
+                ],
+                db_index=True,
+                default="view",
+                help_text="Type of action performed",
+                max_length=50,
+            ),
+        ),
+    ]
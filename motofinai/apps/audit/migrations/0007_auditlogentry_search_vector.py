@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:42
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Keep ``search_vector`` in step with the action and the actor's username/email.
+# Dotted/underscored actions ("auth.login", "loan_approved") and e-mail
+# addresses are also indexed word by word so partial terms still match.
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION audit_auditlogentry_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector(
+        'simple',
+        coalesce(NEW.action, '') || ' ' || translate(coalesce(NEW.action, ''), '._', '  ') || ' ' ||
+        coalesce(
+            (SELECT u.username || ' ' || u.email || ' ' || translate(u.email, '@.', '  ')
+             FROM {users_table} u WHERE u.id = NEW.actor_id),
+            ''
+        )
+    );
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER audit_auditlogentry_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF action, actor_id ON audit_auditlogentry
+    FOR EACH ROW EXECUTE FUNCTION audit_auditlogentry_search_vector_update();
+"""
+
+
+def create_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    users_table = schema_editor.quote_name(apps.get_model("users", "User")._meta.db_table)
+    schema_editor.execute(CREATE_TRIGGER_SQL.format(users_table=users_table))
+    # Touch every row once so the trigger backfills existing entries
+    schema_editor.execute("UPDATE audit_auditlogentry SET action = action")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS audit_search_vector_gin ON audit_auditlogentry "
+        "USING GIN (search_vector)"
+    )
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS audit_search_vector_gin")
+    schema_editor.execute(
+        "DROP TRIGGER IF EXISTS audit_auditlogentry_search_vector_trigger ON audit_auditlogentry"
+    )
+    schema_editor.execute("DROP FUNCTION IF EXISTS audit_auditlogentry_search_vector_update()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0006_auditlogentry_restore_action"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="auditlogentry",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_vector, drop_search_vector),
+    ]
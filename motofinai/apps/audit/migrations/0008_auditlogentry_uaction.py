@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:45
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0007_auditlogentry_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="auditlogentry",
+            name="uaction",
+            field=models.GeneratedField(
+                db_index=True,
+                db_persist=True,
+                expression=django.db.models.functions.text.Upper("action"),
+                output_field=models.CharField(max_length=50),
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0008_auditlogentry_uaction"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="auditlogentry",
+            name="audit_audit_created_06a422_idx",
+        ),
+        migrations.AddIndex(
+            model_name="auditlogentry",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="audit_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:01
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+# ``uaction`` is only filtered with LIKE '%x%', which a B-tree cannot serve;
+# trigram GIN indexes can. On the partitioned table the index cascades to
+# every partition, including ones attached later.
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS audit_uaction_trgm ON audit_auditlogentry "
+        "USING GIN (uaction gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS audit_uaction_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0009_auditlogentry_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="auditlogentry",
+            name="uaction",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.text.Upper("action"),
+                output_field=models.CharField(max_length=50),
+            ),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -1,7 +1,20 @@
+import logging
+from functools import partial
+
+from asgiref.local import Local
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, models, transaction
+from django.db.models.functions import Upper
 from django.utils import timezone
 
+from motofinai.apps.core.encoders import OrjsonDecoder, OrjsonEncoder
+
+logger = logging.getLogger(__name__)
+
+# Per-request buffer of unsaved entries; ``None`` outside a request.
+_buffer = Local()
+
 
 class AuditLogEntry(models.Model):
     """Enterprise-grade audit record for system, authentication, and business events."""
@@ -18,6 +31,7 @@ class AuditLogEntry(models.Model):
         CREATE = "create", "Record Created"
         UPDATE = "update", "Record Updated"
         DELETE = "delete", "Record Deleted"
+        RESTORE = "restore", "Record Restored"
         VIEW = "view", "Record Viewed"
         EXPORT = "export", "Data Exported"
         IMPORT = "import", "Data Imported"
@@ -70,6 +84,15 @@ class AuditLogEntry(models.Model):
         db_index=True,
         help_text="Type of action performed"
     )
+    # Upper-cased copy of ``action`` so case-insensitive filters compare the
+    # stored column directly instead of computing UPPER(action) per row. Its
+    # substring filter (LIKE '%x%') is served on PostgreSQL by a pg_trgm GIN
+    # index created in migration 0010; a B-tree index could not be used.
+    uaction = models.GeneratedField(
+        expression=Upper("action"),
+        output_field=models.CharField(max_length=50),
+        db_persist=True,
+    )
     severity = models.CharField(
         max_length=10,
         choices=Severity.choices,
@@ -103,16 +126,23 @@ class AuditLogEntry(models.Model):
     metadata = models.JSONField(
         blank=True,
         default=dict,
+        encoder=OrjsonEncoder,
+        decoder=OrjsonDecoder,
         help_text="Additional structured data about the event"
     )
 
+    # Full-text search document (action + actor username/email). Maintained by a
+    # database trigger on PostgreSQL and GIN-indexed; unused on other backends.
+    search_vector = SearchVectorField(null=True, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["-created_at"]),
+            # Keyset pagination order of the audit log list
+            models.Index(fields=["-created_at", "-id"], name="audit_created_id_idx"),
             models.Index(fields=["actor", "-created_at"]),
             models.Index(fields=["action", "-created_at"]),
             models.Index(fields=["object_model", "object_id"]),
@@ -120,6 +150,9 @@ class AuditLogEntry(models.Model):
         verbose_name = "Audit Log Entry"
         verbose_name_plural = "Audit Log Entries"
 
+    FLUSH_BATCH_SIZE = 500
+    STREAM_CHUNK_SIZE = 2000
+
     def __str__(self) -> str:
         actor_display = self.actor.get_username() if self.actor else "system"
         return f"{self.get_action_display()} - {actor_display}"
@@ -145,9 +178,16 @@ class AuditLogEntry(models.Model):
         object_id = None,
         metadata=None,
     ):
-        """Create and save an audit log entry."""
+        """Create an audit log entry.
+
+        Inside a request the entry is buffered and written in bulk once the
+        response has been sent (see ``flush_buffer``), so the returned
+        instance is not saved yet. Outside a request it is saved immediately.
+        Buffered entries recorded inside a transaction are only queued once it
+        commits, so rolled-back work is not logged.
+        """
         payload = metadata or {}
-        return cls.objects.create(
+        entry = cls(
             actor=actor,
             action=action,
             description=description,
@@ -158,6 +198,62 @@ class AuditLogEntry(models.Model):
             object_id=str(object_id) if object_id else "",
             metadata=payload,
         )
+        if getattr(_buffer, "entries", None) is not None and connection.in_atomic_block:
+            transaction.on_commit(partial(cls._buffer_entry, entry))
+        else:
+            cls._buffer_entry(entry)
+        return entry
+
+    @classmethod
+    def _buffer_entry(cls, entry) -> None:
+        entries = getattr(_buffer, "entries", None)
+        if entries is None:
+            entry.save()
+        else:
+            entries.append(entry)
+
+    @classmethod
+    def start_buffering(cls) -> None:
+        """Start collecting entries for the current request."""
+        _buffer.entries = []
+
+    @classmethod
+    def discard_buffer(cls) -> None:
+        """Drop the entries buffered so far, e.g. when the request raised."""
+        entries = getattr(_buffer, "entries", None)
+        if entries:
+            entries.clear()
+
+    @classmethod
+    def flush_buffer(cls) -> None:
+        """Write buffered entries in one batch and stop buffering.
+
+        If the batch is rejected the entries are saved one by one, so a
+        single bad entry does not lose the rest of the request's log.
+        """
+        entries = getattr(_buffer, "entries", None)
+        _buffer.entries = None
+        if not entries:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.bulk_create(entries, batch_size=cls.FLUSH_BATCH_SIZE)
+        except Exception:
+            logger.exception(
+                "Failed to bulk write %d buffered audit log entries; saving them one by one",
+                len(entries),
+            )
+        else:
+            return
+        for entry in entries:
+            # bulk_create may have assigned keys before the batch rolled back
+            entry.pk = None
+            entry._state.adding = True
+            try:
+                with transaction.atomic():
+                    entry.save()
+            except Exception:
+                logger.exception("Failed to write audit log entry %r", entry.action)
 
     @classmethod
     def log_object_change(
@@ -235,8 +331,12 @@ class AuditLogEntry(models.Model):
         )
 
     @classmethod
-    def get_recent_activity(cls, user=None, days: int = 30):
-        """Get recent audit activity."""
+    def get_recent_activity(cls, user=None, days: int = 30, stream: bool = False):
+        """Get recent audit activity.
+
+        With ``stream=True`` an iterator is returned that fetches rows in
+        chunks of ``STREAM_CHUNK_SIZE`` instead of caching the whole result.
+        """
         from django.utils import timezone
         from datetime import timedelta
 
@@ -246,12 +346,14 @@ class AuditLogEntry(models.Model):
         if user:
             queryset = queryset.filter(actor=user)
 
-        return queryset.order_by("-created_at")
+        queryset = queryset.order_by("-created_at")
+        return queryset.iterator(chunk_size=cls.STREAM_CHUNK_SIZE) if stream else queryset
 
     @classmethod
-    def get_object_history(cls, object_model: str, object_id):
-        """Get audit history for a specific object."""
-        return cls.objects.filter(
+    def get_object_history(cls, object_model: str, object_id, stream: bool = False):
+        """Get audit history for a specific object (see ``get_recent_activity`` for ``stream``)."""
+        queryset = cls.objects.filter(
             object_model=object_model,
             object_id=str(object_id),
         ).order_by("-created_at")
+        return queryset.iterator(chunk_size=cls.STREAM_CHUNK_SIZE) if stream else queryset
@@ -0,0 +1,155 @@
+"""
+Monthly RANGE partitioning of the audit log table on PostgreSQL.
+
+The parent table keeps the ORM-facing shape of ``AuditLogEntry``; rows land
+in ``<table>_yYYYYmMM`` children, or in ``<table>_default`` when no monthly
+partition covers their ``created_at``. Other database backends are left
+untouched and every helper here is a no-op for them.
+
+Schedule ``python manage.py create_audit_partitions`` monthly (cron) so the
+upcoming months always have a partition ready.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timezone as dt_timezone
+
+TABLE = "audit_auditlogentry"
+LEGACY_TABLE = f"{TABLE}_unpartitioned"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def is_supported(connection) -> bool:
+    return connection.vendor == "postgresql"
+
+
+def is_partitioned(connection) -> bool:
+    if not is_supported(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def _month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def _stored_columns(cursor, table: str) -> str:
+    """Return ``table``'s writable columns as a SQL list, leaving out generated ones.
+
+    ``INSERT ... SELECT *`` would try to write generated columns such as
+    ``uaction``, which PostgreSQL rejects; they are recomputed instead.
+    """
+    cursor.execute(
+        """
+        SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) FROM pg_attribute
+        WHERE attrelid = to_regclass(%s) AND attnum > 0 AND NOT attisdropped AND attgenerated = ''
+        """,
+        [table],
+    )
+    return cursor.fetchone()[0]
+
+
+def convert_to_partitioned(connection) -> None:
+    """Rebuild the audit table as a partitioned parent, keeping rows, indexes and FKs.
+
+    PostgreSQL requires the partition key in every unique constraint, so the
+    primary key becomes ``(id, created_at)``; ``id`` stays sequence-generated
+    and the ORM keeps addressing rows by it.
+    """
+    if not is_supported(connection) or is_partitioned(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {LEGACY_TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY "
+            f"INCLUDING CONSTRAINTS INCLUDING GENERATED) PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+        columns = _stored_columns(cursor, LEGACY_TABLE)
+        cursor.execute(f"INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {LEGACY_TABLE}")
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {TABLE}",
+            [TABLE],
+        )
+
+        # Move secondary indexes and foreign keys over under their original
+        # names so later migrations can still find them.
+        cursor.execute(
+            """
+            SELECT indexname, indexdef FROM pg_indexes
+            WHERE tablename = %s AND indexname NOT IN (
+                SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s)
+            )
+            """,
+            [LEGACY_TABLE, LEGACY_TABLE],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = to_regclass(%s) AND contype = 'f'
+            """,
+            [LEGACY_TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+
+        cursor.execute(f"DROP TABLE {LEGACY_TABLE}")
+        cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, created_at)")
+        for _name, definition in indexes:
+            cursor.execute(definition.replace(f".{LEGACY_TABLE} ", f".{TABLE} "))
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" {definition}')
+
+
+def ensure_monthly_partitions(connection, start: date, months: int) -> list[str]:
+    """Create monthly partitions from ``start``'s month onwards; return the names created.
+
+    Rows already sitting in the default partition for a new month are moved
+    into it, so this is safe to run after the fact.
+    """
+    if not is_partitioned(connection):
+        return []
+    created = []
+    month = _month_start(start)
+    with connection.cursor() as cursor:
+        columns = _stored_columns(cursor, TABLE)
+        for _ in range(months):
+            name = partition_name(month)
+            upper = _next_month(month)
+            cursor.execute("SELECT to_regclass(%s)", [name])
+            if cursor.fetchone()[0] is None:
+                bounds = [
+                    datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc),
+                    datetime(upper.year, upper.month, 1, tzinfo=dt_timezone.utc),
+                ]
+                # Generated columns must be generated in the child too, or
+                # ATTACH PARTITION refuses it
+                cursor.execute(
+                    f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS "
+                    f"INCLUDING GENERATED)"
+                )
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    f"WHERE created_at >= %s AND created_at < %s RETURNING {columns}) "
+                    f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved",
+                    bounds,
+                )
+                cursor.execute(
+                    f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)",
+                    bounds,
+                )
+                created.append(name)
+            month = upper
+    return created
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache
+from django.core.signals import got_request_exception, request_finished, request_started
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from .cache import USER_CHOICES_CACHE_KEY
 from .models import AuditLogEntry
 
 
@@ -35,3 +40,26 @@ def on_user_logged_in(sender, request, user, **kwargs):
     )
 
 
+@receiver(request_started)
+def start_audit_buffer(sender, **kwargs):
+    AuditLogEntry.start_buffering()
+
+
+@receiver(got_request_exception)
+def discard_audit_buffer(sender, **kwargs):
+    # The request's work failed; don't log it as if it had happened
+    AuditLogEntry.discard_buffer()
+
+
+@receiver(request_finished)
+def flush_audit_buffer(sender, **kwargs):
+    AuditLogEntry.flush_buffer()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_choices(sender, update_fields=None, **kwargs):
+    # Logins only touch last_login, which the dropdown does not show
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    cache.delete(USER_CHOICES_CACHE_KEY)
@@ -1,8 +1,21 @@
+from datetime import datetime, timezone as dt_timezone
+from importlib import import_module
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.signals import got_request_exception
+from django.db import DatabaseError, connection, transaction
+from django.db.migrations.exceptions import IrreversibleError
 from django.test import TestCase
 from django.urls import reverse
 
+from motofinai.apps.audit import partitions
 from motofinai.apps.audit.models import AuditLogEntry
+from motofinai.apps.audit.views import AuditLogListView
 from motofinai.apps.users.models import User
 
 
@@ -16,11 +29,12 @@ class AuthenticationAuditLogTests(TestCase):
         )
 
     def test_login_creates_audit_entry(self):
-        self.client.post(
-            reverse("users:login"),
-            {"username": self.user.username, "password": self.password},
-            HTTP_USER_AGENT="pytest",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("users:login"),
+                {"username": self.user.username, "password": self.password},
+                HTTP_USER_AGENT="pytest",
+            )
         log = AuditLogEntry.objects.filter(action="auth.login").first()
         self.assertIsNotNone(log)
         self.assertEqual(log.actor, self.user)
@@ -33,8 +47,225 @@ class AuthenticationAuditLogTests(TestCase):
             HTTP_USER_AGENT="pytest",
         )
         previous_session = self.client.session.session_key
-        self.client.get(reverse("users:logout"), HTTP_USER_AGENT="pytest")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse("users:logout"), HTTP_USER_AGENT="pytest")
         log = AuditLogEntry.objects.filter(action="auth.logout").first()
         self.assertIsNotNone(log)
         self.assertEqual(log.actor, self.user)
         self.assertEqual(log.metadata.get("session_key"), previous_session)
+
+
+class AuditLogBufferTests(TestCase):
+    def tearDown(self) -> None:
+        AuditLogEntry.flush_buffer()
+
+    def test_record_saves_immediately_outside_request(self):
+        entry = AuditLogEntry.record(action=AuditLogEntry.ActionType.EXPORT)
+        self.assertIsNotNone(entry.pk)
+
+    def test_buffered_entries_are_written_on_flush(self):
+        AuditLogEntry.start_buffering()
+        with self.captureOnCommitCallbacks(execute=True):
+            AuditLogEntry.record(action=AuditLogEntry.ActionType.EXPORT)
+            AuditLogEntry.record(action=AuditLogEntry.ActionType.IMPORT)
+        self.assertEqual(AuditLogEntry.objects.count(), 0)
+
+        # One savepoint around the batch insert
+        with self.assertNumQueries(3):
+            AuditLogEntry.flush_buffer()
+        self.assertEqual(AuditLogEntry.objects.count(), 2)
+
+    def test_rolled_back_entries_are_not_written(self):
+        AuditLogEntry.start_buffering()
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                AuditLogEntry.record(action=AuditLogEntry.ActionType.DELETE)
+                raise ValueError
+            AuditLogEntry.record(action=AuditLogEntry.ActionType.EXPORT)
+        AuditLogEntry.flush_buffer()
+        self.assertEqual(
+            list(AuditLogEntry.objects.values_list("action", flat=True)),
+            [AuditLogEntry.ActionType.EXPORT],
+        )
+
+    def test_entries_from_a_failed_request_are_discarded(self):
+        AuditLogEntry.start_buffering()
+        with self.captureOnCommitCallbacks(execute=True):
+            AuditLogEntry.record(action=AuditLogEntry.ActionType.DELETE)
+        got_request_exception.send(sender=None, request=None)
+        AuditLogEntry.flush_buffer()
+        self.assertFalse(AuditLogEntry.objects.exists())
+
+    def test_rejected_batch_falls_back_to_single_saves(self):
+        AuditLogEntry.start_buffering()
+        with self.captureOnCommitCallbacks(execute=True):
+            AuditLogEntry.record(action=AuditLogEntry.ActionType.EXPORT)
+            AuditLogEntry.record(action=AuditLogEntry.ActionType.IMPORT)
+        with mock.patch.object(
+            AuditLogEntry.objects, "bulk_create", side_effect=DatabaseError
+        ), self.assertLogs("motofinai.apps.audit.models", "ERROR"):
+            AuditLogEntry.flush_buffer()
+        self.assertEqual(AuditLogEntry.objects.count(), 2)
+
+
+class AuditLogHistoryTests(TestCase):
+    def test_object_history_can_stream(self):
+        for _ in range(3):
+            AuditLogEntry.record(
+                action=AuditLogEntry.ActionType.UPDATE,
+                object_model="Motor",
+                object_id=5,
+            )
+        history = AuditLogEntry.get_object_history("Motor", 5, stream=True)
+        self.assertNotIsInstance(history, list)
+        self.assertEqual(len(list(history)), 3)
+        self.assertEqual(AuditLogEntry.get_object_history("Motor", 5).count(), 3)
+
+
+class AuditLogListViewTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.admin = get_user_model().objects.create_user(
+            username="auditor",
+            email="auditor@example.com",
+            password="auditpass123",
+            role=User.Roles.ADMIN,
+        )
+        self.other = get_user_model().objects.create_user(
+            username="cashier",
+            email="cashier@example.com",
+            password="auditpass123",
+            role=User.Roles.FINANCE,
+        )
+        AuditLogEntry.record(actor=self.admin, action="loan_approved")
+        AuditLogEntry.record(actor=self.other, action="payment_recorded")
+        self.client.force_login(self.admin)
+
+    def test_search_matches_action_and_actor(self):
+        url = reverse("audit:list")
+        response = self.client.get(url, {"q": "approved"})
+        self.assertEqual([log.action for log in response.context["logs"]], ["loan_approved"])
+
+        response = self.client.get(url, {"q": "cashier"})
+        self.assertEqual([log.action for log in response.context["logs"]], ["payment_recorded"])
+
+    def test_action_filter_is_case_insensitive(self):
+        response = self.client.get(reverse("audit:list"), {"action": "Payment"})
+        self.assertEqual([log.action for log in response.context["logs"]], ["payment_recorded"])
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        url = reverse("audit:list")
+        self.client.get(url)  # populate the cached user choices
+        with self.assertNumQueries(3):
+            self.client.get(url)
+        for index in range(10):
+            AuditLogEntry.record(actor=self.other, action=f"export_{index}")
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+    def test_user_autocomplete_filters_by_username(self):
+        response = self.client.get(reverse("audit:user-autocomplete"), {"q": "cash"})
+        self.assertEqual(
+            response.json(), {"results": [{"id": self.other.pk, "text": "cashier"}]}
+        )
+
+    def test_user_choices_are_capped_and_searchable(self):
+        url = reverse("audit:list")
+        with mock.patch("motofinai.apps.audit.cache.USER_CHOICES_LIMIT", 1):
+            response = self.client.get(url)
+            self.assertEqual([user["username"] for user in response.context["users"]], ["auditor"])
+            self.assertContains(response, reverse("audit:user-autocomplete"))
+
+            # A filtered user past the cap is still offered
+            response = self.client.get(url, {"user": self.other.pk})
+            self.assertEqual(
+                [user["username"] for user in response.context["users"]], ["auditor", "cashier"]
+            )
+
+    def test_user_choices_are_refreshed_when_a_user_changes(self):
+        url = reverse("audit:list")
+        self.client.get(url)
+        self.other.first_name = "Carla"
+        self.other.save()
+        response = self.client.get(url)
+        self.assertIn(
+            {"id": self.other.pk, "username": "cashier", "label": "Carla"},
+            response.context["users"],
+        )
+
+    def test_keyset_pagination_walks_forwards_and_back(self):
+        for index in range(3):
+            AuditLogEntry.record(actor=self.other, action=f"export_{index}")
+        url = reverse("audit:list")
+        with mock.patch.object(AuditLogListView, "paginate_by", 2):
+            first = self.client.get(url).context["page_obj"]
+            self.assertFalse(first.has_previous())
+            self.assertTrue(first.has_next())
+
+            second = self.client.get(url, {"after": first.next_cursor}).context["page_obj"]
+            third = self.client.get(url, {"after": second.next_cursor}).context["page_obj"]
+            self.assertFalse(third.has_next())
+            seen = [log.pk for page in (first, second, third) for log in page]
+            self.assertEqual(
+                seen, list(AuditLogEntry.objects.order_by("-created_at", "-id").values_list("pk", flat=True))
+            )
+
+            back = self.client.get(url, {"before": third.previous_cursor}).context["page_obj"]
+            self.assertEqual([log.pk for log in back], [log.pk for log in second])
+
+    def test_known_action_filters_by_equality(self):
+        AuditLogEntry.record(actor=self.other, action=AuditLogEntry.ActionType.PAYMENT_REVERSED)
+        AuditLogEntry.record(actor=self.other, action="payment_recorded_manually")
+        response = self.client.get(reverse("audit:list"), {"action": "payment_recorded"})
+        self.assertEqual([log.action for log in response.context["logs"]], ["payment_recorded"])
+
+    def test_detail_page_links_back_to_list(self):
+        entry = AuditLogEntry.objects.get(action="payment_recorded")
+        response = self.client.get(reverse("audit:detail", args=[entry.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["breadcrumbs"][0]["url"], reverse("audit:list"))
+
+
+class AuditPartitionMigrationTests(TestCase):
+    migration = import_module("motofinai.apps.audit.migrations.0004_partition_auditlogentry_by_month")
+
+    def test_reverse_refuses_to_unpartition_the_table(self):
+        editor = SimpleNamespace(connection=connection)
+        partitions.convert_to_partitioned(connection)
+        if partitions.is_partitioned(connection):
+            with self.assertRaises(IrreversibleError):
+                self.migration.refuse_to_unpartition(None, editor)
+        else:
+            # Nothing was partitioned on this backend, so there is nothing to undo
+            self.migration.refuse_to_unpartition(None, editor)
+
+
+@skipUnless(connection.vendor == "postgresql", "Audit log partitioning is PostgreSQL only")
+class AuditPartitionCommandTests(TestCase):
+    def test_new_partition_takes_rows_from_the_default_partition(self):
+        partitions.convert_to_partitioned(connection)
+        entry = AuditLogEntry.objects.create(action=AuditLogEntry.ActionType.LOGIN)
+        month = datetime(2099, 1, 1, tzinfo=dt_timezone.utc)
+        AuditLogEntry.objects.filter(pk=entry.pk).update(created_at=month.replace(day=15))
+
+        with mock.patch("django.utils.timezone.now", return_value=month):
+            call_command("create_audit_partitions", months=1, stdout=StringIO())
+
+        name = partitions.partition_name(month.date())
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT id, uaction FROM {name}")
+            self.assertEqual(cursor.fetchall(), [(entry.pk, "LOGIN")])
+            cursor.execute(f"SELECT count(*) FROM {partitions.DEFAULT_PARTITION} WHERE id = %s", [entry.pk])
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+
+@skipUnless(connection.vendor == "postgresql", "Trigram indexes are PostgreSQL only")
+class AuditActionIndexTests(TestCase):
+    def test_action_substring_filter_has_a_trigram_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname = %s",
+                [AuditLogEntry._meta.db_table, "audit_uaction_trgm"],
+            )
+            (definition,) = cursor.fetchone()
+        self.assertIn("gin_trgm_ops", definition)
@@ -7,4 +7,5 @@ app_name = "audit"
 urlpatterns = [
     path("", views.AuditLogListView.as_view(), name="list"),
     path("<int:pk>/", views.AuditLogDetailView.as_view(), name="detail"),
+    path("users/autocomplete/", views.AuditUserAutocompleteView.as_view(), name="user-autocomplete"),
 ]
@@ -1,11 +1,76 @@
-from typing import Any, Dict
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 
+from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.postgres.search import SearchQuery
+from django.db import connections
 from django.db.models import Q
+from django.http import HttpRequest, JsonResponse
+from django.urls import reverse_lazy
+from django.views import View
 from django.views.generic import DetailView, ListView
 
+from .cache import user_choices, get_cached_user_choices
 from .models import AuditLogEntry
 
+User = get_user_model()
+
+USER_AUTOCOMPLETE_LIMIT = 20
+_ACTION_VALUES = frozenset(AuditLogEntry.ActionType.values)
+_AUDIT_LIST_URL = reverse_lazy("audit:list")
+
+
+def encode_cursor(entry: AuditLogEntry) -> str:
+    """Opaque URL-safe cursor for an entry's ``(created_at, id)`` sort key."""
+    raw = f"{entry.created_at.isoformat()}|{entry.pk}".encode()
+    return urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(value: str) -> Optional[Tuple[datetime, int]]:
+    """Inverse of :func:`encode_cursor`; returns None for missing or tampered values."""
+    if not value:
+        return None
+    try:
+        raw = urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+        created_at, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+class KeysetPage:
+    """A page of rows fetched by seek pagination; links carry cursors, not page numbers."""
+
+    def __init__(self, object_list: list, has_next: bool, has_previous: bool) -> None:
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def has_next(self) -> bool:
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self) -> bool:
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self) -> str:
+        return encode_cursor(self.object_list[-1]) if self.has_next() else ""
+
+    @property
+    def previous_cursor(self) -> str:
+        return encode_cursor(self.object_list[0]) if self.has_previous() else ""
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
 
 class AuditLogListView(LoginRequiredMixin, ListView):
     """List all audit log entries with filtering."""
@@ -14,24 +79,37 @@ class AuditLogListView(LoginRequiredMixin, ListView):
     template_name = "pages/audit/audit_log_list.html"
     context_object_name = "logs"
     paginate_by = 50
+    ordering = ("-created_at", "-id")
     required_roles = ("admin", "finance")
+    # Columns rendered by the list template; metadata, user agent and the
+    # search document are only needed on the detail page.
+    list_fields = (
+        "action",
+        "ip_address",
+        "created_at",
+        "actor__username",
+        "actor__email",
+        "actor__first_name",
+        "actor__last_name",
+    )
 
     def get_queryset(self):
-        queryset = super().get_queryset().select_related("actor")
+        queryset = super().get_queryset().select_related("actor").only(*self.list_fields)
 
         # Search by action or username
         query = self.request.GET.get("q")
         if query:
-            queryset = queryset.filter(
-                Q(action__icontains=query) |
-                Q(actor__username__icontains=query) |
-                Q(actor__email__icontains=query)
-            )
+            queryset = self.search(queryset, query)
 
         # Filter by action
-        action = self.request.GET.get("action")
+        action = self.request.GET.get("action", "").strip()
         if action:
-            queryset = queryset.filter(action__icontains=action)
+            if action in _ACTION_VALUES:
+                # A full action name (picked from the suggestions) is an
+                # equality seek on the (action, created_at) index
+                queryset = queryset.filter(action=action)
+            else:
+                queryset = queryset.filter(uaction__contains=action.upper())
 
         # Filter by user
         user_id = self.request.GET.get("user")
@@ -40,16 +118,65 @@ class AuditLogListView(LoginRequiredMixin, ListView):
 
         return queryset
 
+    def paginate_queryset(self, queryset, page_size):
+        """Seek to the requested page instead of OFFSET/COUNT.
+
+        ``?after=<cursor>`` returns the entries older than the cursor and
+        ``?before=<cursor>`` the entries newer than it; one extra row is
+        fetched to tell whether another page follows.
+        """
+        before = decode_cursor(self.request.GET.get("before", ""))
+        if before:
+            created_at, pk = before
+            rows = list(
+                queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                ).order_by("created_at", "id")[:page_size + 1]
+            )
+            page = KeysetPage(rows[:page_size][::-1], True, len(rows) > page_size)
+        else:
+            after = decode_cursor(self.request.GET.get("after", ""))
+            if after:
+                created_at, pk = after
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                )
+            rows = list(queryset[:page_size + 1])
+            page = KeysetPage(rows[:page_size], len(rows) > page_size, after is not None)
+        return (None, page, page.object_list, page.has_other_pages())
+
+    @staticmethod
+    def search(queryset, query: str):
+        """Match ``query`` against action, actor username and email.
+
+        PostgreSQL uses the GIN-indexed ``search_vector`` with web-search
+        syntax ("login -failed", quoted phrases); other backends fall back to
+        substring matching.
+        """
+        if connections[queryset.db].vendor == "postgresql":
+            return queryset.filter(
+                search_vector=SearchQuery(query, config="simple", search_type="websearch")
+            )
+        return queryset.filter(
+            Q(action__icontains=query) |
+            Q(actor__username__icontains=query) |
+            Q(actor__email__icontains=query)
+        )
+
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         context = super().get_context_data(**kwargs)
 
         # Get users for filtering
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
+        users = get_cached_user_choices()
+        # Keep the filtered user selectable even when not preloaded or inactive
+        selected = self.request.GET.get("user", "")
+        if selected.isdigit() and all(user["id"] != int(selected) for user in users):
+            users = users + user_choices(User.objects.filter(pk=selected))
 
         context.update({
-            "users": User.objects.filter(is_active=True).order_by("username"),
+            "users": users,
             "search_query": self.request.GET.get("q", ""),
+            "action_choices": AuditLogEntry.ActionType.choices,
         })
         return context
 
@@ -61,12 +188,29 @@ class AuditLogDetailView(LoginRequiredMixin, DetailView):
     template_name = "pages/audit/audit_log_detail.html"
     context_object_name = "log"
     required_roles = ("admin", "finance")
+    queryset = AuditLogEntry.objects.select_related("actor")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["breadcrumbs"] = [
-            {"label": "Audit Logs", "url": reverse("audit:list")},
-            {"label": "Logs", "url": reverse("audit:list")},
+            {"label": "Audit Logs", "url": _AUDIT_LIST_URL},
+            {"label": "Logs", "url": _AUDIT_LIST_URL},
             {"label": f"{self.object.action}"},
         ]
         return context
+
+
+class AuditUserAutocompleteView(LoginRequiredMixin, View):
+    """API endpoint for the audit log user filter (Select2 ``ajax`` format)."""
+    required_roles = ("admin", "finance")
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        term = request.GET.get("q", "").strip()
+        users = User.objects.filter(is_active=True).order_by("username")
+        if term:
+            users = users.filter(username__icontains=term)
+        results = [
+            {"id": pk, "text": username}
+            for pk, username in users.values_list("pk", "username")[:USER_AUTOCOMPLETE_LIMIT]
+        ]
+        return JsonResponse({"results": results})
@@ -14,5 +14,4 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         """Initialize the app."""
-        # Import signal handlers or other initialization code here if needed
-        pass
+        from . import signals  # noqa: F401
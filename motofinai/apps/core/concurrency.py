@@ -3,13 +3,23 @@ Concurrency control and optimistic locking for handling simultaneous modificatio
 Implements version-based concurrency control to prevent lost updates.
 """
 
+import operator
+from functools import reduce
 from typing import Optional, Type
 from decimal import Decimal
-from datetime import datetime
+from datetime import timedelta
 from django.db import models, transaction
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
 from .exceptions import ConcurrencyException
 
+_DECIMAL_ZERO = Decimal("0")
+# Payments above this multiple of the scheduled installment are flagged
+_PAYMENT_TOLERANCE = Decimal("1.1")
+
 
 class VersionedModel(models.Model):
     """
@@ -20,16 +30,20 @@ class VersionedModel(models.Model):
     version = models.PositiveIntegerField(
         default=1,
         help_text="Version number for optimistic locking",
-        db_index=True,
     )
     last_modified_at = models.DateTimeField(
         auto_now=True,
         help_text="Timestamp of last modification",
-        db_index=True,
     )
 
     class Meta:
         abstract = True
+        indexes = [
+            # RaceConditionDetector.detect_deadlocks: version >= N ORDER BY -version
+            models.Index(fields=["-version", "-last_modified_at"], name="%(class)s_ver_mod_idx"),
+            # RaceConditionDetector.detect_version_conflicts: recent rows with version > 1
+            models.Index(fields=["last_modified_at", "version"], name="%(class)s_mod_ver_idx"),
+        ]
 
     def increment_version(self):
         """Increment version number for next update."""
@@ -85,65 +99,59 @@ class ConsistencyChecker:
     Detects orphaned records, broken relationships, and invalid states.
     """
 
+    # Results are cached until a loan, schedule or payment changes (see
+    # core.signals); the date is part of the key because overdue counts
+    # move with it. The timeout bounds staleness from bulk writes, which
+    # send no signals.
+    CACHE_TIMEOUT = 300
+    SYSTEM_CACHE_KEY = "consistency:system"
+    # The system-wide check keeps only this many messages of each kind;
+    # the totals are reported separately
+    SAMPLE_SIZE = 20
+
+    @staticmethod
+    def _loan_cache_key(loan_id: int) -> str:
+        return f"consistency:loan:{loan_id}:{timezone.localdate().isoformat()}"
+
+    @staticmethod
+    def _system_cache_key() -> str:
+        return f"{ConsistencyChecker.SYSTEM_CACHE_KEY}:{timezone.localdate().isoformat()}"
+
+    @staticmethod
+    def invalidate(loan_id: Optional[int] = None) -> None:
+        """Forget cached results for ``loan_id`` and for the system-wide check."""
+        keys = [ConsistencyChecker._system_cache_key()]
+        if loan_id is not None:
+            keys.append(ConsistencyChecker._loan_cache_key(loan_id))
+        cache.delete_many(keys)
+
     @staticmethod
-    def check_loan_consistency(loan_id: int) -> dict:
+    def check_loan_consistency(loan_id: int, use_cache: bool = True) -> dict:
         """
         Check consistency of a loan and its related records.
         Returns dict with errors and warnings.
+
+        The loan and all of its totals (including the overdue count) are
+        read in a single query via :meth:`annotate_loan_totals`.
         """
         from motofinai.apps.loans.models import LoanApplication
-        from motofinai.apps.payments.models import Payment, PaymentSchedule
-        from motofinai.apps.inventory.models import Motor
-
-        issues = {"errors": [], "warnings": []}
-
-        try:
-            loan = LoanApplication.objects.select_related("applicant", "motor").get(id=loan_id)
-        except LoanApplication.DoesNotExist:
-            issues["errors"].append(f"Loan {loan_id} not found")
-            return issues
-
-        # Check if motor exists
-        if loan.motor_id and not Motor.objects.filter(id=loan.motor_id).exists():
-            issues["errors"].append(
-                f"Loan references non-existent motor (ID: {loan.motor_id})"
-            )
-
-        # Check if applicant exists
-        if not loan.applicant or not loan.applicant.is_active:
-            issues["warnings"].append("Loan applicant is inactive")
-
-        # Check payment schedule consistency
-        schedules = PaymentSchedule.objects.filter(loan=loan)
-        total_scheduled = schedules.aggregate(models.Sum("amount"))["amount__sum"] or Decimal("0")
-
-        if total_scheduled != loan.amount:
-            issues["errors"].append(
-                f"Payment schedule total ({total_scheduled}) does not match loan amount ({loan.amount})"
-            )
-
-        # Check payments
-        payments = Payment.objects.filter(loan=loan)
-        total_paid = payments.aggregate(models.Sum("amount"))["amount__sum"] or Decimal("0")
 
-        if loan.status == "completed" and total_paid < loan.amount:
-            issues["errors"].append(
-                f"Loan marked completed but not fully paid (paid: {total_paid}, owed: {loan.amount})"
-            )
+        cache_key = ConsistencyChecker._loan_cache_key(loan_id)
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-        if total_paid > loan.amount:
-            issues["errors"].append(
-                f"Total paid ({total_paid}) exceeds loan amount ({loan.amount})"
+        loan = ConsistencyChecker.annotate_loan_totals(
+            LoanApplication.objects.filter(id=loan_id).only(
+                "pk", "motor_id", "status", "principal_amount"
             )
+        ).first()
+        if loan is None:
+            return {"errors": [f"Loan {loan_id} not found"], "warnings": []}
 
-        # Check for late payments
-        overdue_schedules = schedules.filter(
-            due_date__lt=models.F("payment__paid_date"),
-            status="unpaid",
-        )
-        if overdue_schedules.exists():
-            issues["warnings"].append(f"{overdue_schedules.count()} payment(s) are overdue")
-
+        issues = ConsistencyChecker.loan_issues(loan)
+        cache.set(cache_key, issues, ConsistencyChecker.CACHE_TIMEOUT)
         return issues
 
     @staticmethod
@@ -155,25 +163,29 @@ class ConsistencyChecker:
         issues = {"errors": [], "warnings": []}
 
         try:
-            payment = Payment.objects.select_related("loan").get(id=payment_id)
+            payment = (
+                Payment.objects.select_related("schedule")
+                .annotate(loan_exists=Exists(LoanApplication.objects.filter(pk=OuterRef("loan_application_id"))))
+                .get(id=payment_id)
+            )
         except Payment.DoesNotExist:
             issues["errors"].append(f"Payment {payment_id} not found")
             return issues
 
         # Check if loan exists
-        if not LoanApplication.objects.filter(id=payment.loan_id).exists():
+        if not payment.loan_exists:
             issues["errors"].append(
-                f"Payment references non-existent loan (ID: {payment.loan_id})"
+                f"Payment references non-existent loan (ID: {payment.loan_application_id})"
             )
 
         # Check if payment date is in future
-        if payment.paid_date > datetime.now():
+        if payment.payment_date > timezone.localdate():
             issues["errors"].append("Payment date is in the future")
 
         # Check if payment amount matches scheduled amount
-        if hasattr(payment, "schedule") and payment.schedule:
-            scheduled = payment.schedule.amount
-            if payment.amount > scheduled * Decimal("1.1"):
+        if payment.schedule_id:
+            scheduled = payment.schedule.total_amount
+            if payment.amount > scheduled * _PAYMENT_TOLERANCE:
                 issues["warnings"].append(
                     f"Payment amount ({payment.amount}) exceeds scheduled amount ({scheduled}) by more than 10%"
                 )
@@ -182,80 +194,198 @@ class ConsistencyChecker:
 
     @staticmethod
     def check_inventory_consistency(motor_id: int) -> dict:
-        """Check consistency of inventory records."""
+        """
+        Check consistency of inventory records.
+
+        VIN uniqueness is enforced by the ``motor_vin_unique`` constraint,
+        so it is not re-checked here.
+        """
         from motofinai.apps.inventory.models import Motor
         from motofinai.apps.loans.models import LoanApplication
 
         issues = {"errors": [], "warnings": []}
 
         try:
-            motor = Motor.objects.get(id=motor_id)
+            motor = Motor.objects.only("id").get(id=motor_id)
         except Motor.DoesNotExist:
             issues["errors"].append(f"Motor {motor_id} not found")
             return issues
 
-        # Check if VIN is unique
-        duplicates = Motor.objects.filter(vin=motor.vin).exclude(id=motor.id)
-        if duplicates.exists():
-            issues["errors"].append(
-                f"VIN {motor.vin} is duplicated in {duplicates.count()} other record(s)"
-            )
-
         # Check if motor is assigned to multiple loans
-        active_loans = LoanApplication.objects.filter(
+        active_loan_count = LoanApplication.objects.filter(
             motor=motor,
             status__in=["pending", "approved", "active"],
+        ).count()
+        if active_loan_count > 1:
+            issues["errors"].append(
+                f"Motor is assigned to {active_loan_count} active loans"
+            )
+
+        return issues
+
+    @staticmethod
+    def annotate_loan_totals(queryset):
+        """
+        Annotate loans with the figures the consistency rules need.
+
+        Every total is a correlated subquery, so schedules and payments are
+        never joined together (which would multiply the sums) and a whole
+        table of loans is checked in a single query.
+        """
+        from motofinai.apps.loans.models import PaymentSchedule
+        from motofinai.apps.payments.models import Payment
+        from motofinai.apps.inventory.models import Motor
+
+        money = models.DecimalField(max_digits=14, decimal_places=2)
+        zero = models.Value(_DECIMAL_ZERO, output_field=money)
+
+        def per_loan(queryset, aggregate):
+            return Subquery(
+                queryset.filter(loan_application=OuterRef("pk"))
+                .order_by()
+                .values("loan_application")
+                .annotate(result=aggregate)
+                .values("result")
+            )
+
+        schedules = PaymentSchedule.objects.all()
+        overdue = schedules.filter(due_date__lt=timezone.localdate()).exclude(
+            status=PaymentSchedule.Status.PAID
+        )
+
+        return queryset.annotate(
+            schedule_count=Coalesce(per_loan(schedules, Count("pk")), 0),
+            total_scheduled=Coalesce(
+                per_loan(schedules, Sum("principal_amount")), zero, output_field=money
+            ),
+            total_payable=Coalesce(
+                per_loan(schedules, Sum("total_amount")), zero, output_field=money
+            ),
+            total_paid=Coalesce(
+                per_loan(Payment.objects.all(), Sum("amount")), zero, output_field=money
+            ),
+            overdue_count=Coalesce(per_loan(overdue, Count("pk")), 0),
+            motor_exists=Exists(Motor.objects.filter(pk=OuterRef("motor_id"))),
         )
-        if active_loans.count() > 1:
+
+    @staticmethod
+    def loan_issues(loan) -> dict:
+        """Apply the loan consistency rules to a loan from :meth:`annotate_loan_totals`."""
+        issues = {"errors": [], "warnings": []}
+
+        # Check if motor exists
+        if loan.motor_id and not loan.motor_exists:
             issues["errors"].append(
-                f"Motor is assigned to {active_loans.count()} active loans"
+                f"Loan references non-existent motor (ID: {loan.motor_id})"
             )
 
-        # Check if motor status is consistent
-        if motor.status == "active" and active_loans.count() == 0:
-            issues["warnings"].append("Motor marked active but not assigned to any active loan")
+        # Check payment schedule consistency
+        if loan.schedule_count and loan.total_scheduled != loan.principal_amount:
+            issues["errors"].append(
+                f"Payment schedule principal ({loan.total_scheduled}) does not match "
+                f"loan principal ({loan.principal_amount})"
+            )
+
+        # Check payments
+        if loan.status == "completed" and loan.total_paid < loan.total_payable:
+            issues["errors"].append(
+                f"Loan marked completed but not fully paid (paid: {loan.total_paid}, owed: {loan.total_payable})"
+            )
+
+        if loan.schedule_count and loan.total_paid > loan.total_payable:
+            issues["errors"].append(
+                f"Total paid ({loan.total_paid}) exceeds amount owed ({loan.total_payable})"
+            )
+
+        # Check for late payments
+        if loan.overdue_count:
+            issues["warnings"].append(f"{loan.overdue_count} payment(s) are overdue")
 
         return issues
 
     @staticmethod
-    def check_system_consistency() -> dict:
+    def loan_issue_conditions() -> dict:
+        """
+        SQL forms of the :meth:`loan_issues` rules, as ``Q`` objects over
+        :meth:`annotate_loan_totals`, so loans can be counted and sampled
+        in the database. Keep the two in step.
+        """
+        has_schedule = Q(schedule_count__gt=0)
+        return {
+            "errors": [
+                Q(motor_id__isnull=False, motor_exists=False),
+                has_schedule & ~Q(total_scheduled=F("principal_amount")),
+                Q(status="completed", total_paid__lt=F("total_payable")),
+                has_schedule & Q(total_paid__gt=F("total_payable")),
+            ],
+            "warnings": [Q(overdue_count__gt=0)],
+        }
+
+    @staticmethod
+    def check_system_consistency(use_cache: bool = True) -> dict:
         """
         Perform comprehensive system consistency check.
-        Returns dict with all issues found.
+
+        Returns a dict with the first ``SAMPLE_SIZE`` errors and warnings and
+        their totals in ``error_count`` and ``warning_count``. The totals are
+        counted in SQL and only the sampled loans are fetched, so the cost
+        stays flat however many loans are broken.
+
+        Repeat calls are served from the cache until a loan, schedule or
+        payment changes; pass ``use_cache=False`` to force a fresh scan.
         """
         from motofinai.apps.loans.models import LoanApplication
         from motofinai.apps.payments.models import Payment
-        from motofinai.apps.inventory.models import Motor
+
+        cache_key = ConsistencyChecker._system_cache_key()
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        sample_size = ConsistencyChecker.SAMPLE_SIZE
+        loans = ConsistencyChecker.annotate_loan_totals(
+            LoanApplication.objects.only("pk", "motor_id", "status", "principal_amount")
+        )
+        conditions = ConsistencyChecker.loan_issue_conditions()
+
+        # Totals in one aggregate: each rule a loan breaks counts once
+        def broken_rules(rules):
+            return reduce(
+                operator.add,
+                (Case(When(rule, then=Value(1)), default=Value(0)) for rule in rules),
+            )
 
         issues = {
+            **loans.aggregate(
+                error_count=Coalesce(Sum(broken_rules(conditions["errors"])), 0),
+                warning_count=Coalesce(Sum(broken_rules(conditions["warnings"])), 0),
+            ),
             "errors": [],
             "warnings": [],
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timezone.now().isoformat(),
         }
 
-        # Check all loans
-        for loan in LoanApplication.objects.all():
-            loan_issues = ConsistencyChecker.check_loan_consistency(loan.id)
-            issues["errors"].extend(loan_issues["errors"])
-            issues["warnings"].extend(loan_issues["warnings"])
+        # Every matching loan contributes at least one message, so the first
+        # SAMPLE_SIZE of them are enough to fill each sample
+        for kind, count_key in (("errors", "error_count"), ("warnings", "warning_count")):
+            if not issues[count_key]:
+                continue
+            sample = loans.filter(reduce(operator.or_, conditions[kind])).order_by("pk")
+            for loan in sample[:sample_size]:
+                issues[kind].extend(
+                    f"Loan {loan.pk}: {message}" for message in ConsistencyChecker.loan_issues(loan)[kind]
+                )
+            del issues[kind][sample_size:]
 
         # Check for orphaned payments
-        orphaned_payments = Payment.objects.filter(loan_application__isnull=True)
-        if orphaned_payments.exists():
-            issues["errors"].append(
-                f"Found {orphaned_payments.count()} orphaned payment(s) with no loan"
-            )
-
-        # Check for orphaned inventory
-        orphaned_motors = Motor.objects.filter(
-            purchase_order__isnull=True,
-            status__in=["active", "reserved"],
-        )
-        if orphaned_motors.exists():
-            issues["warnings"].append(
-                f"Found {orphaned_motors.count()} motor(s) without purchase order"
-            )
+        orphaned_payments = Payment.objects.filter(loan_application__isnull=True).count()
+        if orphaned_payments:
+            issues["error_count"] += 1
+            if len(issues["errors"]) < sample_size:
+                issues["errors"].append(f"Found {orphaned_payments} orphaned payment(s) with no loan")
 
+        cache.set(cache_key, issues, ConsistencyChecker.CACHE_TIMEOUT)
         return issues
 
 
@@ -292,33 +422,38 @@ class TransactionConsistency:
             return result
 
     @staticmethod
-    @transaction.atomic
     def safe_update_with_version(
         model_class: Type[VersionedModel],
         instance_id: int,
         current_version: int,
         update_fields: dict,
-    ):
+    ) -> int:
         """
         Safely update an object checking current version.
+
+        The version check, the write and the version bump are a single
+        ``UPDATE ... WHERE id = %s AND version = %s`` (compare-and-swap), so
+        no row lock or prior read is needed. Returns the new version.
         Raises ConcurrencyException if version doesn't match.
         """
-        obj = model_class.objects.select_for_update().get(id=instance_id)
+        updated = model_class.objects.filter(id=instance_id, version=current_version).update(
+            **update_fields,
+            version=models.F("version") + 1,
+            last_modified_at=timezone.now(),
+        )
 
-        if obj.version != current_version:
+        if not updated:
+            if not model_class.objects.filter(id=instance_id).exists():
+                raise ConcurrencyException(
+                    f"Object no longer exists",
+                    code="object_deleted",
+                )
             raise ConcurrencyException(
                 f"Object has been modified by another user",
                 code="version_mismatch",
             )
 
-        # Update fields
-        for field, value in update_fields.items():
-            setattr(obj, field, value)
-
-        obj.increment_version()
-        obj.save(update_fields=list(update_fields.keys()) + ["version"])
-
-        return obj
+        return current_version + 1
 
 
 class RaceConditionDetector:
@@ -333,26 +468,23 @@ class RaceConditionDetector:
         Detect objects that had multiple updates within a time window.
         Indicates potential concurrent modification attempts.
         """
-        from datetime import timedelta
-        from django.utils import timezone
-
         cutoff_time = timezone.now() - timedelta(hours=hours)
 
         conflicts = model_class.objects.filter(
             last_modified_at__gte=cutoff_time,
             version__gt=1,
-        ).order_by("-version")
+        ).order_by("-version").values_list("id", "version", "last_modified_at")
 
         return {
             "detected_at": timezone.now().isoformat(),
             "time_window_hours": hours,
             "high_version_objects": [
                 {
-                    "id": obj.id,
-                    "version": obj.version,
-                    "last_modified": obj.last_modified_at.isoformat(),
+                    "id": obj_id,
+                    "version": version,
+                    "last_modified": last_modified_at.isoformat(),
                 }
-                for obj in conflicts[:10]  # Return top 10
+                for obj_id, version, last_modified_at in conflicts[:10]  # Return top 10
             ],
         }
 
@@ -362,16 +494,18 @@ class RaceConditionDetector:
         Monitor for deadlock patterns (objects with very high version numbers).
         Indicates potential excessive concurrent modifications.
         """
-        high_version_objects = model_class.objects.filter(version__gte=10).order_by("-version")
+        high_version_objects = model_class.objects.filter(
+            version__gte=10
+        ).order_by("-version").values_list("id", "version", "last_modified_at")
 
         return {
-            "detected_at": datetime.now().isoformat(),
+            "detected_at": timezone.now().isoformat(),
             "objects_with_high_versions": [
                 {
-                    "id": obj.id,
-                    "version": obj.version,
-                    "last_modified": obj.last_modified_at.isoformat(),
+                    "id": obj_id,
+                    "version": version,
+                    "last_modified": last_modified_at.isoformat(),
                 }
-                for obj in high_version_objects[:20]
+                for obj_id, version, last_modified_at in high_version_objects[:20]
             ],
         }
@@ -0,0 +1,39 @@
+"""
+JSON encoder/decoder pair backed by orjson.
+Used by JSONFields that store large or non-ASCII payloads.
+"""
+
+import json
+from typing import Any
+
+import orjson
+from django.core.serializers.json import DjangoJSONEncoder
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+_django_default = DjangoJSONEncoder().default
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes, handling the same types as DjangoJSONEncoder."""
+    return orjson.dumps(obj, default=_django_default, option=_ORJSON_OPTIONS)
+
+
+loads = orjson.loads
+
+
+class OrjsonEncoder(DjangoJSONEncoder):
+    """Serialize with orjson, falling back to DjangoJSONEncoder for unsupported values."""
+
+    def encode(self, o: Any) -> str:
+        try:
+            return orjson.dumps(o, default=self.default, option=_ORJSON_OPTIONS).decode()
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits
+            return super().encode(o)
+
+
+class OrjsonDecoder(json.JSONDecoder):
+    """Deserialize with orjson."""
+
+    def decode(self, s: str, *args: Any) -> Any:
+        return orjson.loads(s)
@@ -7,27 +7,47 @@ from django.http import JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_http_methods
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field as dataclass_field
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ErrorDetail:
-    """Structured error detail with context information."""
+    """Structured error detail with context information.
+
+    Details are immutable, so their dict form is built once and shared by
+    every response/log that serializes them. ``context`` is copied on
+    creation so later changes to the caller's dict do not leak in.
+    """
     message: str
     code: str
     field: Optional[str] = None
     context: Optional[Dict[str, Any]] = None
+    _dict: Optional[Dict[str, Any]] = dataclass_field(default=None, init=False, repr=False, compare=False)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary representation."""
-        data = {
-            "message": self.message,
-            "code": self.code,
-        }
-        if self.field:
-            data["field"] = self.field
+    def __post_init__(self) -> None:
         if self.context:
-            data["context"] = self.context
+            object.__setattr__(self, "context", dict(self.context))
+
+    @property
+    def as_dict(self) -> Dict[str, Any]:
+        """Shared, memoized dictionary for serializers; must not be mutated.
+
+        Empty field/context are omitted. Use ``to_dict()`` for a copy.
+        """
+        if self._dict is None:
+            data = {"message": self.message, "code": self.code}
+            if self.field:
+                data["field"] = self.field
+            if self.context:
+                data["context"] = dict(self.context)
+            object.__setattr__(self, "_dict", data)
+        return self._dict
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary representation the caller may modify."""
+        data = dict(self.as_dict)
+        if "context" in data:
+            data["context"] = dict(data["context"])
         return data
 
 
@@ -37,7 +57,6 @@ class MotofinaiException(Exception):
     status_code = 500
     error_code = "internal_error"
     message = "An unexpected error occurred"
-    details: List[ErrorDetail] = []
 
     def __init__(
         self,
@@ -60,7 +79,7 @@ class MotofinaiException(Exception):
                 "code": self.error_code,
                 "message": self.message,
                 "status_code": self.status_code,
-                "details": [d.to_dict() for d in self.details],
+                "details": [d.as_dict for d in self.details],
             },
         }
 
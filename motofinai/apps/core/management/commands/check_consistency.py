@@ -5,8 +5,9 @@ Detects and reports data inconsistencies and integrity issues.
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import connection
+from django.db.models import Count, Exists, OuterRef
 from motofinai.apps.core.concurrency import ConsistencyChecker
-from motofinai.apps.loans.models import LoanApplication
+from motofinai.apps.loans.models import LoanApplication, PaymentSchedule
 from motofinai.apps.payments.models import Payment
 from motofinai.apps.inventory.models import Motor
 
@@ -99,93 +100,43 @@ class Command(BaseCommand):
 
     def check_loan(self, loan_id, verbose=False, fix=False):
         """Check specific loan consistency."""
-        self.stdout.write(f"\nChecking loan {loan_id}...")
-
-        try:
-            loan = LoanApplication.objects.get(id=loan_id)
-        except LoanApplication.DoesNotExist:
-            self.stdout.write(self.style.ERROR(f"Loan {loan_id} not found"))
-            return 1, 0
-
-        issues = ConsistencyChecker.check_loan_consistency(loan_id)
-
-        errors = len(issues["errors"])
-        warnings = len(issues["warnings"])
-
-        if issues["errors"]:
-            self.stdout.write(self.style.ERROR(f"  [ERROR] {errors} error(s) found:"))
-            for error in issues["errors"]:
-                self.stdout.write(f"    - {error}")
-
-        if issues["warnings"]:
-            self.stdout.write(self.style.WARNING(f"  [WARNING] {warnings} warning(s) found:"))
-            for warning in issues["warnings"]:
-                self.stdout.write(f"    - {warning}")
-
-        if not issues["errors"] and not issues["warnings"]:
-            self.stdout.write(self.style.SUCCESS("  [PASS] No issues found"))
-
-        return errors, warnings
+        return self._check_entity(
+            "loan", loan_id, ConsistencyChecker.check_loan_consistency
+        )
 
     def check_payment(self, payment_id, verbose=False, fix=False):
         """Check specific payment consistency."""
-        self.stdout.write(f"\nChecking payment {payment_id}...")
-
-        try:
-            payment = Payment.objects.get(id=payment_id)
-        except Payment.DoesNotExist:
-            self.stdout.write(self.style.ERROR(f"Payment {payment_id} not found"))
-            return 1, 0
-
-        issues = ConsistencyChecker.check_payment_consistency(payment_id)
-
-        errors = len(issues["errors"])
-        warnings = len(issues["warnings"])
-
-        if issues["errors"]:
-            self.stdout.write(self.style.ERROR(f"  [ERROR] {errors} error(s) found:"))
-            for error in issues["errors"]:
-                self.stdout.write(f"    - {error}")
-
-        if issues["warnings"]:
-            self.stdout.write(self.style.WARNING(f"  [WARNING] {warnings} warning(s) found:"))
-            for warning in issues["warnings"]:
-                self.stdout.write(f"    - {warning}")
-
-        if not issues["errors"] and not issues["warnings"]:
-            self.stdout.write(self.style.SUCCESS("  [PASS] No issues found"))
-
-        return errors, warnings
+        return self._check_entity(
+            "payment", payment_id, ConsistencyChecker.check_payment_consistency
+        )
 
     def check_motor(self, motor_id, verbose=False, fix=False):
         """Check specific motor consistency."""
-        self.stdout.write(f"\nChecking motor {motor_id}...")
-
-        try:
-            motor = Motor.objects.get(id=motor_id)
-        except Motor.DoesNotExist:
-            self.stdout.write(self.style.ERROR(f"Motor {motor_id} not found"))
-            return 1, 0
+        return self._check_entity(
+            "motor", motor_id, ConsistencyChecker.check_inventory_consistency
+        )
 
-        issues = ConsistencyChecker.check_inventory_consistency(motor_id)
+    def _check_entity(self, label, object_id, check):
+        """Run ``check`` for one record and report its issues."""
+        self.stdout.write(f"\nChecking {label} {object_id}...")
 
-        errors = len(issues["errors"])
-        warnings = len(issues["warnings"])
+        issues = check(object_id)
+        errors, warnings = issues["errors"], issues["warnings"]
 
-        if issues["errors"]:
-            self.stdout.write(self.style.ERROR(f"  [ERROR] {errors} error(s) found:"))
-            for error in issues["errors"]:
+        if errors:
+            self.stdout.write(self.style.ERROR(f"  [ERROR] {len(errors)} error(s) found:"))
+            for error in errors:
                 self.stdout.write(f"    - {error}")
 
-        if issues["warnings"]:
-            self.stdout.write(self.style.WARNING(f"  [WARNING] {warnings} warning(s) found:"))
-            for warning in issues["warnings"]:
+        if warnings:
+            self.stdout.write(self.style.WARNING(f"  [WARNING] {len(warnings)} warning(s) found:"))
+            for warning in warnings:
                 self.stdout.write(f"    - {warning}")
 
-        if not issues["errors"] and not issues["warnings"]:
+        if not errors and not warnings:
             self.stdout.write(self.style.SUCCESS("  [PASS] No issues found"))
 
-        return errors, warnings
+        return len(errors), len(warnings)
 
     def quick_check(self, verbose=False, fix=False):
         """Quick system check for critical issues."""
@@ -195,20 +146,19 @@ class Command(BaseCommand):
         total_warnings = 0
 
         # Check for orphaned payments
-        orphaned_payments = Payment.objects.filter(loan_application__isnull=True)
-        if orphaned_payments.exists():
-            count = orphaned_payments.count()
+        count = Payment.objects.filter(loan_application__isnull=True).count()
+        if count:
             self.stdout.write(
                 self.style.ERROR(f"  [ERROR] Found {count} orphaned payment(s)")
             )
             total_errors += count
 
-        # Check for loans without schedules
-        loans_without_schedules = LoanApplication.objects.filter(
-            status__in=["active", "approved"]
-        ).exclude(payment_schedules__isnull=False)
-        if loans_without_schedules.exists():
-            count = loans_without_schedules.count()
+        # Check for loans without schedules (NOT EXISTS anti-join)
+        count = LoanApplication.objects.filter(
+            ~Exists(PaymentSchedule.objects.filter(loan_application=OuterRef("pk"))),
+            status__in=["active", "approved"],
+        ).count()
+        if count:
             self.stdout.write(
                 self.style.WARNING(
                     f"  [WARNING] Found {count} loan(s) without payment schedules"
@@ -216,14 +166,16 @@ class Command(BaseCommand):
             )
             total_warnings += count
 
-        # Check for duplicate chassis numbers
-        from django.db.models import Count
-
-        duplicate_chassis = Motor.objects.values("chassis_number").annotate(
-            count=Count("id")
-        ).filter(count__gt=1, chassis_number__isnull=False)
-        if duplicate_chassis.exists():
-            count = duplicate_chassis.count()
+        # Check for duplicate chassis numbers (blank means not yet recorded);
+        # counting the grouped queryset counts the groups in SQL
+        count = (
+            Motor.objects.exclude(chassis_number="")
+            .values("chassis_number")
+            .annotate(count=Count("id"))
+            .filter(count__gt=1)
+            .count()
+        )
+        if count:
             self.stdout.write(
                 self.style.ERROR(f"  [ERROR] Found {count} duplicate chassis number(s)")
             )
@@ -240,29 +192,30 @@ class Command(BaseCommand):
 
         issues = ConsistencyChecker.check_system_consistency()
 
-        total_errors = len(issues["errors"])
-        total_warnings = len(issues["warnings"])
+        # The checker keeps only a sample of each list plus the totals
+        total_errors = issues["error_count"]
+        total_warnings = issues["warning_count"]
 
-        if issues["errors"]:
+        if total_errors:
             self.stdout.write(
                 self.style.ERROR(f"\n[ERROR] {total_errors} error(s) found:")
             )
-            for i, error in enumerate(issues["errors"][:20], 1):
+            for i, error in enumerate(issues["errors"], 1):
                 self.stdout.write(f"  {i}. {error}")
-            if len(issues["errors"]) > 20:
+            if total_errors > len(issues["errors"]):
                 self.stdout.write(
-                    f"  ... and {len(issues['errors']) - 20} more"
+                    f"  ... and {total_errors - len(issues['errors'])} more"
                 )
 
-        if issues["warnings"]:
+        if total_warnings:
             self.stdout.write(
                 self.style.WARNING(f"\n[WARNING] {total_warnings} warning(s) found:")
             )
-            for i, warning in enumerate(issues["warnings"][:20], 1):
+            for i, warning in enumerate(issues["warnings"], 1):
                 self.stdout.write(f"  {i}. {warning}")
-            if len(issues["warnings"]) > 20:
+            if total_warnings > len(issues["warnings"]):
                 self.stdout.write(
-                    f"  ... and {len(issues['warnings']) - 20} more"
+                    f"  ... and {total_warnings - len(issues['warnings'])} more"
                 )
 
         if total_errors == 0 and total_warnings == 0:
@@ -5,11 +5,16 @@ Converts application exceptions to consistent JSON/HTML responses.
 
 import logging
 import json
+import os
 import traceback
-from django.http import JsonResponse, HttpResponse
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import IntegrityError
-from django.template.response import TemplateResponse
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from .responses import OrjsonResponse
 from .exceptions import (
     MotofinaiException,
     ValidationException,
@@ -22,6 +27,20 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Status codes raised by the exception hierarchy and the handlers below
+ERROR_PAGE_STATUS_CODES = (400, 401, 403, 404, 409, 429, 500, 503)
+
+
+def load_error_templates() -> dict:
+    """Return the ``errors/<status>.html`` templates that exist, keyed by status code."""
+    templates = {}
+    for status_code in ERROR_PAGE_STATUS_CODES:
+        try:
+            templates[status_code] = get_template(f"errors/{status_code}.html")
+        except TemplateDoesNotExist:
+            pass
+    return templates
+
 
 class ExceptionHandlingMiddleware:
     """
@@ -29,16 +48,41 @@ class ExceptionHandlingMiddleware:
     Converts exceptions to appropriate HTTP responses (JSON or HTML).
     """
 
+    # Exception class -> handler method name, dispatched through the MRO
+    EXCEPTION_HANDLERS = {
+        MotofinaiException: "handle_motofinai_exception",
+        DjangoValidationError: "handle_django_validation_error",
+        IntegrityError: "handle_integrity_error",
+        PermissionError: "handle_permission_error",
+    }
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        # Under ASGI, run natively async instead of being adapted per request
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
+        # Settings are fixed for the life of the process; checked once here
+        self._is_development = self.is_development()
+        self._error_templates = load_error_templates()
 
     def __call__(self, request):
+        if self._is_async:
+            return self.__acall__(request)
         try:
-            response = self.get_response(request)
+            return self.get_response(request)
         except Exception as exc:
-            response = self.handle_exception(request, exc)
+            return self.handle_exception(request, exc)
 
-        return response
+    async def __acall__(self, request):
+        try:
+            return await self.get_response(request)
+        except Exception as exc:
+            # Handlers may touch the session-backed user; keep them off the event loop
+            return await sync_to_async(self.handle_exception)(request, exc)
 
     def handle_exception(self, request, exc):
         """Handle exception and return appropriate response."""
@@ -46,22 +90,18 @@ class ExceptionHandlingMiddleware:
         # Log the exception
         self.log_exception(request, exc)
 
-        # Handle specific exception types
-        if isinstance(exc, MotofinaiException):
-            return self.handle_motofinai_exception(request, exc)
-        elif isinstance(exc, DjangoValidationError):
-            return self.handle_django_validation_error(request, exc)
-        elif isinstance(exc, IntegrityError):
-            return self.handle_integrity_error(request, exc)
-        elif isinstance(exc, PermissionError):
-            return self.handle_permission_error(request, exc)
-        else:
-            return self.handle_unexpected_error(request, exc)
+        # Handle specific exception types: the first class in the MRO with
+        # a registered handler wins
+        for cls in type(exc).__mro__:
+            handler_name = self.EXCEPTION_HANDLERS.get(cls)
+            if handler_name is not None:
+                return getattr(self, handler_name)(request, exc)
+        return self.handle_unexpected_error(request, exc)
 
     def handle_motofinai_exception(self, request, exc: MotofinaiException):
         """Handle MotofinaiException and format response."""
         if self.is_api_request(request):
-            return JsonResponse(
+            return OrjsonResponse(
                 exc.to_response_dict(),
                 status=exc.status_code,
             )
@@ -81,7 +121,7 @@ class ExceptionHandlingMiddleware:
         message = str(exc)
 
         if self.is_api_request(request):
-            return JsonResponse(
+            return OrjsonResponse(
                 {
                     "success": False,
                     "error": {
@@ -102,10 +142,10 @@ class ExceptionHandlingMiddleware:
         message = "A record with these details already exists"
 
         # Log the detailed error
-        logger.warning(f"Integrity error: {str(exc)}")
+        logger.warning("Integrity error: %s", exc)
 
         if self.is_api_request(request):
-            return JsonResponse(
+            return OrjsonResponse(
                 {
                     "success": False,
                     "error": {
@@ -126,7 +166,7 @@ class ExceptionHandlingMiddleware:
         message = "You do not have permission to perform this action"
 
         if self.is_api_request(request):
-            return JsonResponse(
+            return OrjsonResponse(
                 {
                     "success": False,
                     "error": {
@@ -146,11 +186,10 @@ class ExceptionHandlingMiddleware:
         error_code = "internal_error"
         message = "An unexpected error occurred"
 
-        # Log the full exception details
-        logger.exception(f"Unexpected error: {str(exc)}", exc_info=exc)
+        # log_exception has already recorded the traceback
 
         # In development, include the error details
-        if self.is_development():
+        if self._is_development:
             message = f"{message}: {str(exc)}"
 
         if self.is_api_request(request):
@@ -162,9 +201,11 @@ class ExceptionHandlingMiddleware:
                     "status_code": status_code,
                 },
             }
-            if self.is_development():
-                response_data["error"]["details"] = traceback.format_exc()
-            return JsonResponse(response_data, status=status_code)
+            if self._is_development:
+                response_data["error"]["details"] = "".join(
+                    traceback.TracebackException.from_exception(exc).format()
+                )
+            return OrjsonResponse(response_data, status=status_code)
         else:
             return self.render_error_page(request, status_code, error_code, message)
 
@@ -182,63 +223,53 @@ class ExceptionHandlingMiddleware:
             "error_code": error_code,
             "message": message,
             "details": details or [],
-            "is_development": self.is_development(),
+            "is_development": self._is_development,
         }
 
-        # Try to render error template
-        try:
-            return TemplateResponse(
-                request,
-                f"errors/{status_code}.html",
-                context,
-                status=status_code,
-            )
-        except Exception:
-            # Fallback to basic error response
-            return HttpResponse(
-                f"<h1>Error {status_code}: {error_code}</h1><p>{message}</p>",
-                content_type="text/html",
-                status=status_code,
-            )
+        template = self._error_templates.get(status_code)
+        if template is not None:
+            try:
+                return HttpResponse(template.render(context, request), status=status_code)
+            except Exception:
+                logger.exception("Could not render error page for status %s", status_code)
+
+        # Fallback to basic error response
+        return HttpResponse(
+            f"<h1>Error {status_code}: {error_code}</h1><p>{message}</p>",
+            content_type="text/html",
+            status=status_code,
+        )
 
     def is_api_request(self, request) -> bool:
         """Check if request expects JSON response."""
-        # Check Accept header
-        accept = request.headers.get("Accept", "")
-        if "application/json" in accept:
-            return True
-
-        # Check if path looks like API endpoint
-        if request.path.startswith("/api/"):
-            return True
-
-        # Check content type
-        if "json" in accept:
-            return True
-
-        return False
+        # Several handlers may ask during one exception; decide once per request
+        is_api = getattr(request, "_is_api_request", None)
+        if is_api is None:
+            is_api = "json" in request.headers.get("Accept", "") or request.path.startswith("/api/")
+            request._is_api_request = is_api
+        return is_api
 
     def is_development(self) -> bool:
         """Check if running in development environment."""
-        import os
-        return os.environ.get("DJANGO_ENV") == "development" or (
-            __import__("django").conf.settings.DEBUG
-        )
+        return os.environ.get("DJANGO_ENV") == "development" or bool(settings.DEBUG)
 
     def log_exception(self, request, exc: Exception):
         """Log exception with request context."""
-        user = getattr(request, "user", None)
-        username = user.username if user and user.is_authenticated else "anonymous"
-
-        log_message = (
-            f"Exception in {request.method} {request.path} "
-            f"by {username}: {type(exc).__name__}: {str(exc)}"
+        expected = isinstance(exc, MotofinaiException)
+        level = logging.ERROR if not expected or exc.status_code >= 500 else logging.WARNING
+        if not logger.isEnabledFor(level):
+            return
+
+        # AnonymousUser has an empty username
+        username = getattr(getattr(request, "user", None), "username", "") or "anonymous"
+        logger.log(
+            level,
+            "Exception in %s %s by %s: %s: %s",
+            request.method,
+            request.path,
+            username,
+            type(exc).__name__,
+            exc,
+            # Unexpected exceptions carry their traceback
+            exc_info=None if expected else exc,
         )
-
-        if isinstance(exc, MotofinaiException):
-            if exc.status_code >= 500:
-                logger.error(log_message)
-            else:
-                logger.warning(log_message)
-        else:
-            logger.exception(log_message, exc_info=exc)
@@ -5,12 +5,26 @@ Provides consistent response structures for success and error cases.
 
 from typing import Dict, Any, List, Optional, Generic, TypeVar
 from dataclasses import dataclass, asdict
-from django.http import JsonResponse
+from django.http import HttpResponse
+from . import encoders
 from .exceptions import MotofinaiException, ErrorDetail
 
 T = TypeVar("T")
 
 
+class OrjsonResponse(HttpResponse):
+    """
+    JSON response serialized with orjson.
+
+    Drop-in for JsonResponse: compact output, and the same Decimal, date and
+    UUID handling as DjangoJSONEncoder through its fallback.
+    """
+
+    def __init__(self, data: Any, status: int = 200, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=encoders.dumps(data), status=status, **kwargs)
+
+
 @dataclass
 class SuccessResponse(Generic[T]):
     """Standard success response structure."""
@@ -82,16 +96,21 @@ class APIResponse:
         message: str = "Operation completed successfully",
         status_code: int = 200,
         meta: Optional[Dict[str, Any]] = None,
-    ) -> JsonResponse:
+    ) -> OrjsonResponse:
         """Create a success response."""
-        response = SuccessResponse(data=data, message=message, meta=meta)
-        return JsonResponse(response.to_dict(), status=status_code)
+        # Same shape as SuccessResponse.to_dict(), built without the dataclass
+        result = {"success": True, "message": message}
+        if data is not None:
+            result["data"] = data
+        if meta:
+            result["meta"] = meta
+        return OrjsonResponse(result, status=status_code)
 
     @staticmethod
     def created(
         data: Any = None,
         message: str = "Resource created successfully",
-    ) -> JsonResponse:
+    ) -> OrjsonResponse:
         """Create a 201 Created response."""
         return APIResponse.success(data=data, message=message, status_code=201)
 
@@ -101,10 +120,17 @@ class APIResponse:
         pagination: Dict[str, Any],
         message: str = "Data retrieved successfully",
         status_code: int = 200,
-    ) -> JsonResponse:
+    ) -> OrjsonResponse:
         """Create a paginated response."""
-        response = PaginatedResponse(data=data, pagination=pagination, message=message)
-        return JsonResponse(response.to_dict(), status=status_code)
+        return OrjsonResponse(
+            {
+                "success": True,
+                "message": message,
+                "data": data if data is not None else [],
+                "pagination": pagination or {},
+            },
+            status=status_code,
+        )
 
     @staticmethod
     def error(
@@ -112,7 +138,7 @@ class APIResponse:
         code: str = "error",
         status_code: int = 400,
         error_details: Optional[Dict[str, Any]] = None,
-    ) -> JsonResponse:
+    ) -> OrjsonResponse:
         """Create an error response."""
         error = {
             "code": code,
@@ -122,37 +148,33 @@ class APIResponse:
         if error_details:
             error["details"] = error_details
 
-        response = ErrorResponse(message=message, error=error)
-        return JsonResponse(response.to_dict(), status=status_code)
+        return OrjsonResponse(
+            {"success": False, "message": message, "error": error}, status=status_code
+        )
 
     @staticmethod
-    def exception(exc: MotofinaiException) -> JsonResponse:
+    def exception(exc: MotofinaiException) -> OrjsonResponse:
         """Create response from MotofinaiException."""
-        return JsonResponse(exc.to_response_dict(), status=exc.status_code)
+        return OrjsonResponse(exc.to_response_dict(), status=exc.status_code)
 
     @staticmethod
     def validation_error(
         errors: List[ErrorDetail] = None,
         message: str = "Validation failed",
-    ) -> JsonResponse:
+    ) -> OrjsonResponse:
         """Create a validation error response."""
-        error_list = []
-        if errors:
-            for error in errors:
-                error_list.append(error.to_dict())
-
         error_data = {
             "code": "validation_error",
             "message": message,
             "status_code": 400,
-            "details": error_list,
+            "details": [error.as_dict for error in errors or ()],
         }
-
-        response = ErrorResponse(message=message, error=error_data)
-        return JsonResponse(response.to_dict(), status=400)
+        return OrjsonResponse(
+            {"success": False, "message": message, "error": error_data}, status=400
+        )
 
     @staticmethod
-    def not_found(resource: str) -> JsonResponse:
+    def not_found(resource: str) -> OrjsonResponse:
         """Create a 404 Not Found response."""
         message = f"{resource} not found"
         return APIResponse.error(
@@ -162,7 +184,7 @@ class APIResponse:
         )
 
     @staticmethod
-    def unauthorized() -> JsonResponse:
+    def unauthorized() -> OrjsonResponse:
         """Create a 401 Unauthorized response."""
         return APIResponse.error(
             message="Authentication required",
@@ -171,7 +193,7 @@ class APIResponse:
         )
 
     @staticmethod
-    def forbidden() -> JsonResponse:
+    def forbidden() -> OrjsonResponse:
         """Create a 403 Forbidden response."""
         return APIResponse.error(
             message="You do not have permission to perform this action",
@@ -180,7 +202,7 @@ class APIResponse:
         )
 
     @staticmethod
-    def conflict(message: str) -> JsonResponse:
+    def conflict(message: str) -> OrjsonResponse:
         """Create a 409 Conflict response."""
         return APIResponse.error(
             message=message,
@@ -189,7 +211,7 @@ class APIResponse:
         )
 
     @staticmethod
-    def rate_limited() -> JsonResponse:
+    def rate_limited() -> OrjsonResponse:
         """Create a 429 Rate Limited response."""
         return APIResponse.error(
             message="Rate limit exceeded. Please try again later",
@@ -204,28 +226,19 @@ class FormResponseHelper:
     @staticmethod
     def form_errors(form) -> Dict[str, List[str]]:
         """Extract form errors into a dictionary."""
-        errors = {}
-        for field, error_list in form.errors.items():
-            errors[field] = list(error_list)
-        return errors
+        return {field: list(error_list) for field, error_list in form.errors.items()}
 
     @staticmethod
     def form_error_details(form) -> List[ErrorDetail]:
         """Convert form errors to ErrorDetail objects."""
-        details = []
-        for field, error_list in form.errors.items():
-            for error in error_list:
-                details.append(
-                    ErrorDetail(
-                        message=str(error),
-                        code="form_validation_error",
-                        field=field,
-                    )
-                )
-        return details
+        return [
+            ErrorDetail(message=str(error), code="form_validation_error", field=field)
+            for field, error_list in form.errors.items()
+            for error in error_list
+        ]
 
     @staticmethod
-    def validation_response(form, custom_message: str = None) -> JsonResponse:
+    def validation_response(form, custom_message: str = None) -> OrjsonResponse:
         """Create validation error response from form errors."""
         message = custom_message or "Form validation failed"
         errors = FormResponseHelper.form_error_details(form)
@@ -247,12 +260,16 @@ class AsyncResponseHelper:
     @staticmethod
     def async_job_status(job_id: str, status: str, progress: int = None) -> Dict[str, Any]:
         """Create status response for async job."""
-        response = {
+        return {
             "job_id": job_id,
             "status": status,
-            "progress": progress or 0,
+            "progress": 0 if progress is None else progress,
         }
-        return response
+
+    @staticmethod
+    def async_job_status_bytes(job_id: str, status: str, progress: int = 0) -> bytes:
+        """Serialized ``async_job_status`` payload, for writing straight to a stream."""
+        return encoders.dumps({"job_id": job_id, "status": status, "progress": progress})
 
 
 class BulkResponseHelper:
@@ -265,15 +282,21 @@ class BulkResponseHelper:
         errors: List[Dict[str, Any]] = None,
         message: str = "Bulk operation completed",
     ) -> Dict[str, Any]:
-        """Create response for bulk operations."""
+        """
+        Create response for bulk operations.
+
+        ``success_rate`` is a fraction between 0 and 1; formatting it as a
+        percentage is left to the client.
+        """
+        total = successful + failed
         return {
             "success": failed == 0,
             "message": message,
             "summary": {
-                "total": successful + failed,
+                "total": total,
                 "successful": successful,
                 "failed": failed,
-                "success_rate": f"{(successful / (successful + failed) * 100):.1f}%" if (successful + failed) > 0 else "0%",
+                "success_rate": round(successful / total, 4) if total else 0.0,
             },
             "errors": errors or [],
         }
@@ -0,0 +1,22 @@
+"""Drop cached consistency results when loans, schedules or payments change."""
+
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .concurrency import ConsistencyChecker
+
+
+@receiver(post_save, sender="loans.LoanApplication")
+@receiver(post_delete, sender="loans.LoanApplication")
+def invalidate_loan_consistency(sender, instance, **kwargs):
+    ConsistencyChecker.invalidate(instance.pk)
+
+
+@receiver(post_save, sender="loans.PaymentSchedule")
+@receiver(post_delete, sender="loans.PaymentSchedule")
+@receiver(post_save, sender="payments.Payment")
+@receiver(post_delete, sender="payments.Payment")
+def invalidate_related_consistency(sender, instance, **kwargs):
+    ConsistencyChecker.invalidate(instance.loan_application_id)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from motofinai.apps.core.concurrency import ConsistencyChecker
+from motofinai.apps.inventory.models import Motor
+from motofinai.apps.loans.models import FinancingTerm, LoanApplication, PaymentSchedule
+from motofinai.apps.payments.models import Payment
+from motofinai.apps.users.models import User
+
+
+class ConsistencyCheckerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="finance_user",
+            password="password123",
+            role=User.Roles.FINANCE,
+        )
+        self.term = FinancingTerm.objects.create(term_years=1, interest_rate=Decimal("12.00"))
+        self.loans = [self._create_loan(index) for index in range(3)]
+
+    def _create_loan(self, index: int) -> LoanApplication:
+        motor = Motor.objects.create(
+            type="Scooter",
+            brand="Yamaha",
+            model_name=f"Aerox {index}",
+            year=2024,
+            purchase_price=Decimal("60000.00"),
+        )
+        loan = LoanApplication.objects.create(
+            applicant_first_name="Alex",
+            applicant_last_name="Reyes",
+            applicant_email="alex@example.com",
+            applicant_phone="09171234567",
+            employment_status=LoanApplication.EmploymentStatus.EMPLOYED,
+            monthly_income=Decimal("55000.00"),
+            motor=motor,
+            financing_term=self.term,
+            loan_amount=motor.purchase_price,
+            down_payment=Decimal("0.00"),
+            principal_amount=motor.purchase_price,
+            interest_rate=self.term.interest_rate,
+            monthly_payment=Decimal("0.00"),
+            submitted_by=self.user,
+        )
+        loan.update_monthly_payment()
+        loan.save()
+        loan.generate_payment_schedule()
+        return loan
+
+    def test_consistent_loans_report_no_issues(self):
+        with self.assertNumQueries(2):
+            issues = ConsistencyChecker.check_system_consistency()
+        self.assertEqual((issues["error_count"], issues["warning_count"]), (0, 0))
+        self.assertEqual(issues["errors"], [])
+        self.assertEqual(issues["warnings"], [])
+
+    def test_system_check_reports_per_loan_issues(self):
+        broken = self.loans[1]
+        LoanApplication.objects.filter(pk=broken.pk).update(
+            principal_amount=Decimal("1.00"), status=LoanApplication.Status.COMPLETED
+        )
+        schedule = broken.payment_schedules.order_by("sequence").first()
+        schedule.due_date = timezone.localdate() - timedelta(days=5)
+        schedule.save(update_fields=["due_date"])
+        last = broken.payment_schedules.order_by("sequence").last()
+        Payment.objects.create(
+            loan_application=broken,
+            schedule=last,
+            amount=last.total_amount,
+            payment_date=timezone.localdate(),
+            recorded_by=self.user,
+        )
+
+        # Totals, one sample per kind and the orphaned payment count
+        with self.assertNumQueries(4):
+            issues = ConsistencyChecker.check_system_consistency()
+
+        self.assertEqual((issues["error_count"], issues["warning_count"]), (2, 1))
+        self.assertEqual(len(issues["errors"]), 2)
+        self.assertTrue(all(error.startswith(f"Loan {broken.pk}: ") for error in issues["errors"]))
+        self.assertEqual(issues["warnings"], [f"Loan {broken.pk}: 1 payment(s) are overdue"])
+
+    def test_system_check_keeps_a_sample_and_exact_totals(self):
+        PaymentSchedule.objects.filter(sequence=1).update(
+            due_date=timezone.localdate() - timedelta(days=5)
+        )
+
+        with mock.patch.object(ConsistencyChecker, "SAMPLE_SIZE", 2):
+            issues = ConsistencyChecker.check_system_consistency()
+            out = StringIO()
+            call_command("check_consistency", all=True, stdout=out)
+
+        self.assertEqual(issues["warning_count"], 3)
+        self.assertEqual(len(issues["warnings"]), 2)
+        self.assertEqual(issues["error_count"], 0)
+        self.assertIn("[WARNING] 3 warning(s) found:", out.getvalue())
+        self.assertIn("... and 1 more", out.getvalue())
+
+    def test_loan_check_uses_a_single_query(self):
+        loan = self.loans[0]
+        schedule = loan.payment_schedules.order_by("sequence").first()
+        schedule.due_date = timezone.localdate() - timedelta(days=5)
+        schedule.save(update_fields=["due_date"])
+
+        with self.assertNumQueries(1):
+            issues = ConsistencyChecker.check_loan_consistency(loan.pk)
+
+        self.assertEqual(issues, {"errors": [], "warnings": ["1 payment(s) are overdue"]})
+        self.assertEqual(
+            ConsistencyChecker.check_loan_consistency(0)["errors"], ["Loan 0 not found"]
+        )
+
+    def test_inventory_check_flags_motor_on_several_active_loans(self):
+        motor = self.loans[0].motor
+        LoanApplication.objects.filter(pk=self.loans[1].pk).update(motor=motor)
+
+        with self.assertNumQueries(2):
+            issues = ConsistencyChecker.check_inventory_consistency(motor.pk)
+
+        self.assertEqual(issues["errors"], ["Motor is assigned to 2 active loans"])
+
+    def test_payment_check_flags_future_dated_payment(self):
+        loan = self.loans[2]
+        schedule = loan.payment_schedules.order_by("sequence").first()
+        payment = Payment.objects.create(
+            loan_application=loan,
+            schedule=schedule,
+            amount=schedule.total_amount,
+            payment_date=timezone.localdate(),
+            recorded_by=self.user,
+        )
+        Payment.objects.filter(pk=payment.pk).update(payment_date=timezone.localdate() + timedelta(days=3))
+
+        with self.assertNumQueries(1):
+            issues = ConsistencyChecker.check_payment_consistency(payment.pk)
+
+        self.assertEqual(issues, {"errors": ["Payment date is in the future"], "warnings": []})
+
+    def test_results_are_cached_until_a_payment_changes(self):
+        loan = self.loans[0]
+        ConsistencyChecker.check_system_consistency()
+        ConsistencyChecker.check_loan_consistency(loan.pk)
+        with self.assertNumQueries(0):
+            ConsistencyChecker.check_system_consistency()
+            ConsistencyChecker.check_loan_consistency(loan.pk)
+
+        schedule = loan.payment_schedules.order_by("sequence").first()
+        schedule.due_date = timezone.localdate() - timedelta(days=1)
+        schedule.save(update_fields=["due_date"])
+
+        self.assertEqual(
+            ConsistencyChecker.check_loan_consistency(loan.pk)["warnings"], ["1 payment(s) are overdue"]
+        )
+        self.assertEqual(
+            ConsistencyChecker.check_system_consistency()["warnings"],
+            [f"Loan {loan.pk}: 1 payment(s) are overdue"],
+        )
+
+    def test_command_checks_single_loan_without_refetching_it(self):
+        out = StringIO()
+        with self.assertNumQueries(1):
+            call_command("check_consistency", loan=self.loans[0].pk, stdout=out)
+        self.assertIn("[PASS] No issues found", out.getvalue())
+
+        out = StringIO()
+        call_command("check_consistency", motor=999999, stdout=out)
+        self.assertIn("Motor 999999 not found", out.getvalue())
+
+        out = StringIO()
+        call_command("check_consistency", payment=999999, stdout=out)
+        self.assertIn("Checking payment 999999...", out.getvalue())
+        self.assertIn("[ERROR] 1 error(s) found:\n    - Payment 999999 not found", out.getvalue())
+
+    def test_quick_check_runs_one_query_per_check(self):
+        out = StringIO()
+        with self.assertNumQueries(3):
+            call_command("check_consistency", stdout=out)
+        self.assertIn("[PASS] Quick check passed", out.getvalue())
+
+    def test_quick_check_warns_about_active_loans_without_schedules(self):
+        loan = self.loans[0]
+        loan.payment_schedules.all().delete()
+        LoanApplication.objects.filter(pk=loan.pk).update(status=LoanApplication.Status.ACTIVE)
+
+        out = StringIO()
+        call_command("check_consistency", stdout=out)
+        self.assertIn("Found 1 loan(s) without payment schedules", out.getvalue())
@@ -0,0 +1,49 @@
+from django.test import SimpleTestCase
+
+from motofinai.apps.core.exceptions import ErrorDetail, LoanNotFound, MotofinaiException
+
+
+class MotofinaiExceptionTests(SimpleTestCase):
+    def test_details_are_not_shared_between_instances(self):
+        first = MotofinaiException()
+        first.details.append(ErrorDetail(message="Missing", code="required", field="amount"))
+
+        self.assertEqual(LoanNotFound().details, [])
+        self.assertFalse(hasattr(MotofinaiException, "details"))
+
+    def test_response_dict_includes_only_set_detail_fields(self):
+        exc = LoanNotFound(details=[ErrorDetail(message="Missing", code="required", field="loan")])
+        self.assertEqual(
+            exc.to_response_dict(),
+            {
+                "success": False,
+                "error": {
+                    "code": "loan_not_found",
+                    "message": "Loan not found",
+                    "status_code": 404,
+                    "details": [{"message": "Missing", "code": "required", "field": "loan"}],
+                },
+            },
+        )
+
+    def test_detail_dict_is_built_once(self):
+        detail = ErrorDetail(message="Missing", code="required")
+        self.assertIs(detail.as_dict, detail.as_dict)
+        self.assertEqual(detail.as_dict, {"message": "Missing", "code": "required"})
+
+    def test_to_dict_returns_a_copy(self):
+        detail = ErrorDetail(message="Missing", code="required", context={"max": 5})
+        data = detail.to_dict()
+        self.assertIsNot(data, detail.as_dict)
+        data["code"] = "changed"
+        data["context"]["max"] = 10
+        self.assertEqual(
+            detail.to_dict(), {"message": "Missing", "code": "required", "context": {"max": 5}}
+        )
+
+    def test_context_is_not_shared_with_the_caller(self):
+        context = {"max": 5}
+        detail = ErrorDetail(message="Too long", code="max_length", context=context)
+        context["max"] = 10
+        self.assertEqual(detail.as_dict["context"], {"max": 5})
+        self.assertEqual(detail.to_dict()["context"], {"max": 5})
@@ -0,0 +1,142 @@
+import json
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from motofinai.apps.core.exceptions import LoanNotFound
+from motofinai.apps.core.middleware import ExceptionHandlingMiddleware
+
+
+def _raise(request):
+    raise RuntimeError("boom")
+
+
+class ExceptionHandlingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/api/loans/", HTTP_ACCEPT="application/json")
+        self.request.user = None
+
+    @override_settings(DEBUG=False)
+    def test_production_hides_error_details(self):
+        with mock.patch.dict("os.environ", {"DJANGO_ENV": "production"}):
+            middleware = ExceptionHandlingMiddleware(_raise)
+
+        with self.assertLogs("motofinai.apps.core.middleware", "ERROR"):
+            response = middleware(self.request)
+
+        error = json.loads(response.content)["error"]
+        self.assertEqual(error["message"], "An unexpected error occurred")
+        self.assertNotIn("details", error)
+
+    @override_settings(DEBUG=True)
+    def test_development_flag_is_resolved_once_at_startup(self):
+        middleware = ExceptionHandlingMiddleware(_raise)
+
+        with override_settings(DEBUG=False), self.assertLogs("motofinai.apps.core.middleware", "ERROR"):
+            response = middleware(self.request)
+
+        error = json.loads(response.content)["error"]
+        self.assertEqual(error["message"], "An unexpected error occurred: boom")
+        self.assertTrue(error["details"].startswith("Traceback (most recent call last):"))
+        self.assertTrue(error["details"].endswith("RuntimeError: boom\n"))
+
+    def test_unexpected_error_is_logged_once(self):
+        middleware = ExceptionHandlingMiddleware(_raise)
+
+        with self.assertLogs("motofinai.apps.core.middleware", "ERROR") as logs:
+            middleware(self.request)
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIsNotNone(logs.records[0].exc_info)
+
+    def test_api_request_decision_is_memoized_on_the_request(self):
+        middleware = ExceptionHandlingMiddleware(_raise)
+        request = RequestFactory().get("/loans/", HTTP_ACCEPT="application/vnd.api+json")
+
+        self.assertTrue(middleware.is_api_request(request))
+        request.META["HTTP_ACCEPT"] = "text/html"
+        self.assertTrue(middleware.is_api_request(request))
+        self.assertFalse(middleware.is_api_request(RequestFactory().get("/loans/")))
+
+    def test_error_pages_use_preloaded_templates(self):
+        middleware = ExceptionHandlingMiddleware(_raise)
+        self.assertIn(404, middleware._error_templates)
+        self.assertNotIn(401, middleware._error_templates)
+        request = RequestFactory().get("/loans/")
+
+        response = middleware.render_error_page(request, 404, "not_found", "Loan not found")
+        self.assertEqual(response.status_code, 404)
+        self.assertIn(b"Loan not found", response.content)
+
+        response = middleware.render_error_page(request, 401, "unauthorized", "Sign in first")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.content, b"<h1>Error 401: unauthorized</h1><p>Sign in first</p>")
+
+    def test_log_message_names_request_and_user(self):
+        middleware = ExceptionHandlingMiddleware(_raise)
+        self.request.user = mock.Mock(is_authenticated=True, username="cashier")
+
+        with self.assertLogs("motofinai.apps.core.middleware", "ERROR") as logs:
+            middleware(self.request)
+
+        self.assertEqual(
+            logs.records[0].getMessage(), "Exception in GET /api/loans/ by cashier: RuntimeError: boom"
+        )
+
+    def test_exceptions_dispatch_to_the_closest_handler(self):
+        middleware = ExceptionHandlingMiddleware(_raise)
+        request = RequestFactory().get("/api/loans/", HTTP_ACCEPT="application/json")
+
+        with self.assertLogs("motofinai.apps.core.middleware", "WARNING"):
+            responses = {
+                "motofinai": middleware.handle_exception(request, LoanNotFound()),
+                "validation": middleware.handle_exception(request, ValidationError("Bad value")),
+                "integrity": middleware.handle_exception(request, IntegrityError("duplicate")),
+                "permission": middleware.handle_exception(request, PermissionError()),
+            }
+
+        self.assertEqual(
+            {name: response.status_code for name, response in responses.items()},
+            {"motofinai": 404, "validation": 400, "integrity": 400, "permission": 403},
+        )
+        self.assertEqual(
+            json.loads(responses["integrity"].content)["error"]["code"], "database_integrity_error"
+        )
+
+    async def test_async_chain_is_awaited_without_adapting(self):
+        async def raise_async(request):
+            raise LoanNotFound()
+
+        async def respond_async(request):
+            return HttpResponse("ok")
+
+        self.assertTrue(iscoroutinefunction(ExceptionHandlingMiddleware(respond_async)))
+        self.assertFalse(iscoroutinefunction(ExceptionHandlingMiddleware(_raise)))
+
+        response = await ExceptionHandlingMiddleware(respond_async)(self.request)
+        self.assertEqual(response.content, b"ok")
+
+        with self.assertLogs("motofinai.apps.core.middleware", "WARNING"):
+            response = await ExceptionHandlingMiddleware(raise_async)(self.request)
+        self.assertEqual(response.status_code, 404)
+
+    def test_logging_is_skipped_below_the_logger_level(self):
+        middleware = ExceptionHandlingMiddleware(_raise)
+        request = RequestFactory().get("/api/loans/")
+        request.user = AnonymousUser()
+
+        with self.assertLogs("motofinai.apps.core.middleware", "WARNING") as logs:
+            middleware.log_exception(request, LoanNotFound())
+        self.assertEqual(logs.records[0].levelname, "WARNING")
+        self.assertIn(" by anonymous: LoanNotFound", logs.records[0].getMessage())
+        self.assertIsNone(logs.records[0].exc_info)
+
+        with self.assertLogs("motofinai.apps.core.middleware", "ERROR") as logs:
+            middleware.log_exception(request, LoanNotFound())
+            middleware.log_exception(request, RuntimeError("boom"))
+        self.assertEqual([record.levelname for record in logs.records], ["ERROR"])
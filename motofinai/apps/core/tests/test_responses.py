@@ -0,0 +1,125 @@
+import json
+from decimal import Decimal
+
+from django import forms
+from django.test import SimpleTestCase
+
+from motofinai.apps.core.exceptions import ErrorDetail
+from motofinai.apps.core.responses import (
+    APIResponse,
+    AsyncResponseHelper,
+    BulkResponseHelper,
+    ErrorResponse,
+    FormResponseHelper,
+    PaginatedResponse,
+    SuccessResponse,
+)
+
+
+class APIResponseTests(SimpleTestCase):
+    def assertPayload(self, response, status, expected):
+        self.assertEqual(response.status_code, status)
+        self.assertEqual(json.loads(response.content), expected)
+
+    def test_success_matches_dataclass_shape(self):
+        self.assertPayload(APIResponse.success(), 200, SuccessResponse().to_dict())
+        self.assertPayload(
+            APIResponse.created(data={"id": 1}),
+            201,
+            SuccessResponse(data={"id": 1}, message="Resource created successfully").to_dict(),
+        )
+        self.assertPayload(
+            APIResponse.success(data=[], meta={"total": 0}),
+            200,
+            SuccessResponse(data=[], meta={"total": 0}).to_dict(),
+        )
+
+    def test_paginated_matches_dataclass_shape(self):
+        self.assertPayload(
+            APIResponse.paginated(data=[1, 2], pagination={"page": 1}),
+            200,
+            PaginatedResponse(data=[1, 2], pagination={"page": 1}).to_dict(),
+        )
+
+    def test_errors_match_dataclass_shape(self):
+        error = {"code": "not_found", "message": "Loan not found", "status_code": 404}
+        self.assertPayload(
+            APIResponse.not_found("Loan"),
+            404,
+            ErrorResponse(message="Loan not found", error=error).to_dict(),
+        )
+
+        detail = ErrorDetail(message="Required", code="required", field="amount")
+        response = APIResponse.validation_error(errors=[detail])
+        self.assertPayload(
+            response,
+            400,
+            {
+                "success": False,
+                "message": "Validation failed",
+                "error": {
+                    "code": "validation_error",
+                    "message": "Validation failed",
+                    "status_code": 400,
+                    "details": [detail.to_dict()],
+                },
+            },
+        )
+
+    def test_payload_is_compact_json(self):
+        response = APIResponse.success(data={"amount": Decimal("1500.50")})
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            response.content,
+            b'{"success":true,"message":"Operation completed successfully","data":{"amount":"1500.50"}}',
+        )
+
+
+class BulkResponseHelperTests(SimpleTestCase):
+    def test_success_rate_is_a_fraction(self):
+        summary = BulkResponseHelper.bulk_operation_response(successful=2, failed=1)["summary"]
+        self.assertEqual(summary["total"], 3)
+        self.assertEqual(summary["success_rate"], 0.6667)
+
+        summary = BulkResponseHelper.bulk_operation_response(successful=0, failed=0)["summary"]
+        self.assertEqual(summary["success_rate"], 0.0)
+
+
+class _PaymentForm(forms.Form):
+    amount = forms.DecimalField(min_value=1)
+    reference = forms.CharField()
+
+
+class FormResponseHelperTests(SimpleTestCase):
+    def test_form_errors_become_details_and_response(self):
+        form = _PaymentForm(data={"amount": "0"})
+        self.assertFalse(form.is_valid())
+
+        self.assertEqual(
+            FormResponseHelper.form_errors(form),
+            {
+                "amount": ["Ensure this value is greater than or equal to 1."],
+                "reference": ["This field is required."],
+            },
+        )
+        details = FormResponseHelper.form_error_details(form)
+        self.assertEqual([detail.field for detail in details], ["amount", "reference"])
+        self.assertEqual({detail.code for detail in details}, {"form_validation_error"})
+
+        payload = json.loads(FormResponseHelper.validation_response(form).content)
+        self.assertEqual(payload["message"], "Form validation failed")
+        self.assertEqual(payload["error"]["details"], [detail.as_dict for detail in details])
+
+
+class AsyncResponseHelperTests(SimpleTestCase):
+    def test_job_status_bytes_match_dict_form(self):
+        self.assertEqual(
+            json.loads(AsyncResponseHelper.async_job_status_bytes("job-1", "running", 40)),
+            AsyncResponseHelper.async_job_status("job-1", "running", 40),
+        )
+        self.assertEqual(
+            AsyncResponseHelper.async_job_status_bytes("job-1", "queued"),
+            b'{"job_id":"job-1","status":"queued","progress":0}',
+        )
+        self.assertEqual(AsyncResponseHelper.async_job_status("job-1", "queued")["progress"], 0)
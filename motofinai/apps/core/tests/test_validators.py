@@ -0,0 +1,142 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from motofinai.apps.core.validators import (
+    InventoryValidator,
+    LoanValidator,
+    PaymentValidator,
+    RiskValidator,
+    UserValidator,
+    ValidatorRegistry,
+)
+
+
+class UserValidatorTests(SimpleTestCase):
+    def test_email_format(self):
+        for email in ("alex@example.com", "alex.reyes+loans@mail.example.ph"):
+            with self.subTest(email=email):
+                self.assertTrue(UserValidator.validate_email(email))
+
+        for email in ("", None, "alex@", "@example.com", "alex@example", "alex reyes@example.com"):
+            with self.subTest(email=email):
+                result = UserValidator.validate_email(email)
+                self.assertFalse(result)
+                self.assertEqual(result.errors[0][1], "Invalid email format")
+
+    def test_email_length(self):
+        result = UserValidator.validate_email(f"{'a' * 250}@example.com")
+        self.assertEqual([error[1] for error in result.errors], ["Email address is too long"])
+
+    def test_password_character_classes(self):
+        result = UserValidator.validate_password("Motor2024!")
+        self.assertTrue(result)
+        self.assertEqual(result.warnings, ())
+
+        result = UserValidator.validate_password("motorcycle")
+        self.assertEqual(
+            [error[1] for error in result.errors],
+            [
+                "Password must contain at least one uppercase letter",
+                "Password must contain at least one digit",
+            ],
+        )
+        self.assertEqual(len(result.warnings), 1)
+
+
+class LoanValidatorTests(SimpleTestCase):
+    def test_status_transitions(self):
+        self.assertTrue(LoanValidator.validate_approval_status_change("pending", "approved"))
+        self.assertTrue(LoanValidator.validate_approval_status_change("defaulted", "recovered"))
+
+        result = LoanValidator.validate_approval_status_change("completed", "active")
+        self.assertEqual(result.errors[0][1], "Cannot transition from completed to active")
+
+        result = LoanValidator.validate_approval_status_change("archived", "active")
+        self.assertEqual(result.errors[0][1], "Unknown current status: archived")
+
+
+class MissingValueTests(SimpleTestCase):
+    def test_missing_values_stop_at_the_first_error(self):
+        cases = [
+            (LoanValidator.validate_loan_amount, (None, Decimal("1000"), Decimal("90000"))),
+            (LoanValidator.validate_interest_rate, (None,)),
+            (LoanValidator.validate_loan_term, (None,)),
+            (PaymentValidator.validate_payment_amount, (None, Decimal("2500"))),
+            (PaymentValidator.validate_payment_date, (None,)),
+            (InventoryValidator.validate_motor_quantity, (None, 3)),
+            (InventoryValidator.validate_purchase_price, (None,)),
+            (RiskValidator.validate_credit_score, (None,)),
+        ]
+        for validator, args in cases:
+            with self.subTest(validator=validator.__name__):
+                result = validator(*args)
+                self.assertFalse(result)
+                self.assertEqual(len(result.errors), 1)
+                self.assertEqual(result.warnings, ())
+
+
+class ValidationResultTests(SimpleTestCase):
+    def test_results_are_independent_and_slotted(self):
+        first = InventoryValidator.validate_motor_quantity(1)
+        second = InventoryValidator.validate_motor_quantity(1)
+        first.add_warning("quantity", "Check stock")
+
+        self.assertEqual(first.warnings, [("quantity", "Check stock")])
+        self.assertEqual(second.warnings, ())
+        self.assertEqual(second.errors, ())
+        self.assertTrue(first)
+        self.assertFalse(hasattr(first, "__dict__"))
+
+
+class ValidatorRegistryTests(SimpleTestCase):
+    def test_validators_are_exposed_as_attributes(self):
+        registry = ValidatorRegistry()
+
+        self.assertIs(registry.loan_amount, LoanValidator.validate_loan_amount)
+        self.assertFalse(registry.loan_amount(Decimal("0")))
+        self.assertFalse(registry.validate("loan.amount", Decimal("0")))
+
+        registry.register("loan.even", lambda value: value % 2 == 0)
+        self.assertTrue(registry.loan_even(4))
+        self.assertTrue(registry.validate("loan.even", 4))
+        with self.assertRaisesMessage(ValueError, "Unknown validator: loan.odd"):
+            registry.validate("loan.odd", 3)
+
+
+class InventoryValidatorTests(SimpleTestCase):
+    def test_vin_characters(self):
+        self.assertTrue(InventoryValidator.validate_vin_number("MH3-SE_881.0K"))
+
+        for vin in ("MH3 SE8810K", "MH3/SE8810K", "MH3SÉ8810K"):
+            with self.subTest(vin=vin):
+                result = InventoryValidator.validate_vin_number(vin)
+                self.assertEqual(
+                    [error[1] for error in result.errors], ["VIN number contains invalid characters"]
+                )
+
+        result = InventoryValidator.validate_vin_number("")
+        self.assertEqual([error[1] for error in result.errors], ["VIN number must be at least 5 characters"])
+
+    def test_repeated_vins_are_served_from_the_cache(self):
+        validate = InventoryValidator.validate_vin_number
+        validate.cache_clear()
+
+        first = validate("MH3 SE8810K")
+        first.errors[0][2]["vin"] = "changed"
+        first.add_warning("vin", "Checked by hand")
+        second = validate("MH3 SE8810K")
+
+        self.assertEqual(validate.cache_info().hits, 1)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.errors, [("vin", "VIN number contains invalid characters", {"vin": "MH3 SE8810K"})])
+        self.assertEqual(second.warnings, ())
+
+
+class PhoneValidatorTests(SimpleTestCase):
+    def test_formatting_is_ignored_when_counting_digits(self):
+        self.assertTrue(UserValidator.validate_phone("+63 (917) 123-4567"))
+        self.assertTrue(UserValidator.validate_phone("0917–123–4567"))
+
+        result = UserValidator.validate_phone("(02) 12-34")
+        self.assertEqual([error[1] for error in result.errors], ["Phone number must have at least 7 digits"])
@@ -3,12 +3,43 @@ Enterprise validation framework for business rule enforcement.
 Provides validators for loans, payments, inventory, and system-level validations.
 """
 
+import functools
+import re
+import string
 from decimal import Decimal
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
 from datetime import datetime, timedelta
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+# local@domain.tld, compiled once for every validate_email call
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+# Deletes every allowed VIN character, so whatever survives translate() is invalid
+_VIN_INVALID_CHARS = str.maketrans("", "", string.ascii_letters + string.digits + "-_.")
+
+# Phone formatting to strip (anything but ASCII digits)
+_NON_DIGITS_RE = re.compile(r"[^0-9]+")
+
+# Loan status -> statuses it may move to next
+_VALID_TRANSITIONS = {
+    "pending": frozenset({"approved", "rejected"}),
+    "approved": frozenset({"active", "rejected"}),
+    "active": frozenset({"completed", "defaulted"}),
+    "completed": frozenset(),
+    "rejected": frozenset(),
+    "defaulted": frozenset({"recovered"}),
+    "recovered": frozenset(),
+}
+
+# Distinct inputs remembered per memoized validator (VINs, e-mails, phones)
+VALIDATION_CACHE_SIZE = 4096
+
+# Character classes for validate_password
+_PASSWORD_UPPER = frozenset(string.ascii_uppercase)
+_PASSWORD_DIGITS = frozenset(string.digits)
+_PASSWORD_SPECIAL = frozenset("!@#$%^&*")
+
 
 class ValidationError(Exception):
     """Custom validation error with context."""
@@ -21,24 +52,59 @@ class ValidationError(Exception):
 
 class ValidationResult:
     """Result of validation with errors and warnings."""
+
+    __slots__ = ("errors", "warnings", "is_valid")
+
     def __init__(self):
-        self.errors: List[Tuple[str, str, Dict]] = []  # (field, message, context)
-        self.warnings: List[Tuple[str, str]] = []  # (field, message)
+        # Share the empty tuple until something is recorded; most results stay clean
+        self.errors: Sequence[Tuple[str, str, Dict]] = ()  # (field, message, context)
+        self.warnings: Sequence[Tuple[str, str]] = ()  # (field, message)
         self.is_valid = True
 
     def add_error(self, field: str, message: str, context: Dict = None):
         """Add validation error."""
+        if not self.errors:
+            self.errors = []
         self.errors.append((field, message, context or {}))
         self.is_valid = False
 
     def add_warning(self, field: str, message: str):
         """Add validation warning."""
+        if not self.warnings:
+            self.warnings = []
         self.warnings.append((field, message))
 
     def __bool__(self) -> bool:
         return self.is_valid
 
 
+def _memoize_result(validator: Callable[[Any], "ValidationResult"]) -> Callable[[Any], "ValidationResult"]:
+    """Cache a single-argument validator's messages and rebuild a fresh result per call.
+
+    Only the frozen messages are cached, so callers may still add to the
+    result they get back. Use for pure validators over values that repeat
+    across imports; never for secrets, which would be retained in memory.
+    """
+    @functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+    def messages(value):
+        result = validator(value)
+        return tuple(result.errors), tuple(result.warnings)
+
+    @functools.wraps(validator)
+    def wrapper(value) -> ValidationResult:
+        errors, warnings = messages(value)
+        result = ValidationResult()
+        for field, message, context in errors:
+            result.add_error(field, message, dict(context))
+        for field, message in warnings:
+            result.add_warning(field, message)
+        return result
+
+    wrapper.cache_info = messages.cache_info
+    wrapper.cache_clear = messages.cache_clear
+    return wrapper
+
+
 class LoanValidator:
     """Validators for loan applications and terms."""
 
@@ -49,6 +115,7 @@ class LoanValidator:
 
         if amount is None or amount <= 0:
             result.add_error("amount", "Loan amount must be greater than zero", {"amount": amount})
+            return result
 
         if min_amount and amount < min_amount:
             result.add_error("amount", f"Loan amount cannot be less than {min_amount}", {"min": min_amount, "actual": amount})
@@ -65,6 +132,7 @@ class LoanValidator:
 
         if rate is None or rate < 0:
             result.add_error("rate", "Interest rate must be non-negative", {"rate": rate})
+            return result
 
         if rate > 100:
             result.add_warning("rate", "Interest rate exceeds 100% - please review")
@@ -78,6 +146,7 @@ class LoanValidator:
 
         if months is None or months <= 0:
             result.add_error("term", "Loan term must be greater than zero months", {"months": months})
+            return result
 
         if months > 360:  # 30 years
             result.add_warning("term", "Loan term exceeds 30 years - please review")
@@ -92,22 +161,12 @@ class LoanValidator:
         """Validate loan status transition."""
         result = ValidationResult()
 
-        # Define valid transitions
-        valid_transitions = {
-            "pending": ["approved", "rejected"],
-            "approved": ["active", "rejected"],
-            "active": ["completed", "defaulted"],
-            "completed": [],
-            "rejected": [],
-            "defaulted": ["recovered"],
-            "recovered": [],
-        }
-
-        if current_status not in valid_transitions:
+        allowed = _VALID_TRANSITIONS.get(current_status)
+        if allowed is None:
             result.add_error("status", f"Unknown current status: {current_status}", {"status": current_status})
             return result
 
-        if new_status not in valid_transitions.get(current_status, []):
+        if new_status not in allowed:
             result.add_error("status", f"Cannot transition from {current_status} to {new_status}",
                            {"current": current_status, "new": new_status})
 
@@ -124,6 +183,7 @@ class PaymentValidator:
 
         if amount is None or amount <= 0:
             result.add_error("amount", "Payment amount must be greater than zero", {"amount": amount})
+            return result
 
         if scheduled_amount:
             if amount > scheduled_amount * Decimal('1.1'):  # Allow 10% overpayment
@@ -144,6 +204,7 @@ class PaymentValidator:
 
         if payment_date is None:
             result.add_error("date", "Payment date is required", {})
+            return result
 
         if payment_date > timezone.now():
             result.add_error("date", "Payment date cannot be in the future", {"date": payment_date})
@@ -172,6 +233,7 @@ class InventoryValidator:
     """Validators for inventory operations."""
 
     @staticmethod
+    @_memoize_result
     def validate_vin_number(vin: str) -> ValidationResult:
         """Validate VIN number format."""
         result = ValidationResult()
@@ -179,11 +241,14 @@ class InventoryValidator:
         if not vin or len(vin) < 5:
             result.add_error("vin", "VIN number must be at least 5 characters", {"vin": vin})
 
+        if not vin:
+            return result
+
         if len(vin) > 100:
             result.add_error("vin", "VIN number cannot exceed 100 characters", {"vin": vin})
 
         # Check for special characters
-        if not all(c.isalnum() or c in ['-', '_', '.'] for c in vin):
+        if vin.translate(_VIN_INVALID_CHARS):
             result.add_error("vin", "VIN number contains invalid characters", {"vin": vin})
 
         return result
@@ -195,6 +260,7 @@ class InventoryValidator:
 
         if quantity is None or quantity < 1:
             result.add_error("quantity", "Quantity must be at least 1", {"quantity": quantity})
+            return result
 
         if available is not None and quantity > available:
             result.add_error("quantity",
@@ -210,6 +276,7 @@ class InventoryValidator:
 
         if price is None or price <= 0:
             result.add_error("price", "Purchase price must be greater than zero", {"price": price})
+            return result
 
         if price > Decimal('999999.99'):
             result.add_warning("price", "Purchase price seems unusually high - please review", {})
@@ -221,19 +288,21 @@ class UserValidator:
     """Validators for user-related operations."""
 
     @staticmethod
+    @_memoize_result
     def validate_email(email: str) -> ValidationResult:
         """Validate email format."""
         result = ValidationResult()
 
-        if not email or '@' not in email:
+        if not email or not _EMAIL_RE.fullmatch(email):
             result.add_error("email", "Invalid email format", {"email": email})
 
-        if len(email) > 254:
+        if email and len(email) > 254:
             result.add_error("email", "Email address is too long", {"email": email})
 
         return result
 
     @staticmethod
+    @_memoize_result
     def validate_phone(phone: str) -> ValidationResult:
         """Validate phone number."""
         result = ValidationResult()
@@ -243,7 +312,7 @@ class UserValidator:
             return result
 
         # Remove common formatting characters
-        clean_phone = ''.join(c for c in phone if c.isdigit())
+        clean_phone = _NON_DIGITS_RE.sub("", phone)
 
         if len(clean_phone) < 7:
             result.add_error("phone", "Phone number must have at least 7 digits", {"phone": phone})
@@ -261,13 +330,16 @@ class UserValidator:
         if len(password) < 8:
             result.add_error("password", "Password must be at least 8 characters", {})
 
-        if not any(c.isupper() for c in password):
+        # One pass to collect the characters; the class checks run in C
+        chars = set(password)
+
+        if _PASSWORD_UPPER.isdisjoint(chars):
             result.add_error("password", "Password must contain at least one uppercase letter", {})
 
-        if not any(c.isdigit() for c in password):
+        if _PASSWORD_DIGITS.isdisjoint(chars):
             result.add_error("password", "Password must contain at least one digit", {})
 
-        if not any(c in '!@#$%^&*' for c in password):
+        if _PASSWORD_SPECIAL.isdisjoint(chars):
             result.add_warning("password", "Password should contain special characters for better security")
 
         return result
@@ -293,6 +365,7 @@ class RiskValidator:
 
         if score is None or score < 0:
             result.add_error("score", "Credit score must be non-negative", {"score": score})
+            return result
 
         if score < 300:
             result.add_warning("score", "Credit score below 300 indicates poor credit history")
@@ -333,17 +406,25 @@ class ValidatorRegistry:
             "risk.score": RiskValidator.validate_risk_score,
             "risk.credit_score": RiskValidator.validate_credit_score,
         }
+        for key, validator in self.validators.items():
+            self._expose(key, validator)
+
+    def _expose(self, key: str, validator: Callable):
+        """Make ``key`` callable as an attribute, e.g. ``registry.loan_amount(...)``."""
+        setattr(self, key.replace(".", "_"), validator)
 
     def validate(self, validator_key: str, *args, **kwargs) -> ValidationResult:
-        """Execute validator by key."""
-        if validator_key not in self.validators:
+        """Execute validator by key (callers with a fixed key can use its attribute instead)."""
+        validator = self.validators.get(validator_key)
+        if validator is None:
             raise ValueError(f"Unknown validator: {validator_key}")
 
-        return self.validators[validator_key](*args, **kwargs)
+        return validator(*args, **kwargs)
 
     def register(self, key: str, validator: Callable):
         """Register custom validator."""
         self.validators[key] = validator
+        self._expose(key, validator)
 
     def get_validator(self, key: str) -> Optional[Callable]:
         """Get validator by key."""
@@ -0,0 +1,138 @@
+"""
+Background Excel exports
+
+Posting to an export endpoint queues the report on a small in-process thread
+pool instead of holding the request open. The job state lives in an
+``ExportJob`` row, so any worker process can answer status polls; the
+finished workbook is saved to the default storage and served by the download
+view to the user who requested it.
+
+Storage must be shared by all workers (the default ``MEDIA_ROOT`` is, on a
+single host). A job whose worker died before finishing, e.g. across a
+restart, stops being updated and is marked failed once it goes stale.
+
+Workbooks hold applicant details, so jobs expire after
+``EXPORT_JOB_TIMEOUT``: their download answers 410 and the next purge (run on
+every new export and by ``purge_export_jobs``) deletes the file and the row.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import connection, connections
+from django.utils import timezone
+
+from .models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+# Exports are heavy; at most this many run at once per process, the rest queue
+EXPORT_MAX_WORKERS = 2
+# How long a job (and so its file and download link) is kept
+EXPORT_JOB_TIMEOUT = 60 * 60 * 24
+# A queued or running job not updated for this long has lost its worker
+EXPORT_STALE_AFTER = 60 * 30
+EXPORT_STORAGE_DIR = 'exports'
+
+_executor = ThreadPoolExecutor(max_workers=EXPORT_MAX_WORKERS, thread_name_prefix='report-export')
+
+
+def _update_job(job_id, **fields):
+    # QuerySet.update() skips auto_now, so keep updated_at current by hand
+    ExportJob.objects.filter(pk=job_id).update(updated_at=timezone.now(), **fields)
+
+
+def _stale_cutoff():
+    return timezone.now() - timedelta(seconds=EXPORT_STALE_AFTER)
+
+
+def _expiry_cutoff():
+    return timezone.now() - timedelta(seconds=EXPORT_JOB_TIMEOUT)
+
+
+def fail_stale_export_jobs():
+    """Mark queued or running jobs that have stopped being updated as failed"""
+    return ExportJob.objects.filter(
+        status__in=ExportJob.ACTIVE_STATUSES, updated_at__lt=_stale_cutoff()
+    ).update(status=ExportJob.Status.FAILED, updated_at=timezone.now())
+
+
+def purge_expired_export_jobs():
+    """Delete expired jobs and their files; return how many were removed"""
+    expired = ExportJob.objects.filter(created_at__lt=_expiry_cutoff())
+    purged = 0
+    for job_id, path in expired.values_list('pk', 'path'):
+        if path:
+            try:
+                default_storage.delete(path)
+            except OSError:
+                logger.exception("Could not delete export file %s", path)
+                continue
+        purged += ExportJob.objects.filter(pk=job_id).delete()[0]
+    return purged
+
+
+def is_expired(job):
+    return job.created_at < _expiry_cutoff()
+
+
+def get_export_job(job_id):
+    """Return an export job, or ``None`` if it is unknown"""
+    try:
+        job = ExportJob.objects.get(pk=job_id)
+    except (ExportJob.DoesNotExist, ValidationError):
+        return None
+    if job.status in ExportJob.ACTIVE_STATUSES and job.updated_at < _stale_cutoff():
+        # Its worker is gone; only this job is checked, not the whole table
+        ExportJob.objects.filter(
+            pk=job.pk, status=job.status, updated_at=job.updated_at
+        ).update(status=ExportJob.Status.FAILED, updated_at=timezone.now())
+        job.status = ExportJob.Status.FAILED
+    return job
+
+
+def run_export(job_id, report):
+    """Generate ``report`` and save it to storage, recording progress on the job"""
+    _update_job(job_id, status=ExportJob.Status.RUNNING)
+    try:
+        response = report.generate_excel()
+        try:
+            filename = response.filename
+            path = default_storage.save(
+                f'{EXPORT_STORAGE_DIR}/{job_id}/{filename}', File(response.file_to_stream)
+            )
+        finally:
+            response.close()
+    except Exception:
+        logger.exception("Export job %s (%s) failed", job_id, report.__name__)
+        _update_job(job_id, status=ExportJob.Status.FAILED)
+    else:
+        _update_job(job_id, status=ExportJob.Status.COMPLETED, path=path, filename=filename)
+
+
+def _run_export_in_worker(job_id, report):
+    try:
+        run_export(job_id, report)
+    finally:
+        # Worker threads open their own connections; don't leak them
+        connections.close_all()
+
+
+def start_export(report, user):
+    """
+    Queue ``report.generate_excel()`` for ``user`` and return the job id.
+
+    Inside a transaction the export runs straight away instead, since a
+    worker's connection cannot see its uncommitted rows.
+    """
+    purge_expired_export_jobs()
+    job = ExportJob.objects.create(user=user, report=report.__name__)
+    job_id = str(job.pk)
+    if connection.in_atomic_block:
+        run_export(job_id, report)
+    else:
+        _executor.submit(_run_export_in_worker, job_id, report)
+    return job_id
@@ -1,36 +1,177 @@
 """
 KPI calculation utilities for Admin and Finance dashboards
 """
-from datetime import datetime, timedelta
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from django.db.models import Count, Sum, Q, Avg
+from django.core.cache import cache
+from django.db import connection, connections
+from django.db.models import Avg, Case, CharField, Count, Exists, OuterRef, Q, Sum, Value, When
 from django.utils import timezone
 from django.apps import apps
 
+from . import metrics
+
+# KPIs are shared across dashboard sessions for this long; writes to the
+# models they read bump the generation (see dashboard.signals) so the
+# next render recomputes
+KPI_CACHE_TIMEOUT = 60
+KPI_GENERATION_KEY = 'kpi:generation'
+
+
+def _kpi_cache_arg(value):
+    # The only date argument is the payment KPI month
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y-%m')
+    return str(value)
+
+
+def cached_kpi(func):
+    """Cache a KPI calculation for KPI_CACHE_TIMEOUT seconds, keyed on its arguments"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        generation = cache.get_or_set(KPI_GENERATION_KEY, 0, None)
+        arguments = [_kpi_cache_arg(arg) for arg in args] + [
+            f'{name}={_kpi_cache_arg(value)}' for name, value in sorted(kwargs.items())
+        ]
+        key = f"kpi:{generation}:{func.__name__}:{':'.join(arguments)}"
+        return cache.get_or_set(key, lambda: func(*args, **kwargs), KPI_CACHE_TIMEOUT)
+
+    return wrapper
+
+
+# Zeroed buckets for the grouped KPI counts; copied per calculation
+RISK_LEVEL_BUCKETS = {'LOW': 0, 'MEDIUM': 0, 'HIGH': 0}
+REPOSSESSION_STATUS_BUCKETS = {
+    'WARNING': 0,
+    'ACTIVE': 0,
+    'REMINDER': 0,
+    'RECOVERED': 0,
+    'CLOSED': 0,
+}
+INVENTORY_STATUS_BUCKETS = {'available': 0, 'reserved': 0, 'sold': 0, 'repossessed': 0}
+
+# Audit actions counted as logins (the auth signal and the ActionType choice)
+LOGIN_ACTIONS = frozenset({'auth.login', 'login'})
+
+# Columns the recent-activity widgets render (plus what actor_display needs);
+# skips metadata, user agent and the search vector
+RECENT_ACTIVITY_FIELDS = (
+    'action',
+    'description',
+    'created_at',
+    'actor__username',
+    'actor__email',
+    'actor__first_name',
+    'actor__last_name',
+)
+
+@functools.lru_cache(maxsize=None)
+def _model(app_label, model_name):
+    """Resolve a model once per process; the app registry is fixed after startup"""
+    return apps.get_model(app_label, model_name)
+
+
+def motor_status_expression():
+    """``Motor.status`` as a SQL expression over an outer Motor queryset"""
+    LoanApplication = _model('loans', 'LoanApplication')
+    RepossessionCase = _model('repossession', 'RepossessionCase')
+
+    # Same precedence as Motor.status
+    motor_loans = LoanApplication.objects.filter(motor=OuterRef('pk'))
+    return Case(
+        When(
+            Exists(RepossessionCase.objects.filter(loan_application__motor=OuterRef('pk'))),
+            then=Value('repossessed'),
+        ),
+        When(Exists(motor_loans.filter(status__in=['active', 'completed'])), then=Value('sold')),
+        When(Exists(motor_loans.filter(status__in=['pending', 'approved'])), then=Value('reserved')),
+        default=Value('available'),
+        output_field=CharField(),
+    )
+
+
+@functools.lru_cache(maxsize=24)
+def month_window(year, month):
+    """Return the ``[start, end)`` dates of a calendar month"""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def percentage(part, whole):
+    """Return ``part`` as a percentage of ``whole`` for display (float, 2 places)"""
+    return round(float(part) / float(whole) * 100, 2) if whole > 0 else 0.0
+
+
+# Upper bound on worker threads (and so extra DB connections) per dashboard
+KPI_MAX_WORKERS = 4
+
+
+def _run_kpi_in_worker(func):
+    try:
+        return func()
+    finally:
+        # Worker threads open their own connections; don't leak them
+        connections.close_all()
+
+
+def gather_kpis(tasks):
+    """
+    Run independent KPI calculations concurrently and return their results
+    under the same keys.
+
+    Inside a transaction the calculations run serially instead, since the
+    workers' connections cannot see its uncommitted rows.
+    """
+    if len(tasks) < 2 or connection.in_atomic_block:
+        return {key: func() for key, func in tasks.items()}
+    with ThreadPoolExecutor(max_workers=min(KPI_MAX_WORKERS, len(tasks))) as executor:
+        futures = {key: executor.submit(_run_kpi_in_worker, func) for key, func in tasks.items()}
+        return {key: future.result() for key, future in futures.items()}
+
 
 class DashboardKPI:
     """Base class for KPI calculations"""
 
     @staticmethod
+    def invalidate():
+        """Drop every cached KPI by moving to a new cache generation"""
+        try:
+            cache.incr(KPI_GENERATION_KEY)
+        except ValueError:
+            cache.set(KPI_GENERATION_KEY, 1, None)
+
+    @staticmethod
+    @cached_kpi
     def get_loan_kpis():
         """Calculate loan-related KPIs"""
-        LoanApplication = apps.get_model('loans', 'LoanApplication')
+        LoanApplication = _model('loans', 'LoanApplication')
+
+        # Per-status counters kept by dashboard.signals; every figure below is derived from them
+        by_status = metrics.read(LoanApplication)
+
+        def count(*statuses):
+            return sum(by_status[status].n for status in statuses if status in by_status)
 
-        total_loans = LoanApplication.objects.count()
-        approved_loans = LoanApplication.objects.filter(status='approved').count()
-        active_loans = LoanApplication.objects.filter(status='active').count()
-        completed_loans = LoanApplication.objects.filter(status='completed').count()
-        pending_loans = LoanApplication.objects.filter(status='pending').count()
+        total_loans = sum(metric.n for metric in by_status.values())
+        approved_loans = count('approved')
+        active_loans = count('active')
+        completed_loans = count('completed')
+        pending_loans = count('pending')
 
         # Calculate total loan value
-        total_loan_value = LoanApplication.objects.filter(
-            status__in=['approved', 'active', 'completed']
-        ).aggregate(total=Sum('loan_amount'))['total'] or Decimal('0')
+        funded_statuses = ('approved', 'active', 'completed')
+        total_loan_value = sum(
+            (by_status[status].value for status in funded_statuses if status in by_status),
+            Decimal('0'),
+        )
 
         # Average loan amount
-        avg_loan_amount = LoanApplication.objects.filter(
-            status__in=['approved', 'active', 'completed']
-        ).aggregate(avg=Avg('loan_amount'))['avg'] or Decimal('0')
+        funded_loans = count(*funded_statuses)
+        avg_loan_amount = total_loan_value / funded_loans if funded_loans else Decimal('0')
 
         return {
             'total_loans': total_loans,
@@ -43,20 +184,17 @@ class DashboardKPI:
         }
 
     @staticmethod
+    @cached_kpi
     def get_payment_kpis(month=None):
         """Calculate payment-related KPIs"""
-        PaymentSchedule = apps.get_model('loans', 'PaymentSchedule')
-        Payment = apps.get_model('payments', 'Payment')
+        PaymentSchedule = _model('loans', 'PaymentSchedule')
+        Payment = _model('payments', 'Payment')
 
         # Default to current month
         if month is None:
             month = timezone.now()
 
-        month_start = month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        if month.month == 12:
-            month_end = month.replace(year=month.year + 1, month=1, day=1)
-        else:
-            month_end = month.replace(month=month.month + 1, day=1)
+        month_start, month_end = month_window(month.year, month.month)
 
         # Total collected this month
         total_collected = Payment.objects.filter(
@@ -64,28 +202,24 @@ class DashboardKPI:
             payment_date__lt=month_end
         ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
 
-        # Pending payments (due this month but not paid)
-        pending_amount = PaymentSchedule.objects.filter(
-            due_date__gte=month_start,
-            due_date__lt=month_end,
-            status='due'
-        ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
-
-        # Overdue payments
+        # Pending (due this month but not paid) and overdue figures in one pass
         today = timezone.now().date()
-        overdue_amount = PaymentSchedule.objects.filter(
-            due_date__lt=today,
-            status='overdue'
-        ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0')
-
-        overdue_count = PaymentSchedule.objects.filter(
-            due_date__lt=today,
-            status='overdue'
-        ).count()
+        overdue = Q(due_date__lt=today, status='overdue')
+        schedules = PaymentSchedule.objects.filter(status__in=('due', 'overdue')).aggregate(
+            pending_amount=Sum(
+                'total_amount',
+                filter=Q(due_date__gte=month_start, due_date__lt=month_end, status='due'),
+            ),
+            overdue_amount=Sum('total_amount', filter=overdue),
+            overdue_count=Count('id', filter=overdue),
+        )
+        pending_amount = schedules['pending_amount'] or Decimal('0')
+        overdue_amount = schedules['overdue_amount'] or Decimal('0')
+        overdue_count = schedules['overdue_count']
 
         # Collection rate (paid / (paid + pending + overdue))
         total_expected = total_collected + pending_amount + overdue_amount
-        collection_rate = (total_collected / total_expected * 100) if total_expected > 0 else Decimal('0')
+        collection_rate = percentage(total_collected, total_expected)
 
         return {
             'total_collected': total_collected,
@@ -97,28 +231,28 @@ class DashboardKPI:
         }
 
     @staticmethod
+    @cached_kpi
     def get_risk_kpis():
         """Calculate risk assessment KPIs"""
-        RiskAssessment = apps.get_model('risk', 'RiskAssessment')
-
-        total_assessments = RiskAssessment.objects.count()
+        RiskAssessment = _model('risk', 'RiskAssessment')
 
         risk_distribution = RiskAssessment.objects.values('risk_level').annotate(
-            count=Count('id')
+            count=Count('id'), score_total=Sum('score')
         )
 
-        # Convert to dict for easier access
-        distribution = {'LOW': 0, 'MEDIUM': 0, 'HIGH': 0}
+        # Convert to dict for easier access (levels are stored lowercase)
+        distribution = RISK_LEVEL_BUCKETS.copy()
+        score_total = 0
         for item in risk_distribution:
-            distribution[item['risk_level']] = item['count']
+            distribution[item['risk_level'].upper()] = item['count']
+            score_total += item['score_total']
+        total_assessments = sum(distribution.values())
 
         # Average risk score
-        avg_score = RiskAssessment.objects.aggregate(
-            avg=Avg('score')
-        )['avg'] or Decimal('0')
+        avg_score = score_total / total_assessments if total_assessments else Decimal('0')
 
         # High risk percentage
-        high_risk_pct = (distribution['HIGH'] / total_assessments * 100) if total_assessments > 0 else 0
+        high_risk_pct = percentage(distribution['HIGH'], total_assessments)
 
         return {
             'total_assessments': total_assessments,
@@ -130,38 +264,32 @@ class DashboardKPI:
         }
 
     @staticmethod
+    @cached_kpi
     def get_repossession_kpis():
         """Calculate repossession-related KPIs"""
-        RepossessionCase = apps.get_model('repossession', 'RepossessionCase')
-
-        total_cases = RepossessionCase.objects.count()
+        RepossessionCase = _model('repossession', 'RepossessionCase')
 
-        status_counts = RepossessionCase.objects.values('status').annotate(
-            count=Count('id')
-        )
-
-        # Convert to dict
-        status_distribution = {
-            'WARNING': 0,
-            'ACTIVE': 0,
-            'REMINDER': 0,
-            'RECOVERED': 0,
-            'CLOSED': 0,
-        }
-        for item in status_counts:
-            status_distribution[item['status']] = item['count']
+        # Convert to dict (statuses are stored lowercase)
+        status_distribution = REPOSSESSION_STATUS_BUCKETS.copy()
+        open_overdue = {}
+        for status, metric in metrics.read(RepossessionCase).items():
+            status = status.upper()
+            status_distribution[status] = metric.n
+            open_overdue[status] = metric.value
+        total_cases = sum(status_distribution.values())
 
         # Critical cases (active + reminder)
         critical_cases = status_distribution['ACTIVE'] + status_distribution['REMINDER']
 
         # Recovery rate
         resolved_cases = status_distribution['RECOVERED'] + status_distribution['CLOSED']
-        recovery_rate = (resolved_cases / total_cases * 100) if total_cases > 0 else 0
+        recovery_rate = percentage(resolved_cases, total_cases)
 
         # Total overdue amount across active cases
-        total_overdue = RepossessionCase.objects.filter(
-            status__in=['WARNING', 'ACTIVE', 'REMINDER']
-        ).aggregate(total=Sum('total_overdue_amount'))['total'] or Decimal('0')
+        total_overdue = sum(
+            (open_overdue.get(status, Decimal('0')) for status in ('WARNING', 'ACTIVE', 'REMINDER')),
+            Decimal('0'),
+        )
 
         return {
             'total_cases': total_cases,
@@ -176,46 +304,29 @@ class DashboardKPI:
         }
 
     @staticmethod
+    @cached_kpi
     def get_inventory_kpis():
         """Calculate inventory-related KPIs"""
-        Motor = apps.get_model('inventory', 'Motor')
-        LoanApplication = apps.get_model('loans', 'LoanApplication')
-
-        total_units = Motor.objects.count()
-
-        # Count motors by deriving status from loan applications
-        available_count = 0
-        reserved_count = 0
-        sold_count = 0
-        repossessed_count = 0
-
-        for motor in Motor.objects.all():
-            status = motor.status  # This is derived from loan applications
-            if status == 'available':
-                available_count += 1
-            elif status == 'reserved':
-                reserved_count += 1
-            elif status == 'sold':
-                sold_count += 1
-            elif status == 'repossessed':
-                repossessed_count += 1
-
-        status_distribution = {
-            'available': available_count,
-            'reserved': reserved_count,
-            'sold': sold_count,
-            'repossessed': repossessed_count,
-        }
-
-        # Total inventory value (all motors)
-        total_value = Motor.objects.aggregate(
-            total=Sum('purchase_price')
-        )['total'] or Decimal('0')
+        Motor = _model('inventory', 'Motor')
+
+        status_distribution = INVENTORY_STATUS_BUCKETS.copy()
+        status_counts = (
+            Motor.objects.order_by()
+            .annotate(derived_status=motor_status_expression())
+            .values('derived_status')
+            .annotate(count=Count('id'))
+        )
+        for item in status_counts:
+            status_distribution[item['derived_status']] = item['count']
 
-        # Average motor price
-        avg_price = Motor.objects.aggregate(
-            avg=Avg('purchase_price')
-        )['avg'] or Decimal('0')
+        totals = Motor.objects.aggregate(
+            total_units=Count('id'),
+            total_value=Sum('purchase_price'),
+            avg_price=Avg('purchase_price'),
+        )
+        total_units = totals['total_units']
+        total_value = totals['total_value'] or Decimal('0')
+        avg_price = totals['avg_price'] or Decimal('0')
 
         return {
             'total_units': total_units,
@@ -228,57 +339,54 @@ class DashboardKPI:
         }
 
     @staticmethod
+    @cached_kpi
     def get_user_kpis():
         """Calculate user-related KPIs"""
-        User = apps.get_model('users', 'User')
+        User = _model('users', 'User')
 
-        total_users = User.objects.count()
-        active_users = User.objects.filter(is_active=True).count()
-        admin_users = User.objects.filter(role='admin').count()
-        finance_users = User.objects.filter(role='finance').count()
-
-        return {
-            'total_users': total_users,
-            'active_users': active_users,
-            'admin_users': admin_users,
-            'finance_users': finance_users,
-        }
+        return User.objects.aggregate(
+            total_users=Count('id'),
+            active_users=Count('id', filter=Q(is_active=True)),
+            admin_users=Count('id', filter=Q(role='admin')),
+            finance_users=Count('id', filter=Q(role='finance')),
+        )
 
     @staticmethod
+    @cached_kpi
     def get_audit_kpis(days=30):
         """Calculate audit trail KPIs"""
-        AuditLogEntry = apps.get_model('audit', 'AuditLogEntry')
+        AuditLogEntry = _model('audit', 'AuditLogEntry')
 
         since = timezone.now() - timedelta(days=days)
 
-        total_events = AuditLogEntry.objects.filter(
-            created_at__gte=since
-        ).count()
-
-        # Events by action
-        action_counts = AuditLogEntry.objects.filter(
-            created_at__gte=since
-        ).values('action').annotate(count=Count('id'))
-
-        # Recent logins
-        recent_logins = AuditLogEntry.objects.filter(
-            action='LOGIN',
-            created_at__gte=since
-        ).count()
+        # Events by action; the totals are derived from the same rows
+        action_counts = list(
+            AuditLogEntry.objects.filter(created_at__gte=since)
+            .values('action')
+            .annotate(count=Count('id'))
+        )
+        total_events = sum(item['count'] for item in action_counts)
+        recent_logins = sum(
+            item['count'] for item in action_counts if item['action'] in LOGIN_ACTIONS
+        )
 
         return {
             'total_events': total_events,
             'recent_logins': recent_logins,
-            'action_counts': list(action_counts),
+            'action_counts': action_counts,
             'days': days,
         }
 
     @staticmethod
     def get_recent_activities(limit=10):
         """Get recent system activities"""
-        AuditLogEntry = apps.get_model('audit', 'AuditLogEntry')
+        AuditLogEntry = _model('audit', 'AuditLogEntry')
 
-        return AuditLogEntry.objects.select_related('actor').order_by('-created_at')[:limit]
+        return (
+            AuditLogEntry.objects.select_related('actor')
+            .only(*RECENT_ACTIVITY_FIELDS)
+            .order_by('-created_at')[:limit]
+        )
 
 
 class AdminDashboardKPI(DashboardKPI):
@@ -287,16 +395,18 @@ class AdminDashboardKPI(DashboardKPI):
     @classmethod
     def get_all_kpis(cls):
         """Get all KPIs for admin dashboard"""
-        return {
-            'loans': cls.get_loan_kpis(),
-            'payments': cls.get_payment_kpis(),
-            'risk': cls.get_risk_kpis(),
-            'repossession': cls.get_repossession_kpis(),
-            'inventory': cls.get_inventory_kpis(),
-            'users': cls.get_user_kpis(),
-            'audit': cls.get_audit_kpis(),
-            'recent_activities': cls.get_recent_activities(),
-        }
+        kpis = gather_kpis({
+            'loans': cls.get_loan_kpis,
+            'payments': cls.get_payment_kpis,
+            'risk': cls.get_risk_kpis,
+            'repossession': cls.get_repossession_kpis,
+            'inventory': cls.get_inventory_kpis,
+            'users': cls.get_user_kpis,
+            'audit': cls.get_audit_kpis,
+        })
+        # Lazy queryset; evaluated when the template renders
+        kpis['recent_activities'] = cls.get_recent_activities()
+        return kpis
 
 
 class FinanceDashboardKPI(DashboardKPI):
@@ -305,13 +415,14 @@ class FinanceDashboardKPI(DashboardKPI):
     @classmethod
     def get_all_kpis(cls):
         """Get all KPIs for finance dashboard"""
-        return {
-            'loans': cls.get_loan_kpis(),
-            'payments': cls.get_payment_kpis(),
-            'risk': cls.get_risk_kpis(),
-            'repossession': cls.get_repossession_kpis(),
-            'recent_activities': cls.get_recent_activities(limit=5),
-        }
+        kpis = gather_kpis({
+            'loans': cls.get_loan_kpis,
+            'payments': cls.get_payment_kpis,
+            'risk': cls.get_risk_kpis,
+            'repossession': cls.get_repossession_kpis,
+        })
+        kpis['recent_activities'] = cls.get_recent_activities(limit=5)
+        return kpis
 
 
 class LoanOfficerDashboardKPI(DashboardKPI):
@@ -320,9 +431,10 @@ class LoanOfficerDashboardKPI(DashboardKPI):
     @classmethod
     def get_all_kpis(cls):
         """Get all KPIs for loan officer dashboard"""
-        return {
-            'loans': cls.get_loan_kpis(),
-            'payments': cls.get_payment_kpis(),
-            'repossession': cls.get_repossession_kpis(),
-            'recent_activities': cls.get_recent_activities(limit=8),
-        }
+        kpis = gather_kpis({
+            'loans': cls.get_loan_kpis,
+            'payments': cls.get_payment_kpis,
+            'repossession': cls.get_repossession_kpis,
+        })
+        kpis['recent_activities'] = cls.get_recent_activities(limit=8)
+        return kpis
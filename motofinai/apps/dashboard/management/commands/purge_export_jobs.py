@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from motofinai.apps.dashboard.exports import fail_stale_export_jobs, purge_expired_export_jobs
+
+
+class Command(BaseCommand):
+    help = "Fail export jobs whose worker died and delete expired exports with their files (run from cron)"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        failed = fail_stale_export_jobs()
+        purged = purge_expired_export_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Failed {failed} stale export jobs, purged {purged} expired ones"))
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from motofinai.apps.dashboard import metrics
+from motofinai.apps.dashboard.kpi import DashboardKPI
+
+
+class Command(BaseCommand):
+    help = "Recount the dashboard status counters from their source tables (run after bulk imports)"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for label in metrics.METRIC_SOURCES:
+            rebuilt = metrics.rebuild(apps.get_model(label))
+            total = sum(metric.n for metric in rebuilt.values())
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {label}: {total} rows across {len(rebuilt)} statuses"))
+        DashboardKPI.invalidate()
@@ -0,0 +1,111 @@
+"""
+Signal-maintained per-status counters behind the loan and repossession KPIs.
+
+Each save or delete of a source row moves its count and amount between
+``DashboardMetric`` rows with a single ``UPDATE``, so reading the KPIs is
+one indexed lookup instead of a GROUP BY over the whole table. Writes that
+bypass model signals (``QuerySet.update``, ``bulk_create``) are not seen;
+call ``rebuild`` after them in code (archive bulk restores do), or run
+``python manage.py rebuild_dashboard_metrics``.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from .models import DashboardMetric
+
+# Source model label -> (key prefix, status field, summed amount field)
+METRIC_SOURCES = {
+    'loans.LoanApplication': ('loans', 'status', 'loan_amount'),
+    'repossession.RepossessionCase': ('repossession', 'status', 'total_overdue_amount'),
+}
+
+
+def _source(model):
+    return METRIC_SOURCES[model._meta.label]
+
+
+def _prefix_filter(prefix):
+    return DashboardMetric.objects.filter(key__startswith=f'{prefix}.')
+
+
+def tracks(model, fields):
+    """Whether saving ``fields`` can change a source row's counters"""
+    _prefix, status_field, amount_field = _source(model)
+    return status_field in fields or amount_field in fields
+
+
+def contribution(model, instance):
+    """Return the ``(key, amount)`` an instance adds to the counters"""
+    prefix, status_field, amount_field = _source(model)
+    return f'{prefix}.{getattr(instance, status_field)}', getattr(instance, amount_field) or Decimal('0')
+
+
+def stored_contribution(model, pk):
+    """Return the ``(key, amount)`` of the saved row, or None if it does not exist"""
+    prefix, status_field, amount_field = _source(model)
+    row = model._base_manager.filter(pk=pk).values_list(status_field, amount_field).first()
+    if row is None:
+        return None
+    return f'{prefix}.{row[0]}', row[1] or Decimal('0')
+
+
+def adjust(key, n, amount):
+    """Add ``n`` rows and ``amount`` to one counter"""
+    updated = DashboardMetric.objects.filter(key=key).update(
+        n=F('n') + n, value=F('value') + amount, updated_at=timezone.now()
+    )
+    if not updated:
+        # Counters were never built, or this status is new: drop the rest so
+        # the next read rebuilds the whole source from its table
+        _prefix_filter(key.partition('.')[0]).delete()
+
+
+def record_save(model, instance, previous):
+    current = contribution(model, instance)
+    if current == previous:
+        return
+    if previous is not None:
+        adjust(previous[0], -1, -previous[1])
+    adjust(current[0], 1, current[1])
+
+
+def record_delete(model, instance):
+    key, amount = contribution(model, instance)
+    adjust(key, -1, -amount)
+
+
+def rebuild(model):
+    """Recount a source from its table; return the fresh metrics by key"""
+    prefix, status_field, amount_field = _source(model)
+    metrics = {
+        f'{prefix}.{status}': DashboardMetric(key=f'{prefix}.{status}')
+        for status, _label in model._meta.get_field(status_field).choices
+    }
+    with transaction.atomic():
+        rows = model._base_manager.values(status_field).annotate(n=Count('pk'), value=Sum(amount_field))
+        for row in rows:
+            key = f'{prefix}.{row[status_field]}'
+            metrics[key] = DashboardMetric(key=key, n=row['n'], value=row['value'] or Decimal('0'))
+        _prefix_filter(prefix).exclude(key__in=metrics).delete()
+        # Upsert so a concurrent rebuild of the same source overwrites these
+        # rows instead of failing on their primary keys
+        DashboardMetric.objects.bulk_create(
+            metrics.values(),
+            update_conflicts=True,
+            unique_fields=['key'],
+            update_fields=['n', 'value', 'updated_at'],
+        )
+    return metrics
+
+
+def read(model):
+    """Return ``{status: DashboardMetric}`` for a source, rebuilding it if incomplete"""
+    prefix, status_field, _amount_field = _source(model)
+    metrics = {metric.key: metric for metric in _prefix_filter(prefix)}
+    expected = (f'{prefix}.{status}' for status, _label in model._meta.get_field(status_field).choices)
+    if not all(key in metrics for key in expected):
+        metrics = rebuild(model)
+    return {key.partition('.')[2]: metric for key, metric in metrics.items()}
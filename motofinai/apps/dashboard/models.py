@@ -0,0 +1,64 @@
+import uuid
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import models
+
+
+class DashboardMetric(models.Model):
+    """Running row count and amount total for one status of a summarised model.
+
+    Keys look like ``loans.active``. Rows are adjusted in place by
+    ``dashboard.signals`` and rebuilt from the source table by
+    ``dashboard.metrics.rebuild`` when they are missing.
+    """
+
+    key = models.CharField(max_length=64, primary_key=True)
+    n = models.BigIntegerField(default=0)
+    value = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0.00"))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["key"]
+
+    def __str__(self) -> str:
+        return f"{self.key}: {self.n} ({self.value})"
+
+
+class ExportJob(models.Model):
+    """A background Excel export queued by ``dashboard.exports.start_export``.
+
+    Kept in the database rather than the cache so every worker process can
+    answer status polls, and so jobs cut short by a restart can be found.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    ACTIVE_STATUSES = (Status.QUEUED, Status.RUNNING)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="export_jobs",
+    )
+    report = models.CharField(max_length=64)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    path = models.CharField(max_length=255, blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # Sweeping jobs left queued or running by a dead worker
+            models.Index(fields=["status", "updated_at"], name="export_job_status_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.report} ({self.status})"
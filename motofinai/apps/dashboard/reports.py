@@ -1,51 +1,211 @@
 """
 Report generation utilities for PDF and Excel exports
 """
+import functools
+import tempfile
 from datetime import datetime
 from decimal import Decimal
-from io import BytesIO
 
-from django.http import HttpResponse
+import xlsxwriter
+from django.http import FileResponse
 from django.apps import apps
+from django.db.models import CharField, FloatField, Value
+from django.db.models.functions import Cast, Concat
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 
+from .kpi import motor_status_expression
+
+
+# Header cell styles; openpyxl style objects are immutable, so every report
+# shares one instance of each
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+
+
+def format_datetime(value):
+    """Format ``value`` as ``YYYY-MM-DD HH:MM`` for a report cell"""
+    # isoformat is C-level with no format string to parse, unlike strftime;
+    # the first 16 characters drop the seconds and any UTC offset
+    return value.isoformat(' ', 'minutes')[:16]
+
+
+def full_name(first_name, last_name):
+    """``"<first> <last>"`` built by the database, for a values_list column"""
+    return Concat(first_name, Value(' '), last_name, output_field=CharField())
+
+
+def float_columns(*fields):
+    """Cast numeric columns to float in SQL, as ``<field>_float`` annotations
+
+    The driver then hands back plain floats for the cells instead of
+    Decimals that are converted one by one.
+    """
+    return {f'{field}_float': Cast(field, FloatField()) for field in fields}
+
+
+@functools.lru_cache(maxsize=None)
+def choice_labels(model, field_name):
+    """Map the stored values of a choice field to their labels, once per process"""
+    return dict(model._meta.get_field(field_name).flatchoices)
+
 
 class BaseReport:
     """Base class for report generation"""
 
+    # Workbooks stream rows to the XML writer instead of keeping every cell in
+    # memory; write-only sheets cannot be read back or restyled once appended
+    WRITE_ONLY = True
+    # Rows fetched per round trip; the queryset result cache is bypassed
+    CHUNK_SIZE = 2000
+    # Column widths keyed by header; write-only sheets cannot be measured
+    # after the fact, so widths are fixed up front
+    DEFAULT_COLUMN_WIDTH = 15
+    COLUMN_WIDTHS = {
+        'ID': 8,
+        'Loan ID': 10,
+        'Schedule ID': 12,
+        'Applicant Name': 28,
+        'Applicant': 22,
+        'Email': 30,
+        'Phone': 16,
+        'Motor': 28,
+        'Sequence': 10,
+        'Year': 8,
+        'Model': 20,
+        'Chassis Number': 22,
+        'Color': 12,
+        'Reference': 20,
+        'Recorded By': 30,
+        'Employment Status': 18,
+        'Created Date': 17,
+        'Updated Date': 17,
+        'Created At': 17,
+        'Recorded At': 17,
+    }
+
+    @classmethod
+    def generate_excel_response(cls, workbook, filename):
+        """Save ``workbook`` to a temporary file and stream it as an attachment"""
+        output = tempfile.TemporaryFile(suffix='.xlsx')
+        workbook.save(output)
+        return cls.file_response(output, filename)
+
     @staticmethod
-    def generate_excel_response(filename):
-        """Create HttpResponse for Excel file"""
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    def file_response(output, filename):
+        """Stream the finished xlsx in ``output`` as an attachment
+
+        The file is anonymous, so it is removed as soon as the response
+        closes it; Content-Length comes from the file size.
+        """
+        output.seek(0)
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=filename,
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
         )
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
 
-    @staticmethod
-    def style_header_row(worksheet, row=1):
-        """Apply styling to header row"""
-        for cell in worksheet[row]:
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+    @classmethod
+    def new_workbook(cls):
+        return Workbook(write_only=cls.WRITE_ONLY)
+
+    @classmethod
+    def column_width(cls, header):
+        return cls.COLUMN_WIDTHS.get(header, cls.DEFAULT_COLUMN_WIDTH)
+
+    @classmethod
+    def set_column_widths(cls, worksheet, headers):
+        """Size the columns of ``worksheet``; must run before any row is appended"""
+        for index, header in enumerate(headers, 1):
+            worksheet.column_dimensions[get_column_letter(index)].width = cls.column_width(header)
 
     @staticmethod
-    def auto_adjust_column_width(worksheet):
-        """Auto-adjust column widths based on content"""
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    def header_row(worksheet, headers):
+        """Return the styled header cells for ``headers``, ready to append"""
+        cells = []
+        for header in headers:
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.font = HEADER_FONT
+            cell.fill = HEADER_FILL
+            cell.alignment = HEADER_ALIGNMENT
+            cells.append(cell)
+        return cells
+
+    @classmethod
+    def write_header(cls, worksheet, headers):
+        """Size the columns and append the header row to an empty sheet"""
+        cls.set_column_widths(worksheet, headers)
+        worksheet.append(cls.header_row(worksheet, headers))
+
+
+class XlsxWriterSheet:
+    """The ``append`` half of an openpyxl worksheet, over an xlsxwriter one"""
+
+    def __init__(self, worksheet, header_format):
+        self.worksheet = worksheet
+        self.header_format = header_format
+        self.next_row = 0
+
+    def set_width(self, index, width):
+        self.worksheet.set_column(index, index, width)
+
+    def append(self, values, cell_format=None):
+        self.worksheet.write_row(self.next_row, 0, values, cell_format)
+        self.next_row += 1
+
+
+class XlsxWriterWorkbook:
+    """Constant-memory xlsxwriter workbook with the openpyxl calls reports use
+
+    Each row is flushed to disk once the next one starts, so only the
+    current row is held in memory; column widths and formats must be set
+    before the first row is written.
+    """
+
+    def __init__(self):
+        self.output = tempfile.TemporaryFile(suffix='.xlsx')
+        self.workbook = xlsxwriter.Workbook(self.output, {'constant_memory': True, 'in_memory': False})
+        self.header_format = self.workbook.add_format({
+            'bold': True,
+            'font_color': '#FFFFFF',
+            'bg_color': '#4472C4',
+            'align': 'center',
+            'valign': 'vcenter',
+        })
+
+    def create_sheet(self, title):
+        return XlsxWriterSheet(self.workbook.add_worksheet(title), self.header_format)
+
+    def close(self):
+        """Finish the file and return it"""
+        self.workbook.close()
+        return self.output
+
+
+class XlsxWriterReport(BaseReport):
+    """Base class for plain row dumps written with xlsxwriter instead of openpyxl
+
+    xlsxwriter skips openpyxl's per-cell objects, which makes it the faster
+    engine for reports that only style their header row.
+    """
+
+    @classmethod
+    def new_workbook(cls):
+        return XlsxWriterWorkbook()
+
+    @classmethod
+    def generate_excel_response(cls, workbook, filename):
+        return cls.file_response(workbook.close(), filename)
+
+    @classmethod
+    def write_header(cls, worksheet, headers):
+        for index, header in enumerate(headers):
+            worksheet.set_width(index, cls.column_width(header))
+        worksheet.append(headers, worksheet.header_format)
 
 
 class LoanReport(BaseReport):
@@ -57,9 +217,8 @@ class LoanReport(BaseReport):
         LoanApplication = apps.get_model('loans', 'LoanApplication')
 
         # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Loan Applications"
+        wb = cls.new_workbook()
+        ws = wb.create_sheet(title="Loan Applications")
 
         # Headers
         headers = [
@@ -67,88 +226,132 @@ class LoanReport(BaseReport):
             'Loan Amount', 'Down Payment', 'Principal', 'Monthly Income',
             'Status', 'Created Date', 'Updated Date'
         ]
-        ws.append(headers)
-        cls.style_header_row(ws)
+        cls.write_header(ws, headers)
 
-        # Get data
-        queryset = LoanApplication.objects.select_related('motor').order_by('-submitted_at')
+        # Get data (plain tuples; no model instances)
+        queryset = LoanApplication.objects.order_by('-submitted_at')
         if filters:
             queryset = queryset.filter(**filters)
+        rows = queryset.annotate(
+            applicant_name=full_name('applicant_first_name', 'applicant_last_name'),
+            **float_columns('loan_amount', 'down_payment', 'principal_amount', 'monthly_income'),
+        ).values_list(
+            'id', 'applicant_name', 'applicant_email',
+            'applicant_phone', 'motor_id', 'motor__year', 'motor__brand', 'motor__model_name',
+            'loan_amount_float', 'down_payment_float', 'principal_amount_float',
+            'monthly_income_float', 'status', 'submitted_at', 'updated_at',
+            named=True,
+        )
+        status_labels = choice_labels(LoanApplication, 'status')
 
         # Add data rows
-        for loan in queryset:
-            applicant_name = f"{loan.applicant_first_name} {loan.applicant_last_name}"
+        for loan in rows.iterator(chunk_size=cls.CHUNK_SIZE):
             ws.append([
                 loan.id,
-                applicant_name,
+                loan.applicant_name,
                 loan.applicant_email,
                 loan.applicant_phone,
-                str(loan.motor) if loan.motor else 'N/A',
-                float(loan.loan_amount or 0),
-                float(loan.down_payment or 0),
-                float(loan.principal_amount or 0),
-                float(loan.monthly_income or 0),
-                loan.get_status_display(),
-                loan.submitted_at.strftime('%Y-%m-%d %H:%M'),
-                loan.updated_at.strftime('%Y-%m-%d %H:%M'),
+                # Motor.display_name
+                f"{loan.motor__year} {loan.motor__brand} {loan.motor__model_name}".strip()
+                if loan.motor_id else 'N/A',
+                loan.loan_amount_float or 0.0,
+                loan.down_payment_float or 0.0,
+                loan.principal_amount_float or 0.0,
+                loan.monthly_income_float or 0.0,
+                status_labels.get(loan.status, loan.status),
+                format_datetime(loan.submitted_at),
+                format_datetime(loan.updated_at),
             ])
 
-        # Auto-adjust columns
-        cls.auto_adjust_column_width(ws)
-
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Create response
         filename = f"loan_applications_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        response = cls.generate_excel_response(filename)
-        response.write(output.getvalue())
-        return response
+        return cls.generate_excel_response(wb, filename)
 
 
 class PaymentReport(BaseReport):
     """Payment reports"""
 
     @classmethod
-    def generate_excel(cls, filters=None):
-        """Generate Excel report of payments"""
+    def schedule_rows(cls, filters=None):
+        """Yield the Payment Schedule sheet rows, fetched in chunks"""
         PaymentSchedule = apps.get_model('loans', 'PaymentSchedule')
+
+        queryset = PaymentSchedule.objects.order_by('-due_date')
+        if filters:
+            queryset = queryset.filter(**filters)
+        schedules = queryset.annotate(
+            **float_columns('principal_amount', 'interest_amount', 'total_amount'),
+        ).values_list(
+            'id', 'loan_application_id', 'loan_application__applicant_first_name', 'sequence',
+            'due_date', 'principal_amount_float', 'interest_amount_float', 'total_amount_float',
+            'status',
+            named=True,
+        )
+        status_labels = choice_labels(PaymentSchedule, 'status')
+
+        return (
+            [
+                schedule.id,
+                schedule.loan_application_id,
+                schedule.loan_application__applicant_first_name,
+                schedule.sequence,
+                schedule.due_date.isoformat(),
+                schedule.principal_amount_float,
+                schedule.interest_amount_float,
+                schedule.total_amount_float,
+                status_labels.get(schedule.status, schedule.status),
+            ]
+            for schedule in schedules.iterator(chunk_size=cls.CHUNK_SIZE)
+        )
+
+    @classmethod
+    def payment_rows(cls):
+        """Yield the Payments Made sheet rows, fetched in chunks"""
         Payment = apps.get_model('payments', 'Payment')
 
-        # Create workbook
-        wb = Workbook()
+        payments = Payment.objects.order_by('-payment_date').annotate(
+            applicant_name=full_name(
+                'schedule__loan_application__applicant_first_name',
+                'schedule__loan_application__applicant_last_name',
+            ),
+            **float_columns('amount'),
+        ).values_list(
+            'id', 'schedule_id', 'applicant_name', 'amount_float', 'payment_date',
+            'reference', 'recorded_by_id', 'recorded_by__email', 'recorded_at',
+            named=True,
+        )
+
+        return (
+            [
+                payment.id,
+                payment.schedule_id,
+                payment.applicant_name,
+                payment.amount_float,
+                payment.payment_date.isoformat(),
+                payment.reference or 'N/A',
+                payment.recorded_by__email if payment.recorded_by_id else 'System',
+                format_datetime(payment.recorded_at),
+            ]
+            for payment in payments.iterator(chunk_size=cls.CHUNK_SIZE)
+        )
+
+    @classmethod
+    def generate_excel(cls, filters=None):
+        """Generate Excel report of payments"""
+        # Create workbook; each sheet streams its rows straight from the
+        # database into it, so neither result set is held in memory
+        wb = cls.new_workbook()
 
         # Sheet 1: Payment Schedule
-        ws1 = wb.active
-        ws1.title = "Payment Schedule"
+        ws1 = wb.create_sheet(title="Payment Schedule")
 
         headers1 = [
             'ID', 'Loan ID', 'Applicant', 'Sequence', 'Due Date',
             'Principal', 'Interest', 'Total Amount', 'Status'
         ]
-        ws1.append(headers1)
-        cls.style_header_row(ws1)
-
-        queryset = PaymentSchedule.objects.select_related('loan_application').order_by('-due_date')
-        if filters:
-            queryset = queryset.filter(**filters)
-
-        for schedule in queryset:
-            ws1.append([
-                schedule.id,
-                schedule.loan_application.id,
-                schedule.loan_application.applicant_first_name,
-                schedule.sequence,
-                schedule.due_date.strftime('%Y-%m-%d'),
-                float(schedule.principal_amount),
-                float(schedule.interest_amount),
-                float(schedule.total_amount),
-                schedule.get_status_display(),
-            ])
+        cls.write_header(ws1, headers1)
 
-        cls.auto_adjust_column_width(ws1)
+        for row in cls.schedule_rows(filters):
+            ws1.append(row)
 
         # Sheet 2: Payments Made
         ws2 = wb.create_sheet(title="Payments Made")
@@ -157,93 +360,67 @@ class PaymentReport(BaseReport):
             'ID', 'Schedule ID', 'Applicant', 'Amount', 'Payment Date',
             'Reference', 'Recorded By', 'Recorded At'
         ]
-        ws2.append(headers2)
-        cls.style_header_row(ws2)
-
-        payments = Payment.objects.select_related(
-            'schedule__loan_application', 'recorded_by'
-        ).order_by('-payment_date')
-
-        for payment in payments:
-            applicant_name = f"{payment.schedule.loan_application.applicant_first_name} {payment.schedule.loan_application.applicant_last_name}"
-            ws2.append([
-                payment.id,
-                payment.schedule.id,
-                applicant_name,
-                float(payment.amount),
-                payment.payment_date.strftime('%Y-%m-%d'),
-                payment.reference or 'N/A',
-                payment.recorded_by.email if payment.recorded_by else 'System',
-                payment.recorded_at.strftime('%Y-%m-%d %H:%M'),
-            ])
-
-        cls.auto_adjust_column_width(ws2)
+        cls.write_header(ws2, headers2)
 
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        for row in cls.payment_rows():
+            ws2.append(row)
 
-        # Create response
         filename = f"payments_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        response = cls.generate_excel_response(filename)
-        response.write(output.getvalue())
-        return response
+        return cls.generate_excel_response(wb, filename)
 
 
-class RiskReport(BaseReport):
+class RiskReport(XlsxWriterReport):
     """Risk assessment reports"""
 
     @classmethod
     def generate_excel(cls):
         """Generate Excel report of risk assessments"""
         RiskAssessment = apps.get_model('risk', 'RiskAssessment')
+        LoanApplication = apps.get_model('loans', 'LoanApplication')
 
         # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Risk Assessments"
+        wb = cls.new_workbook()
+        ws = wb.create_sheet(title="Risk Assessments")
 
         headers = [
             'ID', 'Loan ID', 'Applicant', 'Risk Score', 'Risk Level',
             'Credit Score', 'Missed Payments', 'Employment Status',
             'DTI Ratio', 'Created At'
         ]
-        ws.append(headers)
-        cls.style_header_row(ws)
+        cls.write_header(ws, headers)
 
         # Get data
-        queryset = RiskAssessment.objects.select_related('loan_application').order_by('-score')
+        assessments = RiskAssessment.objects.order_by('-score').annotate(
+            **float_columns('debt_to_income_ratio'),
+        ).values_list(
+            'id', 'loan_application_id', 'loan_application__applicant_first_name', 'score',
+            'risk_level', 'credit_score', 'missed_payments', 'loan_application__employment_status',
+            'debt_to_income_ratio_float', 'calculated_at',
+            named=True,
+        )
+        risk_labels = choice_labels(RiskAssessment, 'risk_level')
+        employment_labels = choice_labels(LoanApplication, 'employment_status')
 
-        for assessment in queryset:
+        for assessment in assessments.iterator(chunk_size=cls.CHUNK_SIZE):
+            employment_status = assessment.loan_application__employment_status
             ws.append([
                 assessment.id,
-                assessment.loan_application.id,
-                assessment.loan_application.applicant_first_name,
+                assessment.loan_application_id,
+                assessment.loan_application__applicant_first_name,
                 float(assessment.score),
-                assessment.get_risk_level_display(),
+                risk_labels.get(assessment.risk_level, assessment.risk_level),
                 assessment.credit_score or 'N/A',
                 assessment.missed_payments,
-                assessment.loan_application.get_employment_status_display(),
-                float(assessment.debt_to_income_ratio or 0),
-                assessment.calculated_at.strftime('%Y-%m-%d %H:%M'),
+                employment_labels.get(employment_status, employment_status),
+                assessment.debt_to_income_ratio_float or 0.0,
+                format_datetime(assessment.calculated_at),
             ])
 
-        cls.auto_adjust_column_width(ws)
-
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Create response
         filename = f"risk_assessments_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        response = cls.generate_excel_response(filename)
-        response.write(output.getvalue())
-        return response
+        return cls.generate_excel_response(wb, filename)
 
 
-class InventoryReport(BaseReport):
+class InventoryReport(XlsxWriterReport):
     """Inventory reports"""
 
     @classmethod
@@ -252,43 +429,40 @@ class InventoryReport(BaseReport):
         Motor = apps.get_model('inventory', 'Motor')
 
         # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Inventory"
+        wb = cls.new_workbook()
+        ws = wb.create_sheet(title="Inventory")
 
         headers = [
             'ID', 'Type', 'Brand', 'Model', 'Year', 'Chassis Number',
             'Color', 'Purchase Price', 'Status', 'Created At'
         ]
-        ws.append(headers)
-        cls.style_header_row(ws)
-
-        # Get data
-        queryset = Motor.objects.all().order_by('-created_at')
+        cls.write_header(ws, headers)
+
+        # Get data; the derived status is computed in SQL rather than per motor
+        motors = (
+            Motor.objects.order_by('-created_at')
+            .annotate(derived_status=motor_status_expression(), **float_columns('purchase_price'))
+            .values_list(
+                'id', 'type', 'brand', 'model_name', 'year', 'chassis_number',
+                'color', 'purchase_price_float', 'derived_status', 'created_at',
+                named=True,
+            )
+        )
+        type_labels = choice_labels(Motor, 'type')
 
-        for motor in queryset:
+        for motor in motors.iterator(chunk_size=cls.CHUNK_SIZE):
             ws.append([
                 motor.id,
-                motor.get_type_display(),
+                type_labels.get(motor.type, motor.type),
                 motor.brand,
                 motor.model_name,
                 motor.year,
                 motor.chassis_number,
                 motor.color,
-                float(motor.purchase_price),
-                motor.status.title(),  # Use derived status property
-                motor.created_at.strftime('%Y-%m-%d %H:%M'),  # Use created_at instead
+                motor.purchase_price_float,
+                motor.derived_status.title(),
+                format_datetime(motor.created_at),
             ])
 
-        cls.auto_adjust_column_width(ws)
-
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Create response
         filename = f"inventory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        response = cls.generate_excel_response(filename)
-        response.write(output.getvalue())
-        return response
+        return cls.generate_excel_response(wb, filename)
@@ -0,0 +1,51 @@
+"""Keep dashboard KPIs in step with the records they summarise."""
+
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import metrics
+from .kpi import DashboardKPI
+
+
+@receiver(post_save, sender="loans.LoanApplication")
+@receiver(post_delete, sender="loans.LoanApplication")
+@receiver(post_save, sender="loans.PaymentSchedule")
+@receiver(post_delete, sender="loans.PaymentSchedule")
+@receiver(post_save, sender="payments.Payment")
+@receiver(post_delete, sender="payments.Payment")
+@receiver(post_save, sender="risk.RiskAssessment")
+@receiver(post_delete, sender="risk.RiskAssessment")
+@receiver(post_save, sender="repossession.RepossessionCase")
+@receiver(post_delete, sender="repossession.RepossessionCase")
+@receiver(post_save, sender="inventory.Motor")
+@receiver(post_delete, sender="inventory.Motor")
+def invalidate_dashboard_kpis(sender, **kwargs):
+    DashboardKPI.invalidate()
+
+
+@receiver(pre_save, sender="loans.LoanApplication")
+@receiver(pre_save, sender="repossession.RepossessionCase")
+def remember_metric_contribution(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding:
+        previous = None
+    elif update_fields is not None and not metrics.tracks(sender, update_fields):
+        # Neither the status nor the amount is written, so nothing moves
+        previous = metrics.contribution(sender, instance)
+    else:
+        previous = metrics.stored_contribution(sender, instance.pk)
+    instance._dashboard_metric_previous = previous
+
+
+@receiver(post_save, sender="loans.LoanApplication")
+@receiver(post_save, sender="repossession.RepossessionCase")
+def update_metrics_on_save(sender, instance, **kwargs):
+    previous = instance.__dict__.pop("_dashboard_metric_previous", None)
+    metrics.record_save(sender, instance, previous)
+
+
+@receiver(post_delete, sender="loans.LoanApplication")
+@receiver(post_delete, sender="repossession.RepossessionCase")
+def update_metrics_on_delete(sender, instance, **kwargs):
+    metrics.record_delete(sender, instance)
@@ -3,6 +3,8 @@ Custom template filters for dashboard calculations
 """
 from django import template
 
+from motofinai.apps.dashboard.kpi import percentage
+
 register = template.Library()
 
 
@@ -22,3 +24,16 @@ def div(value, arg):
         return float(value) / float(arg)
     except (ValueError, TypeError, ZeroDivisionError):
         return 0
+
+
+@register.filter
+def percent_of(value, whole):
+    """``value`` as a percentage of ``whole``; 0 when ``whole`` is not positive
+
+    Takes the KPI counts as they are, so a bar width costs one division
+    instead of a ``mul``/``div`` pair that re-coerces both operands.
+    """
+    try:
+        return percentage(value, whole)
+    except (ValueError, TypeError):
+        return 0
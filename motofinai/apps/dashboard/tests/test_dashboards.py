@@ -1,13 +1,26 @@
 """
 Tests for dashboard views and KPI calculations
 """
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
 from decimal import Decimal
-from django.test import TestCase, Client
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
-from motofinai.apps.dashboard.kpi import AdminDashboardKPI, FinanceDashboardKPI
+from motofinai.apps.dashboard.exports import EXPORT_JOB_TIMEOUT, EXPORT_STALE_AFTER
+from motofinai.apps.dashboard.kpi import AdminDashboardKPI, FinanceDashboardKPI, gather_kpis
+from motofinai.apps.dashboard.models import ExportJob
 
 User = get_user_model()
 
@@ -15,6 +28,9 @@ User = get_user_model()
 class DashboardKPITestCase(TestCase):
     """Test KPI calculation utilities"""
 
+    def setUp(self):
+        cache.clear()
+
     def test_loan_kpis_empty(self):
         """Test loan KPIs with no data"""
         kpis = AdminDashboardKPI.get_loan_kpis()
@@ -101,6 +117,7 @@ class AdminDashboardViewTestCase(TestCase):
     """Test admin dashboard view"""
 
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.admin_user = User.objects.create_user(
             username='admin',
@@ -130,11 +147,31 @@ class AdminDashboardViewTestCase(TestCase):
         response = self.client.get(reverse('dashboard:admin'))
         self.assertEqual(response.status_code, 302)  # Redirect to login
 
+    def test_unchanged_admin_dashboard_is_not_modified(self):
+        """Test a repeat request with the page's ETag gets a 304 until KPIs change"""
+        self.client.login(username='admin', password='testpass123')
+        # Keep every request inside one KPI cache window
+        clock = mock.patch('motofinai.apps.dashboard.views.time.time', return_value=1_800_000_000)
+        clock.start()
+        self.addCleanup(clock.stop)
+        response = self.client.get(reverse('dashboard:admin'))
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn('private', response['Cache-Control'])
+
+        response = self.client.get(reverse('dashboard:admin'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        AdminDashboardKPI.invalidate()
+        response = self.client.get(reverse('dashboard:admin'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
 
 class FinanceDashboardViewTestCase(TestCase):
     """Test finance dashboard view"""
 
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.finance_user = User.objects.create_user(
             username='finance',
@@ -181,6 +218,7 @@ class ReportExportTestCase(TestCase):
     """Test report export functionality"""
 
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.admin_user = User.objects.create_user(
             username='admin',
@@ -227,3 +265,116 @@ class ReportExportTestCase(TestCase):
         self.client.login(username='admin', password='testpass123')
         response = self.client.get(reverse('dashboard:export_inventory'))
         self.assertEqual(response.status_code, 200)
+
+    def use_temp_media(self):
+        temp_media = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=temp_media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(lambda: shutil.rmtree(temp_media, ignore_errors=True))
+
+    def test_queued_export_can_be_polled_and_downloaded(self):
+        """Test a POSTed export runs as a job and is downloadable when done"""
+        self.use_temp_media()
+        self.client.login(username='finance', password='testpass123')
+
+        response = self.client.post(reverse('dashboard:export_loans'))
+        self.assertEqual(response.status_code, 202)
+        job = response.json()
+
+        status = self.client.get(job['status_url']).json()
+        self.assertEqual(status['job_id'], job['job_id'])
+        self.assertEqual(status['status'], 'completed')
+        self.assertEqual(status['progress'], 100)
+
+        # Job state is in the database, not the per-process cache
+        cache.clear()
+        download = self.client.get(status['download_url'])
+        self.assertEqual(download.status_code, 200)
+        self.assertRegex(download['Content-Disposition'], r'filename="loan_applications_\d{8}_\d{6}\.xlsx"')
+        self.assertTrue(b"".join(download.streaming_content).startswith(b"PK"))
+
+    def test_export_jobs_are_private_to_their_owner(self):
+        """Test another user cannot poll or download someone else's export"""
+        self.use_temp_media()
+        self.client.login(username='admin', password='testpass123')
+        job = self.client.post(reverse('dashboard:export_inventory')).json()
+
+        self.client.login(username='finance', password='testpass123')
+        self.assertEqual(self.client.get(job['status_url']).status_code, 404)
+        download_url = reverse('dashboard:export_download', args=[job['job_id']])
+        self.assertEqual(self.client.get(download_url).status_code, 404)
+
+    def test_orphaned_export_is_reported_as_failed(self):
+        """Test a job left running by a dead worker is failed once stale"""
+        job = ExportJob.objects.create(
+            user=self.finance_user, report='LoanReport', status=ExportJob.Status.RUNNING
+        )
+        stale = timezone.now() - timedelta(seconds=EXPORT_STALE_AFTER + 1)
+        ExportJob.objects.filter(pk=job.pk).update(updated_at=stale)
+
+        self.client.login(username='finance', password='testpass123')
+        status = self.client.get(reverse('dashboard:export_status', args=[job.pk])).json()
+        self.assertEqual(status['status'], 'failed')
+        self.assertEqual(status['progress'], 0)
+        self.assertNotIn('download_url', status)
+        self.assertEqual(ExportJob.objects.get(pk=job.pk).status, ExportJob.Status.FAILED)
+
+    def test_polling_only_checks_the_requested_job(self):
+        """Test a status poll does not sweep other users' jobs"""
+        other = ExportJob.objects.create(
+            user=self.admin_user, report='LoanReport', status=ExportJob.Status.RUNNING
+        )
+        stale = timezone.now() - timedelta(seconds=EXPORT_STALE_AFTER + 1)
+        ExportJob.objects.filter(pk=other.pk).update(updated_at=stale)
+        job = ExportJob.objects.create(user=self.finance_user, report='LoanReport')
+
+        self.client.login(username='finance', password='testpass123')
+        self.client.get(reverse('dashboard:export_status', args=[job.pk]))
+        self.assertEqual(ExportJob.objects.get(pk=other.pk).status, ExportJob.Status.RUNNING)
+
+    def test_expired_export_is_gone_and_purged(self):
+        """Test an expired export answers 410 until it and its file are purged"""
+        self.use_temp_media()
+        self.client.login(username='finance', password='testpass123')
+        job_id = self.client.post(reverse('dashboard:export_loans')).json()['job_id']
+        job = ExportJob.objects.get(pk=job_id)
+        self.assertTrue(default_storage.exists(job.path))
+        expired = timezone.now() - timedelta(seconds=EXPORT_JOB_TIMEOUT + 1)
+        ExportJob.objects.filter(pk=job_id).update(created_at=expired)
+
+        download_url = reverse('dashboard:export_download', args=[job_id])
+        self.assertEqual(self.client.get(download_url).status_code, 410)
+
+        call_command('purge_export_jobs', stdout=StringIO())
+        self.assertFalse(ExportJob.objects.filter(pk=job_id).exists())
+        self.assertFalse(default_storage.exists(job.path))
+        self.assertEqual(self.client.get(download_url).status_code, 404)
+
+    def test_unknown_export_id_is_not_found(self):
+        """Test malformed job ids 404 instead of erroring"""
+        self.client.login(username='finance', password='testpass123')
+        response = self.client.get(reverse('dashboard:export_status', args=['not-a-job']))
+        self.assertEqual(response.status_code, 404)
+
+
+class GatherKPIsTestCase(SimpleTestCase):
+    """Test concurrent KPI collection"""
+
+    def test_tasks_run_in_worker_threads(self):
+        main_thread = threading.get_ident()
+        results = gather_kpis({
+            'a': lambda: ('a', threading.get_ident()),
+            'b': lambda: ('b', threading.get_ident()),
+        })
+
+        self.assertEqual(list(results), ['a', 'b'])
+        self.assertEqual([value[0] for value in results.values()], ['a', 'b'])
+        self.assertNotIn(main_thread, [value[1] for value in results.values()])
+
+    def test_tasks_run_serially_inside_a_transaction(self):
+        main_thread = threading.get_ident()
+        with mock.patch.object(connection, 'in_atomic_block', True):
+            results = gather_kpis({'a': threading.get_ident, 'b': threading.get_ident})
+
+        self.assertEqual(results, {'a': main_thread, 'b': main_thread})
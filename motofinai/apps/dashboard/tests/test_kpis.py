@@ -1,16 +1,20 @@
 from decimal import Decimal
 from datetime import date, timedelta
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 
+from motofinai.apps.audit.models import AuditLogEntry
 from motofinai.apps.users.models import User
 from motofinai.apps.inventory.models import Stock, Motor
 from motofinai.apps.loans.models import FinancingTerm, LoanApplication, PaymentSchedule
 from motofinai.apps.payments.models import Payment
 from motofinai.apps.repossession.models import RepossessionCase
 from motofinai.apps.risk.models import RiskAssessment
-from motofinai.apps.dashboard.kpi import DashboardKPI
+from motofinai.apps.dashboard import metrics
+from motofinai.apps.dashboard.kpi import DashboardKPI, month_window, percentage
+from motofinai.apps.dashboard.templatetags.dashboard_filters import percent_of
 
 
 class DashboardKPITest(TestCase):
@@ -18,6 +22,7 @@ class DashboardKPITest(TestCase):
 
     def setUp(self):
         """Create test data."""
+        cache.clear()
         # Create test users
         self.admin_user = User.objects.create_user(
             username="admin",
@@ -285,3 +290,173 @@ class DashboardKPITest(TestCase):
         self.assertEqual(payment_kpis['overdue_amount'], Decimal('0'))
         self.assertEqual(payment_kpis['overdue_count'], 0)
         self.assertEqual(payment_kpis['collection_rate'], Decimal('0'))
+
+    def _create_loan_for(self, motor, status):
+        return LoanApplication.objects.create(
+            applicant_first_name="Inventory",
+            applicant_last_name="Applicant",
+            applicant_email="inventory@test.com",
+            applicant_phone="09123456789",
+            employment_status="employed",
+            monthly_income=Decimal("30000.00"),
+            motor=motor,
+            financing_term=self.financing_term,
+            loan_amount=motor.purchase_price,
+            down_payment=Decimal("0.00"),
+            principal_amount=motor.purchase_price,
+            interest_rate=Decimal("12.00"),
+            monthly_payment=Decimal("2500.00"),
+            submitted_by=self.admin_user,
+            status=status,
+        )
+
+    def test_inventory_kpis_derive_motor_status_in_two_queries(self):
+        """Inventory buckets match Motor.status without a query per motor."""
+        motors = [self.motor] + [
+            Motor.objects.create(
+                type=Motor.Type.SCOOTER,
+                brand="Honda",
+                model_name=f"Click {index}",
+                year=2024,
+                purchase_price=Decimal("65000.00"),
+            )
+            for index in range(4)
+        ]
+        self._create_loan_for(motors[1], 'pending')
+        self._create_loan_for(motors[2], 'approved')
+        self._create_loan_for(motors[2], 'active')
+        repossessed = self._create_loan_for(motors[3], 'active')
+        RepossessionCase.objects.create(loan_application=repossessed)
+
+        with self.assertNumQueries(2):
+            kpis = DashboardKPI.get_inventory_kpis()
+
+        self.assertEqual(
+            {key: kpis[key] for key in ('available', 'reserved', 'sold', 'repossessed')},
+            {'available': 2, 'reserved': 1, 'sold': 1, 'repossessed': 1},
+        )
+        self.assertEqual(
+            sorted(motor.status for motor in Motor.objects.all()),
+            ['available', 'available', 'repossessed', 'reserved', 'sold'],
+        )
+        self.assertEqual(kpis['total_units'], 5)
+        self.assertEqual(kpis['total_value'], Decimal('335000.00'))
+        self.assertEqual(kpis['avg_price'], Decimal('67000.00'))
+
+    def test_kpis_are_cached_until_a_loan_changes(self):
+        """Repeat KPI calls hit the cache; saving a loan recomputes them."""
+        self.assertEqual(DashboardKPI.get_loan_kpis()['total_loans'], 0)
+        DashboardKPI.get_payment_kpis(month=timezone.now())
+
+        with self.assertNumQueries(0):
+            self.assertEqual(DashboardKPI.get_loan_kpis()['total_loans'], 0)
+            DashboardKPI.get_payment_kpis(month=timezone.now())
+
+        self._create_loan_for(self.motor, 'pending')
+
+        self.assertEqual(DashboardKPI.get_loan_kpis()['total_loans'], 1)
+
+    def test_status_kpis_use_one_query_each(self):
+        """Loan and repossession KPIs read their counters; risk takes one GROUP BY."""
+        metrics.rebuild(LoanApplication)
+        metrics.rebuild(RepossessionCase)
+        high = self._create_loan_for(self.motor, 'active')
+        low = self._create_loan_for(self.motor, 'completed')
+        self._create_loan_for(self.motor, 'pending')
+        for loan, score, level in ((high, 80, 'high'), (low, 30, 'low')):
+            RiskAssessment.objects.create(
+                loan_application=loan,
+                score=score,
+                risk_level=level,
+                income_factor=Decimal('1.00'),
+                credit_factor=Decimal('1.00'),
+                debt_to_income_ratio=Decimal('0.30'),
+            )
+        RepossessionCase.objects.create(
+            loan_application=high,
+            status=RepossessionCase.Status.ACTIVE,
+            total_overdue_amount=Decimal('5000.00'),
+        )
+        RepossessionCase.objects.create(
+            loan_application=low,
+            status=RepossessionCase.Status.CLOSED,
+            total_overdue_amount=Decimal('900.00'),
+        )
+
+        with self.assertNumQueries(3):
+            loans = DashboardKPI.get_loan_kpis()
+            risk = DashboardKPI.get_risk_kpis()
+            repossession = DashboardKPI.get_repossession_kpis()
+
+        self.assertEqual((loans['total_loans'], loans['active_loans'], loans['pending_loans']), (3, 1, 1))
+        self.assertEqual(loans['total_loan_value'], Decimal('150000.00'))
+        self.assertEqual(loans['avg_loan_amount'], Decimal('75000.00'))
+        self.assertEqual((risk['total_assessments'], risk['high_risk'], risk['low_risk']), (2, 1, 1))
+        self.assertEqual(risk['avg_score'], 55)
+        self.assertEqual(risk['high_risk_pct'], 50)
+        self.assertEqual((repossession['total_cases'], repossession['critical_cases']), (2, 1))
+        self.assertEqual(repossession['recovery_rate'], 50)
+        self.assertEqual(repossession['total_overdue'], Decimal('5000.00'))
+
+    def test_payment_kpis_use_one_query_per_table(self):
+        """Collected payments and schedule figures take one query each."""
+        with self.assertNumQueries(2):
+            kpis = DashboardKPI.get_payment_kpis(month=date(2025, 12, 31))
+
+        self.assertEqual(kpis['overdue_count'], 0)
+        self.assertEqual(kpis['month'], date(2025, 12, 31))
+
+    def test_month_window_spans_calendar_month(self):
+        self.assertEqual(month_window(2025, 12), (date(2025, 12, 1), date(2026, 1, 1)))
+        self.assertEqual(month_window(2024, 2), (date(2024, 2, 1), date(2024, 3, 1)))
+
+    def test_percentage_is_a_rounded_float(self):
+        self.assertEqual(percentage(Decimal('1500.00'), Decimal('4500.00')), 33.33)
+        self.assertEqual(percentage(3, 3), 100.0)
+        self.assertEqual(percentage(Decimal('0'), Decimal('0')), 0.0)
+
+    def test_percent_of_filter(self):
+        self.assertEqual(percent_of(1, 3), 33.33)
+        self.assertEqual(percent_of(2, 0), 0.0)
+        self.assertEqual(percent_of(2, None), 0)
+
+    def test_user_kpis_come_from_one_aggregate(self):
+        User.objects.create_user(username="inactive", password="password", role="finance", is_active=False)
+
+        with self.assertNumQueries(1):
+            kpis = DashboardKPI.get_user_kpis()
+
+        self.assertEqual(kpis, {
+            'total_users': User.objects.count(),
+            'active_users': User.objects.filter(is_active=True).count(),
+            'admin_users': User.objects.filter(role='admin').count(),
+            'finance_users': User.objects.filter(role='finance').count(),
+        })
+        self.assertEqual(kpis['total_users'] - kpis['active_users'], 1)
+
+    def test_audit_kpis_come_from_one_grouped_query(self):
+        AuditLogEntry.objects.all().delete()
+        for action in ('auth.login', 'auth.login', 'login', 'auth.logout'):
+            AuditLogEntry.objects.create(actor=self.admin_user, action=action)
+
+        with self.assertNumQueries(1):
+            kpis = DashboardKPI.get_audit_kpis()
+
+        self.assertEqual(kpis['total_events'], 4)
+        self.assertEqual(kpis['recent_logins'], 3)
+        self.assertEqual(
+            {item['action']: item['count'] for item in kpis['action_counts']},
+            {'auth.login': 2, 'login': 1, 'auth.logout': 1},
+        )
+
+    def test_recent_activities_defer_unrendered_columns(self):
+        AuditLogEntry.objects.create(actor=self.admin_user, action='auth.login', metadata={'path': '/'})
+
+        with self.assertNumQueries(1):
+            activity = list(DashboardKPI.get_recent_activities(limit=1))[0]
+            self.assertEqual(activity.actor.email, 'admin@test.com')
+            self.assertEqual(activity.actor_display, 'admin')
+
+        deferred = activity.get_deferred_fields()
+        self.assertIn('metadata', deferred)
+        self.assertNotIn('description', deferred)
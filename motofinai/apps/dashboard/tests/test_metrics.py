@@ -0,0 +1,92 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from motofinai.apps.dashboard import metrics
+from motofinai.apps.dashboard.models import DashboardMetric
+from motofinai.apps.inventory.models import Motor
+from motofinai.apps.loans.models import FinancingTerm, LoanApplication
+from motofinai.apps.users.models import User
+
+
+class DashboardMetricTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="officer", password="password", role="finance")
+        self.term = FinancingTerm.objects.create(term_years=2, interest_rate=Decimal("12.00"))
+        self.motor = Motor.objects.create(
+            brand="Yamaha",
+            model_name="Mio",
+            year=2024,
+            purchase_price=Decimal("75000.00"),
+        )
+        metrics.rebuild(LoanApplication)
+
+    def _create_loan(self, status, amount):
+        return LoanApplication.objects.create(
+            applicant_first_name="Ana",
+            applicant_last_name="Cruz",
+            applicant_email="ana@example.com",
+            applicant_phone="09123456789",
+            employment_status="employed",
+            monthly_income=Decimal("30000.00"),
+            motor=self.motor,
+            financing_term=self.term,
+            loan_amount=amount,
+            down_payment=Decimal("0.00"),
+            principal_amount=amount,
+            interest_rate=Decimal("12.00"),
+            monthly_payment=Decimal("2500.00"),
+            submitted_by=self.user,
+            status=status,
+        )
+
+    def _counters(self):
+        return {status: (metric.n, metric.value) for status, metric in metrics.read(LoanApplication).items()}
+
+    def test_saves_and_deletes_move_counters(self):
+        loan = self._create_loan("pending", Decimal("60000.00"))
+        self._create_loan("pending", Decimal("40000.00"))
+
+        loan.status = "active"
+        loan.loan_amount = Decimal("65000.00")
+        loan.save()
+
+        self.assertEqual(self._counters()["pending"], (1, Decimal("40000.00")))
+        self.assertEqual(self._counters()["active"], (1, Decimal("65000.00")))
+
+        loan.delete()
+        self.assertEqual(self._counters()["active"], (0, Decimal("0.00")))
+
+    def test_saves_that_skip_counted_fields_do_not_query_for_the_old_row(self):
+        loan = self._create_loan("approved", Decimal("60000.00"))
+        loan.monthly_payment = Decimal("2600.00")
+
+        with self.assertNumQueries(1):
+            loan.save(update_fields=["monthly_payment"])
+
+    def test_missing_counters_are_rebuilt_from_the_table(self):
+        self._create_loan("completed", Decimal("50000.00"))
+        DashboardMetric.objects.filter(key="loans.completed").delete()
+
+        self.assertEqual(self._counters()["completed"], (1, Decimal("50000.00")))
+        self.assertEqual(DashboardMetric.objects.filter(key__startswith="loans.").count(), 4)
+
+    def test_rebuild_command_recounts_after_bulk_writes(self):
+        loan = self._create_loan("pending", Decimal("60000.00"))
+        LoanApplication.objects.filter(pk=loan.pk).update(status="active")
+
+        call_command("rebuild_dashboard_metrics", stdout=StringIO())
+
+        self.assertEqual(self._counters()["pending"][0], 0)
+        self.assertEqual(self._counters()["active"][0], 1)
+
+    def test_rebuild_overwrites_rows_written_by_a_concurrent_rebuild(self):
+        self._create_loan("pending", Decimal("60000.00"))
+        # The other rebuild inserted its rows after this one cleared the prefix
+        with mock.patch.object(metrics, "_prefix_filter", return_value=DashboardMetric.objects.none()):
+            metrics.rebuild(LoanApplication)
+
+        self.assertEqual(self._counters()["pending"], (1, Decimal("60000.00")))
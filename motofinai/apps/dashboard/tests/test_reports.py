@@ -0,0 +1,132 @@
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+
+from django.test import TestCase
+from openpyxl import load_workbook
+
+from motofinai.apps.dashboard.reports import InventoryReport, LoanReport, PaymentReport, RiskReport
+from motofinai.apps.inventory.models import Motor
+from motofinai.apps.loans.models import FinancingTerm, LoanApplication, PaymentSchedule
+from motofinai.apps.payments.models import Payment
+from motofinai.apps.risk.models import RiskAssessment
+from motofinai.apps.users.models import User
+
+
+def read_workbook(response):
+    return load_workbook(BytesIO(b"".join(response)), read_only=True)
+
+
+class ExcelReportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="officer", email="officer@test.com", password="password")
+        term = FinancingTerm.objects.create(term_years=2, interest_rate=Decimal("12.00"))
+        motor = Motor.objects.create(brand="Yamaha", model_name="Mio", year=2024, purchase_price=Decimal("75000.00"))
+        self.loan = LoanApplication.objects.create(
+            applicant_first_name="Ana",
+            applicant_last_name="Cruz",
+            applicant_email="ana@example.com",
+            applicant_phone="09123456789",
+            employment_status="employed",
+            monthly_income=Decimal("30000.00"),
+            motor=motor,
+            financing_term=term,
+            loan_amount=Decimal("75000.00"),
+            down_payment=Decimal("15000.00"),
+            principal_amount=Decimal("60000.00"),
+            interest_rate=Decimal("12.00"),
+            monthly_payment=Decimal("2500.00"),
+            submitted_by=self.user,
+            status="approved",
+        )
+
+    def test_loan_report_rows(self):
+        workbook = read_workbook(LoanReport.generate_excel())
+
+        self.assertEqual(workbook.sheetnames, ["Loan Applications"])
+        header, row = list(workbook["Loan Applications"].iter_rows())
+        self.assertEqual(header[0].value, "ID")
+        self.assertTrue(header[0].font.b)
+        self.assertEqual(
+            [cell.value for cell in row][:10],
+            [
+                self.loan.pk, "Ana Cruz", "ana@example.com", "09123456789", "2024 Yamaha Mio",
+                75000, 15000, 60000, 30000, "Approved",
+            ],
+        )
+        self.loan.refresh_from_db()
+        self.assertEqual(row[10].value, self.loan.submitted_at.strftime("%Y-%m-%d %H:%M"))
+
+    def test_loan_report_uses_fixed_column_widths(self):
+        sheet = load_workbook(BytesIO(b"".join(LoanReport.generate_excel())))["Loan Applications"]
+
+        self.assertEqual(sheet.column_dimensions["A"].width, LoanReport.COLUMN_WIDTHS["ID"])
+        self.assertEqual(sheet.column_dimensions["C"].width, LoanReport.COLUMN_WIDTHS["Email"])
+        self.assertEqual(sheet.column_dimensions["F"].width, LoanReport.DEFAULT_COLUMN_WIDTH)
+
+    def test_reports_stream_from_a_temporary_file(self):
+        response = LoanReport.generate_excel()
+
+        self.assertTrue(response.streaming)
+        output = response.file_to_stream
+        self.assertRegex(response["Content-Disposition"], r'^attachment; filename="loan_applications_\d{8}_\d{6}\.xlsx"$')
+        content = b"".join(response)
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        response.close()
+        self.assertTrue(output.closed)
+
+    def test_payment_report_has_both_sheets(self):
+        workbook = read_workbook(PaymentReport.generate_excel())
+
+        self.assertEqual(workbook.sheetnames, ["Payment Schedule", "Payments Made"])
+        self.assertEqual(len(list(workbook["Payments Made"].iter_rows())), 1)
+
+    def test_payment_rows_carry_the_applicant_name(self):
+        schedule = PaymentSchedule.objects.create(
+            loan_application=self.loan,
+            sequence=1,
+            due_date=date(2025, 1, 15),
+            principal_amount=Decimal("2500.00"),
+            interest_amount=Decimal("500.00"),
+            total_amount=Decimal("3000.00"),
+        )
+        Payment.objects.create(
+            schedule=schedule, amount=Decimal("3000.00"), payment_date=date(2025, 1, 10), recorded_by=self.user,
+        )
+
+        self.assertNotIsInstance(PaymentReport.payment_rows(), list)
+        workbook = read_workbook(PaymentReport.generate_excel())
+        schedule_row = list(workbook["Payment Schedule"].values)[1]
+        self.assertEqual(schedule_row[2:5], ("Ana", 1, "2025-01-15"))
+        payment_row = list(workbook["Payments Made"].values)[1]
+        self.assertEqual(payment_row[2:5], ("Ana Cruz", 3000, "2025-01-10"))
+        self.assertEqual(payment_row[6], "officer@test.com")
+
+    def test_risk_and_inventory_rows_use_display_labels(self):
+        RiskAssessment.objects.create(
+            loan_application=self.loan,
+            score=72,
+            risk_level=RiskAssessment.RiskLevel.HIGH,
+            income_factor=Decimal("1.00"),
+            credit_factor=Decimal("1.00"),
+            debt_to_income_ratio=Decimal("0.35"),
+        )
+
+        risk_row = list(read_workbook(RiskReport.generate_excel())["Risk Assessments"].values)[1]
+        self.assertEqual(risk_row[2:5], ("Ana", 72, RiskAssessment.RiskLevel.HIGH.label))
+        self.assertEqual(risk_row[7], LoanApplication.EmploymentStatus.EMPLOYED.label)
+        self.assertEqual(risk_row[8], 0.35)
+
+        with self.assertNumQueries(1):
+            response = InventoryReport.generate_excel()
+        inventory_row = list(read_workbook(response)["Inventory"].values)[1]
+        self.assertEqual(inventory_row[1:5], ("Scooter", "Yamaha", "Mio", 2024))
+        self.assertEqual(inventory_row[8], "Reserved")
+
+    def test_xlsxwriter_reports_style_the_header_and_size_columns(self):
+        sheet = load_workbook(BytesIO(b"".join(InventoryReport.generate_excel())))["Inventory"]
+
+        self.assertEqual(sheet["A1"].value, "ID")
+        self.assertTrue(sheet["A1"].font.b)
+        # xlsxwriter stores widths with its own character padding
+        self.assertAlmostEqual(sheet.column_dimensions["A"].width, InventoryReport.column_width("ID"), delta=1)
@@ -16,4 +16,6 @@ urlpatterns = [
     path('export/payments/', views.ExportPaymentsView.as_view(), name='export_payments'),
     path('export/risk/', views.ExportRiskView.as_view(), name='export_risk'),
     path('export/inventory/', views.ExportInventoryView.as_view(), name='export_inventory'),
+    path('export/status/<str:job_id>/', views.ExportStatusView.as_view(), name='export_status'),
+    path('export/download/<str:job_id>/', views.ExportDownloadView.as_view(), name='export_download'),
 ]
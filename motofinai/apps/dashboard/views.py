@@ -1,15 +1,61 @@
 """
 Dashboard views for Admin and Finance roles
 """
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponseGone
+from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.views import View
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.views.generic import TemplateView
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils import timezone
 
-from .kpi import AdminDashboardKPI, FinanceDashboardKPI, LoanOfficerDashboardKPI
+from motofinai.apps.core.responses import AsyncResponseHelper, OrjsonResponse
+
+from .exports import get_export_job, is_expired, start_export
+from .kpi import (
+    KPI_CACHE_TIMEOUT,
+    KPI_GENERATION_KEY,
+    AdminDashboardKPI,
+    FinanceDashboardKPI,
+    LoanOfficerDashboardKPI,
+)
+from .models import ExportJob
 from .reports import LoanReport, PaymentReport, RiskReport, InventoryReport
 
 
+def dashboard_etag(request, *args, **kwargs):
+    """
+    Weak ETag for a dashboard page, computed without touching the database.
+
+    It changes when a write bumps the KPI generation, when the cached KPIs
+    expire, and with the session, whose CSRF token the page embeds. Pages
+    with pending flash messages are always rendered so the messages show.
+    """
+    if len(messages.get_messages(request)):
+        return None
+    window = int(time.time()) // KPI_CACHE_TIMEOUT
+    generation = cache.get(KPI_GENERATION_KEY, 0)
+    key = f"{request.path}:{request.session.session_key}:{generation}:{window}"
+    return 'W/"%s"' % hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+# Answer an unchanged dashboard with 304 Not Modified; private so that
+# shared caches never keep one user's page
+dashboard_conditional_get = [
+    cache_control(private=True),
+    condition(etag_func=dashboard_etag),
+]
+
+
+@method_decorator(dashboard_conditional_get, name='get')
 class AdminDashboardView(LoginRequiredMixin, TemplateView):
     """Admin dashboard with comprehensive KPIs"""
     template_name = 'pages/dashboard/admin_dashboard.html'
@@ -30,6 +76,7 @@ class AdminDashboardView(LoginRequiredMixin, TemplateView):
         return context
 
 
+@method_decorator(dashboard_conditional_get, name='get')
 class FinanceDashboardView(LoginRequiredMixin, TemplateView):
     """Finance dashboard with role-specific metrics"""
     template_name = 'pages/dashboard/finance_dashboard.html'
@@ -50,6 +97,7 @@ class FinanceDashboardView(LoginRequiredMixin, TemplateView):
         return context
 
 
+@method_decorator(dashboard_conditional_get, name='get')
 class LoanOfficerDashboardView(LoginRequiredMixin, TemplateView):
     """Loan Officer dashboard with application tracking and repossession alerts"""
     template_name = 'pages/dashboard/loan_officer_dashboard.html'
@@ -106,33 +154,86 @@ class LoanOfficerDashboardView(LoginRequiredMixin, TemplateView):
 
 # Report Export Views
 
-class ExportLoansView(LoginRequiredMixin, View):
-    """Export loans to Excel"""
-    required_roles = ['admin', 'finance']
+class ReportExportView(LoginRequiredMixin, View):
+    """
+    Export ``report`` to Excel
+
+    GET streams the workbook straight back; POST queues it as a background
+    job and answers 202 with the job id to poll at ``export_status``.
+    """
+    report = None
 
     def get(self, request):
-        return LoanReport.generate_excel()
+        return self.report.generate_excel()
 
+    def post(self, request):
+        job_id = start_export(self.report, request.user)
+        data = AsyncResponseHelper.async_job_response(job_id)
+        data['status_url'] = reverse('dashboard:export_status', args=[job_id])
+        return OrjsonResponse(data, status=202)
 
-class ExportPaymentsView(LoginRequiredMixin, View):
-    """Export payments to Excel"""
+
+class ExportLoansView(ReportExportView):
+    """Export loans to Excel"""
     required_roles = ['admin', 'finance']
+    report = LoanReport
 
-    def get(self, request):
-        return PaymentReport.generate_excel()
 
+class ExportPaymentsView(ReportExportView):
+    """Export payments to Excel"""
+    required_roles = ['admin', 'finance']
+    report = PaymentReport
 
-class ExportRiskView(LoginRequiredMixin, View):
+
+class ExportRiskView(ReportExportView):
     """Export risk assessments to Excel"""
     required_roles = ['admin', 'finance']
-
-    def get(self, request):
-        return RiskReport.generate_excel()
+    report = RiskReport
 
 
-class ExportInventoryView(LoginRequiredMixin, View):
+class ExportInventoryView(ReportExportView):
     """Export inventory to Excel"""
     required_roles = ['admin']
+    report = InventoryReport
 
-    def get(self, request):
-        return InventoryReport.generate_excel()
+
+class ExportJobMixin(LoginRequiredMixin):
+    """Look up an export job belonging to the requesting user"""
+    required_roles = ['admin', 'finance']
+
+    def get_job(self, job_id):
+        job = get_export_job(job_id)
+        if job is None or job.user_id != self.request.user.pk:
+            raise Http404("Export not found")
+        return job
+
+
+class ExportStatusView(ExportJobMixin, View):
+    """Poll a background export; includes the download URL once it is ready"""
+
+    def get(self, request, job_id):
+        job = self.get_job(job_id)
+        if is_expired(job):
+            return HttpResponseGone("Export expired")
+        completed = job.status == ExportJob.Status.COMPLETED
+        data = AsyncResponseHelper.async_job_status(job_id, job.status, 100 if completed else 0)
+        if completed:
+            data['download_url'] = reverse('dashboard:export_download', args=[job_id])
+        return OrjsonResponse(data)
+
+
+class ExportDownloadView(ExportJobMixin, View):
+    """Stream a finished background export from storage"""
+
+    def get(self, request, job_id):
+        job = self.get_job(job_id)
+        if is_expired(job):
+            return HttpResponseGone("Export expired")
+        if job.status != ExportJob.Status.COMPLETED:
+            raise Http404("Export not ready")
+        return FileResponse(
+            default_storage.open(job.path, 'rb'),
+            as_attachment=True,
+            filename=job.filename,
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
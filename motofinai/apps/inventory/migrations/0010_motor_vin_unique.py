@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:58
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def dedupe_chassis_numbers(apps, schema_editor):
+    """Keep the oldest motor's VIN and tag later duplicates so they can be corrected by hand."""
+    Motor = apps.get_model("inventory", "Motor")
+    duplicated = (
+        Motor.objects.exclude(chassis_number="")
+        .values("chassis_number")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .values_list("chassis_number", flat=True)
+    )
+    for chassis_number in list(duplicated):
+        motors = Motor.objects.filter(chassis_number=chassis_number).order_by("id")
+        for motor in motors[1:]:
+            suffix = f"-DUP{motor.pk}"
+            motor.chassis_number = chassis_number[: 100 - len(suffix)] + suffix
+            motor.save(update_fields=["chassis_number"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0009_motor_chassis_number"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_chassis_numbers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="motor",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("chassis_number", ""), _negated=True),
+                fields=("chassis_number",),
+                name="motor_vin_unique",
+                violation_error_message="A motorcycle with this VIN/chassis number already exists.",
+            ),
+        ),
+    ]
@@ -176,6 +176,14 @@ class Motor(models.Model):
     class Meta:
         ordering = ["brand", "model_name", "year"]
         unique_together = ("brand", "model_name", "year")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["chassis_number"],
+                condition=~models.Q(chassis_number=""),
+                name="motor_vin_unique",
+                violation_error_message="A motorcycle with this VIN/chassis number already exists.",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.display_name
@@ -325,3 +325,17 @@ class MotorModelTest(TestCase):
                 stock=self.stock,
                 purchase_price=Decimal("75000.00"),
             )
+
+    def test_motor_vin_must_be_unique_unless_blank(self):
+        """Test that a non-blank chassis number cannot be reused by another model."""
+        from django.db import IntegrityError
+        Motor.objects.create(brand="Honda", model_name="Click", year=2024, purchase_price=Decimal("80000.00"))
+        Motor.objects.create(brand="Honda", model_name="Beat", year=2024, purchase_price=Decimal("70000.00"))
+        with self.assertRaises(IntegrityError):
+            Motor.objects.create(
+                brand="Suzuki",
+                model_name="Raider",
+                year=2024,
+                chassis_number=self.motor.chassis_number,
+                purchase_price=Decimal("90000.00"),
+            )
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+STATUS_OPEN_INDEX = models.Index(
+    condition=models.Q(("status__in", ["active", "approved"])),
+    fields=["status"],
+    name="loan_status_open_idx",
+)
+
+
+def add_index(apps, schema_editor):
+    model = apps.get_model("loans", "LoanApplication")
+    if schema_editor.connection.vendor == "postgresql":
+        # Build without blocking writes to the loans table
+        schema_editor.add_index(model, STATUS_OPEN_INDEX, concurrently=True)
+    else:
+        schema_editor.add_index(model, STATUS_OPEN_INDEX)
+
+
+def remove_index(apps, schema_editor):
+    model = apps.get_model("loans", "LoanApplication")
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(model, STATUS_OPEN_INDEX, concurrently=True)
+    else:
+        schema_editor.remove_index(model, STATUS_OPEN_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("inventory", "0010_motor_vin_unique"),
+        (
+            "loans",
+            "0007_rename_credit_investigation_at_loanapplication_second_approval_at_and_more",
+        ),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="loanapplication", index=STATUS_OPEN_INDEX
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(add_index, remove_index),
+            ],
+        ),
+    ]
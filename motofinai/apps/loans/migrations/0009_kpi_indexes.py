@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0010_motor_vin_unique"),
+        ("loans", "0008_loanapplication_status_open_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="loanapplication",
+            index=models.Index(fields=["status"], name="loan_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="paymentschedule",
+            index=models.Index(
+                fields=["status", "due_date"], name="schedule_status_due_idx"
+            ),
+        ),
+    ]
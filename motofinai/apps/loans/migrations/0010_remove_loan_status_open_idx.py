@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+STATUS_OPEN_INDEX = models.Index(
+    condition=models.Q(("status__in", ["active", "approved"])),
+    fields=["status"],
+    name="loan_status_open_idx",
+)
+
+
+def remove_index(apps, schema_editor):
+    model = apps.get_model("loans", "LoanApplication")
+    if schema_editor.connection.vendor == "postgresql":
+        # Drop without blocking writes to the loans table
+        schema_editor.remove_index(model, STATUS_OPEN_INDEX, concurrently=True)
+    else:
+        schema_editor.remove_index(model, STATUS_OPEN_INDEX)
+
+
+def add_index(apps, schema_editor):
+    model = apps.get_model("loans", "LoanApplication")
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(model, STATUS_OPEN_INDEX, concurrently=True)
+    else:
+        schema_editor.add_index(model, STATUS_OPEN_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    # DROP INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("loans", "0009_kpi_indexes"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(
+                    model_name="loanapplication", name="loan_status_open_idx"
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(remove_index, add_index),
+            ],
+        ),
+    ]
@@ -218,6 +218,11 @@ class LoanApplication(models.Model):
 
     class Meta:
         ordering = ["-submitted_at"]
+        indexes = [
+            # Status breakdown of the loan KPIs; also serves the open-loan
+            # lookups (consistency checks, schedule generation)
+            models.Index(fields=["status"], name="loan_status_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Loan application for {self.motor} by {self.applicant_full_name}"
@@ -492,6 +497,10 @@ class PaymentSchedule(models.Model):
     class Meta:
         ordering = ["sequence"]
         unique_together = ("loan_application", "sequence")
+        indexes = [
+            # Due/overdue installments by due date (payment KPIs, reminders)
+            models.Index(fields=["status", "due_date"], name="schedule_status_due_idx"),
+        ]
 
     def mark_paid(self, when: date | datetime | None = None) -> None:
         timestamp: datetime
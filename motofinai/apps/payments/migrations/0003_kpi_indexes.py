@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("loans", "0009_kpi_indexes"),
+        ("payments", "0002_payment_bank_name_payment_bank_reference_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(fields=["payment_date"], name="payment_date_idx"),
+        ),
+    ]
@@ -111,6 +111,10 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ["-payment_date", "-recorded_at"]
+        indexes = [
+            # Monthly collection totals
+            models.Index(fields=["payment_date"], name="payment_date_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Payment for schedule {self.schedule_id}"
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("loans", "0009_kpi_indexes"),
+        ("repossession", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="repossessioncase",
+            index=models.Index(fields=["status"], name="repossession_status_idx"),
+        ),
+    ]
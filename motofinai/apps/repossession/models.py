@@ -101,6 +101,9 @@ class RepossessionCase(models.Model):
 
     class Meta:
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["status"], name="repossession_status_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Repossession case for loan {self.loan_application_id}"
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils.functional import cached_property
 
 
 class User(AbstractUser):
@@ -16,17 +17,34 @@ class User(AbstractUser):
         help_text="Primary access role determining permissions across modules.",
     )
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Role filters on the user list and the dashboard user counts
+            models.Index(fields=["role"], name="user_role_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         """Ensure superusers are always treated as admins."""
 
         if self.is_superuser and self.role != self.Roles.ADMIN:
             self.role = self.Roles.ADMIN
+        self._clear_role_cache()
         return super().save(*args, **kwargs)
 
-    @property
+    def refresh_from_db(self, *args, **kwargs):
+        self._clear_role_cache()
+        return super().refresh_from_db(*args, **kwargs)
+
+    def _clear_role_cache(self) -> None:
+        self.__dict__.pop("is_admin", None)
+        self.__dict__.pop("is_finance", None)
+
+    # Role checks are evaluated once per instance (i.e. once per request for
+    # request.user) since templates and views consult them repeatedly.
+    @cached_property
     def is_admin(self) -> bool:
         return self.role == self.Roles.ADMIN or self.is_superuser
 
-    @property
+    @cached_property
     def is_finance(self) -> bool:
         return self.role == self.Roles.FINANCE
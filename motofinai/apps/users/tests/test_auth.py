@@ -79,3 +79,19 @@ class RoleRequiredDecoratorTests(TestCase):
         request.user = self.admin
         response = secured_view(request)
         self.assertEqual(response.status_code, 200)
+
+
+class UserRoleCacheTests(TestCase):
+    def test_role_checks_follow_saved_role_changes(self):
+        user = get_user_model().objects.create_user(
+            username="role_cache_user",
+            password="password123",
+            role=User.Roles.FINANCE,
+        )
+        self.assertFalse(user.is_admin)
+        self.assertTrue(user.is_finance)
+
+        user.role = User.Roles.ADMIN
+        user.save()
+        self.assertTrue(user.is_admin)
+        self.assertFalse(user.is_finance)